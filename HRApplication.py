@@ -2,7 +2,7 @@ import sys
 import json
 from sk_components.components import Menu, Wrapper
 from network_client.client import NetworkClient
-from network_common.wrappers import Request, Response, ExceptionHandler, ListHandler
+from network_common.wrappers import Request, Response, ExceptionHandler, ListHandler, PageRequest, PageHandler, SearchRequest
 from all_common.hr import Designation, Employee, ValidationError
 
 
@@ -191,7 +191,6 @@ class HRClientUI:
         designation = Designation(0, title)
         request = Request(manager="DesignationManager",
                           action="add", request_object=designation)
-        network_client = NetworkClient()
         response = network_client.send(request)
         if response.success:
             print("Designation Added")
@@ -239,7 +238,6 @@ class HRClientUI:
                                 month, year, salary, gender, indian, pan_no, aadhar)
             request = Request(manager="EmployeeManager",
                               action="add", request_object=employee)
-            network_client = NetworkClient()
             response = network_client.send(request)
             if response.success:
                 print("Employee Added")
@@ -269,7 +267,6 @@ class HRClientUI:
             designation = Designation(code, title)
             request = Request(manager="DesignationManager",
                               action="update", request_object=designation)
-            network_client = NetworkClient()
             response = network_client.send(request)
             if response.success:
                 print("Designation Update")
@@ -310,7 +307,6 @@ class HRClientUI:
                                 month, year, salary, gender, indian, pan_no, aadhar)
             request = Request(manager="EmployeeManager",
                               action="update", request_object=employee)
-            network_client = NetworkClient()
             response = network_client.send(request)
             if response.success:
                 print("Employee Updated")
@@ -338,7 +334,6 @@ class HRClientUI:
             code = int(input("Enter the Designation Code : "))
             request = Request(manager="DesignationManager",
                               action="remove", request_object=Wrapper(code))
-            network_client = NetworkClient()
             response = network_client.send(request)
             if response.success:
                 print("Designation Deleted")
@@ -367,7 +362,6 @@ class HRClientUI:
             emp_id = int(input("Enter the Employee ID : "))
             request = Request(manager="EmployeeManager",
                               action="remove", request_object=Wrapper(emp_id))
-            network_client = NetworkClient()
             response = network_client.send(request)
             if response.success:
                 print("Employee Deleted")
@@ -385,52 +379,74 @@ class HRClientUI:
 
     def get_all_designations(self):
         """
-        Retrieves all the available designation entries and displays them.
-        Creates a request class object,
+        Retrieves all the available designation entries and displays them
+        one page at a time, asking whether to move to the next or the
+        previous page.
+        Creates a request class object for every page,
         sends it using the NetworkClient class object and receives a response class object.
         This response object is then processed and prints the data sent in the response
         in the form of a list.
         """
-        request = Request(manager="DesignationManager", action="getall")
-        network_client = NetworkClient()
-        response = network_client.send(request)
-        if response.success:
-            designations = ListHandler.from_json(response.result_json)
-            for designation in designations:
-                print(
-                    f"Code : {designation.code} Designation : {designation.title}")
-        else:
-            er = ExceptionHandler.from_json(response.error_json)
-            if er.exceptions is None:
-                print(er.message)
-            else:
-                for exception in er.exceptions.values():
-                    print(exception[1])
-        print("-" * 50)
+        self._display_pages("DesignationManager", lambda designation: print(
+            f"Code : {designation.code} Designation : {designation.title}"))
 
     def get_all_employees(self):
         """
-        Retrieves all the available employee entries and displays them.
-        Creates a request class object,
+        Retrieves all the available employee entries and displays them
+        one page at a time, asking whether to move to the next or the
+        previous page.
+        Creates a request class object for every page,
         sends it using the NetworkClient class object and receives a response class object.
         This response object is then processed and prints the data sent in the response
         in the form of a list.
         """
-        request = Request(manager="EmployeeManager", action="getall")
-        network_client = NetworkClient()
-        response = network_client.send(request)
-        if response.success:
-            employees = ListHandler.from_json(response.result_json)
-            for employee in employees:
-                print(
-                    f"ID : {employee.emp_id} Name : {employee.name}, Designation : {employee.designation_code}, Gender : {employee.gender}")
-        else:
-            er = ExceptionHandler.from_json(response.error_json)
-            if er.exceptions is None:
-                print(er.message)
+        self._display_pages("EmployeeManager", lambda employee: print(
+            f"ID : {employee.emp_id} Name : {employee.name}, Designation : {employee.designation_code}, Gender : {employee.gender}"))
+
+    def _display_pages(self, manager, display):
+        """
+        Requests the pages of the listing of the given manager with the
+        'getpage' action and displays every entry of a page using the
+        display function, until there are no more pages or the user stops.
+
+        Arguments:
+            manager (str): the manager whose listing is to be displayed.
+            display (function): prints one entry of the listing.
+        """
+        cursor = None
+        while True:
+            request = Request(manager=manager, action="getpage",
+                              request_object=PageRequest(cursor))
+            response = network_client.send(request)
+            if not response.success:
+                er = ExceptionHandler.from_json(response.error_json)
+                if er.exceptions is None:
+                    print(er.message)
+                else:
+                    for exception in er.exceptions.values():
+                        print(exception[1])
+                break
+            page = PageHandler.from_json(response.result_json)
+            if len(page.lst) == 0:
+                print("No entries to display")
+            for entry in page.lst:
+                display(entry)
+            if page.next_cursor is None and page.previous_cursor is None:
+                break
+            options = list()
+            if page.next_cursor is not None:
+                options.append("N for next page")
+            if page.previous_cursor is not None:
+                options.append("P for previous page")
+            choice = input(
+                f"Enter {', '.join(options)}, any other key to stop : ").strip().upper()
+            if choice == "N" and page.next_cursor is not None:
+                cursor = page.next_cursor
+            elif choice == "P" and page.previous_cursor is not None:
+                cursor = page.previous_cursor
             else:
-                for exception in er.exceptions.values():
-                    print(exception[1])
+                break
+            print("-" * 50)
         print("-" * 50)
 
     def search_employee_by_id(self):
@@ -446,7 +462,6 @@ class HRClientUI:
             emp_id = int(input("Enter the Employee ID : "))
             request = Request(manager="EmployeeManager",
                               action="get_by_id", request_object=Wrapper(emp_id))
-            network_client = NetworkClient()
             response = network_client.send(request)
             if response.success:
                 employee = Employee.from_json(response.result_json)
@@ -465,18 +480,17 @@ class HRClientUI:
 
     def search_by_name(self):
         """
-        Retrieves all the desired employees' data by taking employee's name
-        as input at runtime.
+        Retrieves the employees whose name is equal to, starts with or is
+        similar to the employee's name taken as input at runtime.
         Creates a request class object,
-        and sending it via a Wrapper class object to the request class object.
+        and sending it via a SearchRequest class object to the request class object.
         Then sends it using the NetworkClient class object and receives a response class object.
         This response object is then processed and prints the data sent in the response.
         """
         try:
             name = input("Enter the Name of the Employee : ")
             request = Request(manager="EmployeeManager",
-                              action="get_by_name", request_object=Wrapper(name))
-            network_client = NetworkClient()
+                              action="search", request_object=SearchRequest(name))
             response = network_client.send(request)
             if response.success:
                 employees = ListHandler.from_json(response.result_json)
@@ -507,7 +521,6 @@ class HRClientUI:
             code = int(input("Enter the Designation Code : "))
             request = Request(manager="DesignationManager",
                               action="getbycode", request_object=Wrapper(code))
-            network_client = NetworkClient()
             response = network_client.send(request)
             if response.success:
                 designation = Designation.from_json(response.result_json)
@@ -536,7 +549,6 @@ class HRClientUI:
         title = input("Enter the Designation Name : ")
         request = Request(manager="DesignationManager",
                           action="getbytitle", request_object=Wrapper(title))
-        network_client = NetworkClient()
         response = network_client.send(request)
         if response.success:
             designation = Designation.from_json(response.result_json)
@@ -552,6 +564,9 @@ class HRClientUI:
         print("-" * 50)
 
 
+# one connection to the server, kept alive across the menu actions.
+network_client = NetworkClient()
+
 main_menu = Menu("Main Menu", main_menu_handler)
 main_menu.add_option("Designation Master")
 main_menu.add_option("Employee Master")
@@ -576,3 +591,4 @@ employee_menu.add_option("Display List")
 employee_menu.add_option("Exit")
 
 main_menu.activate()
+network_client.close()
@@ -1,9 +1,43 @@
 from network_server.server import NetworkServer
-from network_common.wrappers import Request, Response, ExceptionHandler, ListHandler
-from data_layer.hr import Designation as dld, HRDLHandler, DataLayerError, Employee as dlemp
+from network_server.aioserver import AsyncNetworkServer
+from network_server.config import Configuration
+from network_server.supervisor import Supervisor
+from network_server.coalescer import WriteCoalescer
+from network_common.wrappers import Request, Response, ExceptionHandler, ListHandler, PageRequest, PageHandler, SearchRequest, StatsHandler
+from data_layer.hr import Designation as dld, HRDLHandler, DataLayerError, Employee as dlemp, DBConnection, Transaction
+from data_layer.schema import SchemaManager
 from all_common.hr import Designation, Employee
 from sk_components.components import Wrapper
 import json
+import sys
+import threading
+
+# groups the writes of concurrent clients into one transaction, created
+# at the start when write_window of serverconf.cfg is not 0.
+write_coalescer = None
+
+
+def write(function, *arguments):
+    """
+    Calls the write method of HRDLHandler with the arguments, through the
+    WriteCoalescer if the writes are grouped, on behalf of the client of
+    the calling thread.
+
+    Raises:
+        DataLayerError:
+            if the write fails.
+
+    Return Value:
+        returns what the method returns.
+    """
+    if write_coalescer is None:
+        return function(*arguments)
+    client = DBConnection.getClient()
+
+    def write_for_client():
+        DBConnection.setClient(client)
+        return function(*arguments)
+    return write_coalescer.submit(write_for_client)
 
 
 def requestHandler(request):
@@ -26,6 +60,12 @@ def requestHandler(request):
         This object is passed to the appropriate data-layer method and thus retrieve data
         This data is again converted to JSON string and the response object is created.
         This processed object is then returned.
+        The writes (add, update and remove) go through the write function,
+        which groups those of concurrent clients into one transaction when
+        write_window is set in serverconf.cfg.
+        If the action is stats (whatever the manager), the number of
+        designations, of employees and of employees of every designation
+        kept by the data-layer are returned in a StatsHandler object.
 
         To obtain a convertible Designation/Employee object,
         it often uses Wrapper and List Handler class.
@@ -43,6 +83,10 @@ def requestHandler(request):
     Return Value:
         returns the Response object.
     """
+    # the writes of a client are read back from the primary database for
+    # a while, the clients are told apart by their host.
+    client_address = getattr(threading.current_thread(), "client_address", None)
+    DBConnection.setClient(None if client_address is None else client_address[0])
     print(request.manager)
     print(request.action)
     print(request.json_string)
@@ -56,7 +100,7 @@ def requestHandler(request):
                 return response
             dl_designation = dld(code=designation.code,
                                  title=designation.title)
-            HRDLHandler.add_designation(dl_designation)
+            write(HRDLHandler.add_designation, dl_designation)
             response = Response(success=True)
             return response
         except DataLayerError as dle:
@@ -72,7 +116,7 @@ def requestHandler(request):
                     exceptions=employee.exceptions))
                 return response
             dl_employee = dlemp(**employee.__dict__)
-            HRDLHandler.add_employee(dl_employee)
+            write(HRDLHandler.add_employee, dl_employee)
             response = Response(success=True)
             return response
         except DataLayerError as dle:
@@ -88,7 +132,7 @@ def requestHandler(request):
                     exceptions=employee.exceptions))
                 return response
             dl_employee = dlemp(**employee.__dict__)
-            HRDLHandler.update_employee(dl_employee)
+            write(HRDLHandler.update_employee, dl_employee)
             response = Response(success=True)
             return response
         except DataLayerError as dle:
@@ -99,7 +143,7 @@ def requestHandler(request):
     if "employee" in request.manager.lower() and "remove" in request.action.lower():
         try:
             emp_id = Wrapper.from_json(request.json_string)
-            HRDLHandler.delete_employee(emp_id)
+            write(HRDLHandler.delete_employee, emp_id)
             response = Response(success=True)
             return response
         except DataLayerError as dle:
@@ -129,7 +173,7 @@ def requestHandler(request):
                 return response
             dl_designation = dld(code=designation.code,
                                  title=designation.title)
-            HRDLHandler.update_designation(dl_designation)
+            write(HRDLHandler.update_designation, dl_designation)
             response = Response(success=True)
             return response
         except DataLayerError as dle:
@@ -140,7 +184,7 @@ def requestHandler(request):
     if "designation" in request.manager.lower() and "remove" in request.action.lower():
         try:
             code = Wrapper.from_json(request.json_string)
-            HRDLHandler.delete_designation(code)
+            write(HRDLHandler.delete_designation, code)
             response = Response(success=True)
             return response
         except DataLayerError as dle:
@@ -148,6 +192,51 @@ def requestHandler(request):
                 success=False, error=ExceptionHandler(**dle.__dict__))
             return response
 
+    if "employee" in request.manager.lower() and "search" in request.action.lower():
+        try:
+            search_request = SearchRequest.from_json(request.json_string)
+            if search_request.limit is None:
+                employees = HRDLHandler.search_employees(search_request.name)
+            else:
+                employees = HRDLHandler.search_employees(
+                    search_request.name, search_request.limit)
+            if len(employees) == 0:
+                raise DataLayerError(
+                    message=f"No Employee matches the name : {search_request.name}")
+            response = Response(
+                success=True, result_obj=ListHandler(employees))
+            return response
+        except DataLayerError as dle:
+            response = Response(
+                success=False, error=ExceptionHandler(**dle.__dict__))
+            return response
+
+    if "employee" in request.manager.lower() and "page" in request.action.lower():
+        try:
+            page_request = PageRequest.from_json(request.json_string)
+            page = HRDLHandler.get_employees_page(
+                page_request.cursor, page_request.page_size)
+            response = Response(success=True, result_obj=PageHandler(
+                page.items, page.next_cursor, page.previous_cursor))
+            return response
+        except DataLayerError as dle:
+            response = Response(
+                success=False, error=ExceptionHandler(**dle.__dict__))
+            return response
+
+    if "designation" in request.manager.lower() and "page" in request.action.lower():
+        try:
+            page_request = PageRequest.from_json(request.json_string)
+            page = HRDLHandler.get_designations_page(
+                page_request.cursor, page_request.page_size)
+            response = Response(success=True, result_obj=PageHandler(
+                page.items, page.next_cursor, page.previous_cursor))
+            return response
+        except DataLayerError as dle:
+            response = Response(
+                success=False, error=ExceptionHandler(**dle.__dict__))
+            return response
+
     if "employee" in request.manager.lower() and "all" in request.action.lower():
         try:
             employees = HRDLHandler.get_employees()
@@ -198,6 +287,16 @@ def requestHandler(request):
                 success=False, error=ExceptionHandler(**dle.__dict__))
             return response
 
+    if "stats" in request.action.lower():
+        try:
+            statistics = HRDLHandler.get_statistics()
+            response = Response(success=True, result_obj=StatsHandler(**statistics))
+            return response
+        except DataLayerError as dle:
+            response = Response(
+                success=False, error=ExceptionHandler(**dle.__dict__))
+            return response
+
     if "designation" in request.manager.lower() and "title" in request.action.lower():
         try:
             title = json.loads(request.json_string)
@@ -212,5 +311,52 @@ def requestHandler(request):
             return response
 
 
-network_server = NetworkServer(requestHandler)
-network_server.initiate()
+try:
+    SchemaManager.migrate()
+    # the counts served by the stats action are loaded before any request.
+    HRDLHandler.get_statistics()
+except DataLayerError as dle:
+    print(dle.message)
+    print(dle.exceptions)
+
+
+def serve():
+    """
+    Creates the network server of the mode of serverconf.cfg, and the
+    WriteCoalescer if the writes are grouped, and serves the clients.
+    With processes greater than 1 it runs in every worker process of the
+    Supervisor, each with its own server, pools and coalescer.
+    """
+    global write_coalescer
+    if Configuration().mode == "asyncio":
+        network_server = AsyncNetworkServer(requestHandler)
+    else:
+        network_server = NetworkServer(requestHandler)
+    if network_server.server_conf._obj.write_window > 0:
+        write_coalescer = WriteCoalescer(Transaction, network_server.server_conf._obj.write_window,
+                                         network_server.server_conf._obj.write_max_batch)
+    network_server.initiate()
+
+
+server_conf = Configuration()
+server_conf._validate_values()
+if server_conf.has_exceptions:
+    for exception in server_conf.exceptions.values():
+        print(exception[1])
+    sys.exit()
+if server_conf.processes > 1:
+    try:
+        if DBConnection.getStore() is not None:
+            # every process would hold a store of its own.
+            print("The Memory architecture is served by a single process, set processes to 1 in serverconf.cfg")
+            sys.exit()
+        # the processes open connections of their own, and share the
+        # times of the writes of the clients.
+        DBConnection.closeConnections()
+        DBConnection.shareWrites()
+    except DataLayerError as dle:
+        print(dle.message)
+        print(dle.exceptions)
+    Supervisor(serve, server_conf.processes).run()
+else:
+    serve()
@@ -1,7 +1,7 @@
 import json
 from datetime import datetime
 import decimal
-from data_layer.hr import HRDLHandler
+from data_layer.hr import DesignationRegistry
 
 """
 It is a module that connects the Network layer and the Data layer.
@@ -129,9 +129,6 @@ class Employee:
     It uses JSON Strings as the data transfer format.
 
     Attributes:
-        _designation_codes_register(dict): a dictionary to store all
-        the existing designation values as Designation objects
-        in Designation table, by calling the data-layer method.
         emp_id(int): holds the employee ID of the Employee object.
         name(str): holds the name of the Employee object.
         designation_code(int): holds the employee designation code
@@ -166,6 +163,8 @@ class Employee:
             accumulates all the exceptions into the exceptions
             variable of the Employee class. Also toggles
             has_exceptions variable accordingly.
+            The designation code is checked against the
+            DesignationRegistry of the data layer.
 
         to_json: converts the active object into a JSON String
         and returns it.
@@ -177,10 +176,8 @@ class Employee:
             necessary to create the Employee object.
     """
 
-    _designation_codes_register = {}
-
-    def __init__(self, emp_id, name, designation_code, date, month, year, salary, gender, indian, pan_no, aadhar, dob=None, exceptions={}, has_exceptions=False):
-        self.exceptions = exceptions
+    def __init__(self, emp_id, name, designation_code, date, month, year, salary, gender, indian, pan_no, aadhar, dob=None, exceptions=None, has_exceptions=False):
+        self.exceptions = dict() if exceptions is None else exceptions
         self.has_exceptions = has_exceptions
         self.emp_id = emp_id
         self.name = name
@@ -206,10 +203,6 @@ class Employee:
         the exceptions' variable of the Exception class.
         Also toggles has_exceptions variable accordingly.
         """
-        designations = HRDLHandler.get_designations()
-        for designation in designations:
-            Employee._designation_codes_register[designation.code] = designation
-
         if not isinstance(self.emp_id, int):
             self.exceptions["emp_id"] = (
                 'T', f"employee id is of type {type(self.emp_id)}, it should be of type {type(0)}")
@@ -252,7 +245,7 @@ class Employee:
             if length_of_name == 0 or length_of_name > 35:
                 self.exceptions["name"] = (
                     'V', f"Value of name is {self.name}, it should be greater than zero and less than 35")
-        if ("designation_code" not in self.exceptions) and (self.designation_code not in Employee._designation_codes_register):
+        if ("designation_code" not in self.exceptions) and not DesignationRegistry.contains(self.designation_code):
             self.exceptions["designation_code"] = (
                 'V', f"Invalid Designation Code : {self.designation_code}")
         if ("dob" not in self.exceptions):
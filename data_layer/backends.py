@@ -0,0 +1,279 @@
+import sqlite3
+from datetime import date
+
+"""
+It is a module of the Data Layer that holds the storage backends, that
+is the database products the Data Layer can work upon, selected by the
+<architecture> element of dbconfig.xml.
+The Memory architecture has no database at all, HRDLHandler works upon
+the MemoryStore (refer memory module) in place of the connections.
+HRDLHandler talks to the connections of every backend through the
+interface of mysql.connector (cursor, execute with %s parameters,
+rowcount, lastrowid, commit, rollback, in_transaction...), the
+connections of the other products are wrapped to behave alike and to
+raise DatabaseError in place of their own errors.
+mysql.connector is imported only when a MySQL connection is opened,
+so that the other backends work without it being installed.
+"""
+
+
+class DatabaseError(Exception):
+    """
+    A class for the errors of the backends other than MySQL, it has the
+    msg attribute like the Error of mysql.connector.
+
+    Attributes:
+        msg(str): the message of the error.
+    """
+
+    def __init__(self, msg=''):
+        super().__init__(msg)
+        self.msg = msg
+
+
+try:
+    from mysql.connector import Error as _MySQLError
+    # the errors the HRDLHandler methods catch, whichever the backend.
+    ERRORS = (_MySQLError, DatabaseError)
+except ImportError:
+    ERRORS = (DatabaseError,)
+
+
+class MySQLBackend:
+    """
+    The backend of a MySQL server, reached through mysql.connector.
+
+    Methods:
+        connect(dbConfig): opens a connection.
+        is_alive(connection): pings the connection.
+        id_increment(cursor): returns the step between the consecutive
+        ids generated by a multi-row insert, None if they may not be
+        consecutive (innodb_autoinc_lock_mode 2, the interleaved mode,
+        lets the concurrent inserts take ids in between).
+    """
+    name = "MySQL"
+    # the configuration entries the backend needs.
+    required = ("host", "port", "database", "user", "password")
+    # locks the rows a select reads until the transaction ends.
+    row_lock = " for update"
+
+    def connect(dbConfig):
+        try:
+            from mysql.connector import connect, ClientFlag
+        except ImportError:
+            raise DatabaseError(
+                "mysql-connector-python is required for the MySQL architecture")
+        # FOUND_ROWS makes the rowcount of an update count the matched
+        # rows, not only the changed ones, which the writes rely upon.
+        return connect(host=dbConfig.host, port=dbConfig.port,
+                       database=dbConfig.database, user=dbConfig.user, password=dbConfig.password,
+                       client_flags=[ClientFlag.FOUND_ROWS])
+
+    def is_alive(connection):
+        return connection.is_connected()
+
+    def id_increment(cursor):
+        cursor.execute(
+            "select @@auto_increment_increment, @@innodb_autoinc_lock_mode")
+        increment, lock_mode = cursor.fetchone()
+        if int(lock_mode) == 2:
+            return None
+        return increment
+
+
+class SQLiteBackend:
+    """
+    The backend of an SQLite database file, which runs within the process.
+    The database of dbconfig.xml is the path of the file, the other
+    entries are not used. The file is put in WAL mode so that the readers
+    do not block the writer, and the foreign keys are enforced.
+
+    Methods:
+        connect(dbConfig): opens a connection.
+        is_alive(connection): checks the connection.
+        id_increment(cursor): returns the step between the consecutive
+        ids generated by a multi-row insert, always 1.
+    """
+    name = "SQLite"
+    required = ("database",)
+    # a transaction which read a row changed meanwhile by another one
+    # cannot write (SQLITE_BUSY_SNAPSHOT), no lock is needed.
+    row_lock = ""
+
+    def connect(dbConfig):
+        try:
+            connection = sqlite3.connect(dbConfig.database, timeout=dbConfig.pool_wait_timeout,
+                                         detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+            connection.execute("pragma journal_mode=wal")
+            connection.execute("pragma synchronous=normal")
+            connection.execute("pragma foreign_keys=on")
+        except sqlite3.Error as error:
+            raise DatabaseError(str(error))
+        return SQLiteConnection(connection)
+
+    def is_alive(connection):
+        return connection.is_connected()
+
+    def id_increment(cursor):
+        return 1
+
+
+class MemoryBackend:
+    """
+    The backend which keeps the tables in the memory of the process, in
+    the MemoryStore of DBConnection.getStore, it opens no connections.
+    The database of dbconfig.xml, if given, is the path of the snapshot
+    file the tables are loaded from when first used, the other entries
+    are not used.
+
+    Methods:
+        connect(dbConfig): fails, there is nothing to connect to.
+        is_alive(connection): always False.
+        id_increment(cursor): always 1.
+    """
+    name = "Memory"
+    required = ()
+    row_lock = ""
+
+    def connect(dbConfig):
+        raise DatabaseError(
+            "The Memory architecture has no database to connect to")
+
+    def is_alive(connection):
+        return False
+
+    def id_increment(cursor):
+        return 1
+
+
+# DATE columns are stored as "YYYY-MM-DD" text and read back as dates.
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter(
+    "date", lambda value: date.fromisoformat(value.decode()))
+
+
+class SQLiteConnection:
+    """
+    A class which wraps a connection of sqlite3 to behave like a
+    connection of mysql.connector, as used by the Data Layer.
+    A connection is used by one thread at a time (it is checked out of
+    the pool), but not always by the thread which opened it.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+        self.unread_result = False
+
+    @property
+    def in_transaction(self):
+        return self._connection.in_transaction
+
+    def cursor(self, buffered=None, prepared=None):
+        # sqlite3 keeps the compiled statements of a connection in its own
+        # cache, a prepared cursor needs nothing more.
+        return SQLiteCursor(self._connection.cursor())
+
+    def commit(self):
+        try:
+            self._connection.commit()
+        except sqlite3.Error as error:
+            raise DatabaseError(str(error))
+
+    def rollback(self):
+        try:
+            self._connection.rollback()
+        except sqlite3.Error as error:
+            raise DatabaseError(str(error))
+
+    def consume_results(self):
+        pass
+
+    def is_connected(self):
+        try:
+            self._connection.execute("select 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def close(self):
+        self._connection.close()
+
+
+class SQLiteCursor:
+    """
+    A class which wraps a cursor of sqlite3 to behave like a cursor of
+    mysql.connector, the %s placeholders are turned into ? ones.
+    """
+    _translations = dict()
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.lastrowid = None
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def execute(self, operation, params=()):
+        translated = SQLiteCursor._translations.get(operation)
+        if translated is None:
+            translated = SQLiteCursor._translations[operation] = operation.replace(
+                "%s", "?")
+        try:
+            self._cursor.execute(translated, params)
+        except sqlite3.Error as error:
+            raise DatabaseError(str(error))
+        self.lastrowid = self._cursor.lastrowid
+
+    def executemany(self, operation, seq_params):
+        # sqlite3 does not report the id of a row inserted by executemany,
+        # executing the rows one by one within the process costs as much.
+        # The savepoint makes them all or none, like a multi-row insert.
+        if not self._cursor.connection.in_transaction:
+            self._cursor.execute("begin")
+        self._cursor.execute("savepoint executemany")
+        first_id = None
+        try:
+            for params in seq_params:
+                self.execute(operation, params)
+                if first_id is None:
+                    first_id = self.lastrowid
+        except DatabaseError:
+            self._cursor.execute("rollback to executemany")
+            self._cursor.execute("release executemany")
+            raise
+        self._cursor.execute("release executemany")
+        self.lastrowid = first_id
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone)
+
+    def fetchmany(self, size):
+        return self._fetch(lambda: self._cursor.fetchmany(size))
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+    def close(self):
+        self._cursor.close()
+
+    def _fetch(self, fetch):
+        try:
+            return fetch()
+        except sqlite3.Error as error:
+            raise DatabaseError(str(error))
+
+
+BACKENDS = {"mysql": MySQLBackend, "sqlite": SQLiteBackend,
+            "memory": MemoryBackend}
+
+
+def get_backend(architecture):
+    """
+    Return Value:
+        returns the backend class of the architecture (compared case
+        insensitively), None if it is not supported.
+    """
+    if not isinstance(architecture, str):
+        return None
+    return BACKENDS.get(architecture.strip().lower())
@@ -0,0 +1,127 @@
+import time
+import threading
+from collections import OrderedDict
+
+"""
+It is a module of the Data Layer that provides the in-process cache used
+in front of the point lookups of HRDLHandler.
+"""
+
+
+class LRUCache:
+    """
+    A thread-safe cache which holds at most max_size entries, discarding
+    the least recently used entry when full, and treats the entries older
+    than ttl seconds as missing.
+
+    To keep a read-through from caching a value which got invalidated
+    while it was being read from the database, the reader takes the
+    version of the cache before reading and passes it to put, the value
+    is not cached if anything was invalidated in between.
+
+    Attributes:
+        max_size(int): the maximum number of entries, 0 disables the cache.
+        ttl(float): the seconds for which an entry stays valid.
+
+    Methods:
+        get(key): returns the cached value or None.
+        version: returns the current version of the cache.
+        put(key, value, version): caches the value.
+        invalidate(key): removes the entry of the key.
+        clear: removes all the entries.
+        statistics: returns the counters of the cache.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def get(self, key):
+        """
+        Return Value:
+            returns the value cached against the key, None if it is not
+            cached or has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def version(self):
+        """
+        Return Value:
+            returns the version of the cache, it changes on every
+            invalidation.
+        """
+        return self._version
+
+    def put(self, key, value, version=None):
+        """
+        Caches the value against the key, unless the cache was invalidated
+        after the given version was taken.
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key):
+        """
+        Removes the entry of the key, if any.
+        """
+        with self._lock:
+            self._version += 1
+            if self._entries.pop(key, None) is not None:
+                self._invalidations += 1
+
+    def clear(self):
+        """
+        Removes all the entries.
+        """
+        with self._lock:
+            self._version += 1
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+    def statistics(self):
+        """
+        Return Value:
+            returns a dictionary with the size of the cache and the
+            counters of hits, misses, evictions (entries discarded to make
+            room), expirations and invalidations.
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations
+            }
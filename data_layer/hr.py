@@ -1,14 +1,36 @@
 import os
+import json
+import time
+import zlib
+import base64
+from stat import S_ISREG
+import threading
+import multiprocessing
+from collections import deque
 from xml.etree import ElementTree
-from mysql.connector import connect, Error
-from datetime import datetime
+from datetime import datetime, date
+from types import MappingProxyType
+try:
+    from data_layer.cache import LRUCache
+    from data_layer.search import NameIndex
+    from data_layer.memory import MemoryStore
+    from data_layer.metrics import Metrics
+    from data_layer.backends import ERRORS as Error, BACKENDS, MemoryBackend, get_backend
+except ImportError:
+    # imported as a script module from within the data_layer folder.
+    from cache import LRUCache
+    from search import NameIndex
+    from memory import MemoryStore
+    from metrics import Metrics
+    from backends import ERRORS as Error, BACKENDS, MemoryBackend, get_backend
 
 """
 It is the Data Layer of the HRApplication, in this we access
 and perform CRUD operations directly to the tables in the Database.
 The Database consists of 2 Tables of use for this application and
 in this module, we configure and validate the connections between MySQL
-and data-layer.
+(or another storage backend, refer backends module) and data-layer.
+Error is the tuple of the database errors of all the backends.
 In this, we transfer data between DBMS and data-layer by the means
 of class objects.
 In this, the configuration details are to be provided by the user in
@@ -16,6 +38,10 @@ the form of an XML file(the demo XML file is given by the name of
 'dbconfig.xml')
 """
 
+# the exceptions of the objects read from the database, which are valid
+# by construction, shared by all of them and read only.
+_NO_EXCEPTIONS = MappingProxyType(dict())
+
 
 class DataLayerError(Exception):
     """
@@ -40,8 +66,62 @@ class DBUtility:
     A class that contains the method to parse the user provided
     configuration file and extracts the necessary data as well as
     validates it.
+    The parsed configuration is cached for the whole process and the
+    file is parsed again only when its modification time, inode or size
+    changes. The file is looked at (stat) at most once in every
+    _check_interval seconds.
+
+    Attributes:
+        _cache(tuple): the (file signature, DBConfiguration, time of the
+        last check) of the cached configuration, it is always replaced
+        as a whole so that the readers never see a half updated cache.
+            default is None(NoneType)
+        _check_interval(float): seconds for which the cached configuration
+        is returned without looking at the file.
+            default is 1.0
     """
+    _cache = None
+    _cache_lock = threading.Lock()
+    _check_interval = 1.0
+
     def getDBConfiguration():
+        """
+        It returns the cached configuration, parsing the user-provided
+        configuration file along with validating it on the first call
+        and whenever the file has changed.
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value:
+            returns DBConfiguration object with the data provided by the user
+            in the configuration file.
+        """
+        cache = DBUtility._cache
+        if cache is not None and time.monotonic() - cache[2] < DBUtility._check_interval:
+            return cache[1]
+        with DBUtility._cache_lock:
+            cache = DBUtility._cache
+            if cache is not None and time.monotonic() - cache[2] < DBUtility._check_interval:
+                return cache[1]
+            try:
+                fileStat = os.stat("dbconfig.xml")
+            except OSError:
+                fileStat = None
+            if fileStat is None or not S_ISREG(fileStat.st_mode):
+                raise DataLayerError(
+                    message="'dbconfig.xml' file not found, please refer documentation")
+            signature = (fileStat.st_dev, fileStat.st_ino,
+                         fileStat.st_mtime_ns, fileStat.st_size)
+            if cache is not None and cache[0] == signature:
+                dbConfig = cache[1]
+            else:
+                dbConfig = DBUtility._parseDBConfiguration()
+                Metrics.slow_threshold = dbConfig.slow_threshold
+            DBUtility._cache = (signature, dbConfig, time.monotonic())
+            return dbConfig
+
+    def _parseDBConfiguration():
         """
         It parses the user-provided configuration file along with
         validating it.
@@ -53,9 +133,6 @@ class DBUtility:
             returns DBConfiguration object with the data provided by the user
             in the configuration file.
         """
-        if not os.path.isfile("dbconfig.xml"):
-            raise DataLayerError(
-                message="'dbconfig.xml' file not found, please refer documentation")
         f = open("dbconfig.xml", "rt")
         try:
             xmlTree = ElementTree.parse(f)
@@ -66,7 +143,10 @@ class DBUtility:
             f.close()
         rootNode = xmlTree.getroot()
         host = port = database = user = password = None
+        options = dict()
         for node in rootNode:
+            if node.tag == 'architecture':
+                options['architecture'] = node.text
             if node.tag == 'host':
                 host = node.text
             if node.tag == 'port':
@@ -77,13 +157,151 @@ class DBUtility:
                 user = node.text
             if node.tag == 'password':
                 password = node.text
+            if node.tag == 'pool':
+                options.update(DBUtility._parsePoolConfiguration(node))
+            if node.tag == 'cache':
+                options.update(DBUtility._parseCacheConfiguration(node))
+            if node.tag == 'metrics':
+                options.update(DBUtility._parseMetricsConfiguration(node))
+            if node.tag == 'replicas':
+                options.update(DBUtility._parseReplicasConfiguration(node))
+            if node.tag == 'batch_size':
+                try:
+                    options['batch_size'] = int(node.text)
+                except (TypeError, ValueError):
+                    raise DataLayerError(
+                        message=f"batch_size is {node.text}, it should be of type {type(0)}")
         if port != None:
             try:
-                int(port)
+                port = int(port)
             except:
                 raise DataLayerError(
                     message=f"Port is of type {type(port)}, it should be of type {type(0)}")
-        return DBConfiguration(host, int(port), database, user, password)
+        return DBConfiguration(host, port, database, user, password, **options)
+
+    def _parseCacheConfiguration(cacheNode):
+        """
+        It parses the optional <cache> element of the configuration file,
+        size is converted to int and ttl (in seconds) to float.
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value:
+            returns a dictionary of the cache settings keyed by the
+            DBConfiguration argument names.
+        """
+        converters = {
+            'size': ('cache_size', int),
+            'ttl': ('cache_ttl', float)
+        }
+        cache = dict()
+        for node in cacheNode:
+            if node.tag not in converters:
+                continue
+            name, converter = converters[node.tag]
+            try:
+                cache[name] = converter(node.text)
+            except (TypeError, ValueError):
+                raise DataLayerError(
+                    message=f"cache {node.tag} is {node.text}, it should be of type {converter}")
+        return cache
+
+    def _parseMetricsConfiguration(metricsNode):
+        """
+        It parses the optional <metrics> element of the configuration
+        file, slow_threshold (in seconds) is converted to float.
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value:
+            returns a dictionary of the metrics settings keyed by the
+            DBConfiguration argument names.
+        """
+        metrics = dict()
+        for node in metricsNode:
+            if node.tag != 'slow_threshold':
+                continue
+            try:
+                metrics['slow_threshold'] = float(node.text)
+            except (TypeError, ValueError):
+                raise DataLayerError(
+                    message=f"metrics {node.tag} is {node.text}, it should be of type {float}")
+        return metrics
+
+    def _parseReplicasConfiguration(replicasNode):
+        """
+        It parses the optional <replicas> element of the configuration
+        file, which holds a <replica> element (with host, port, name, user
+        and password, the missing ones are those of the primary database)
+        for every read replica, the <balancing> of the reads among them
+        and the <sticky_window> in seconds.
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value:
+            returns a dictionary of the replica settings keyed by the
+            DBConfiguration argument names.
+        """
+        tags = {'host': 'host', 'port': 'port',
+                'name': 'database', 'user': 'user', 'password': 'password'}
+        replicas = {'replicas': list()}
+        for node in replicasNode:
+            if node.tag == 'replica':
+                replica = dict()
+                for entry in node:
+                    if entry.tag in tags:
+                        replica[tags[entry.tag]] = entry.text
+                if 'port' in replica:
+                    try:
+                        replica['port'] = int(replica['port'])
+                    except (TypeError, ValueError):
+                        raise DataLayerError(
+                            message=f"replica port is {replica['port']}, it should be of type {type(0)}")
+                replicas['replicas'].append(replica)
+            if node.tag == 'balancing':
+                replicas['replica_balancing'] = node.text
+            if node.tag == 'sticky_window':
+                try:
+                    replicas['replica_sticky_window'] = float(node.text)
+                except (TypeError, ValueError):
+                    raise DataLayerError(
+                        message=f"replicas sticky_window is {node.text}, it should be of type {float}")
+        return replicas
+
+    def _parsePoolConfiguration(poolNode):
+        """
+        It parses the optional <pool> element of the configuration file.
+        Sizes are converted to int and timeouts (in seconds) to float,
+        the missing entries fall back to the defaults of DBConfiguration.
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value:
+            returns a dictionary of the pool settings keyed by the
+            DBConfiguration argument names.
+        """
+        converters = {
+            'min_size': ('pool_min_size', int),
+            'max_size': ('pool_max_size', int),
+            'idle_timeout': ('pool_idle_timeout', float),
+            'wait_timeout': ('pool_wait_timeout', float),
+            'validation_interval': ('pool_validation_interval', float)
+        }
+        pool = dict()
+        for node in poolNode:
+            if node.tag not in converters:
+                continue
+            name, converter = converters[node.tag]
+            try:
+                pool[name] = converter(node.text)
+            except (TypeError, ValueError):
+                raise DataLayerError(
+                    message=f"pool {node.tag} is {node.text}, it should be of type {converter}")
+        return pool
 
 
 class Designation:
@@ -104,7 +322,11 @@ class Designation:
             validates the entries in Designation class and
             accumulates all the exceptions into the exceptions
             variable. Also toggles has_exceptions variable accordingly.
+        _from_row(row): creates a Designation from a row of the
+        Designation Table, without validating it.
+        to_dict: returns the entries as a dictionary.
     """
+    __slots__ = ("exceptions", "has_exceptions", "code", "title")
 
     def __init__(self, code, title):
         self.exceptions = dict()
@@ -140,6 +362,611 @@ class Designation:
         if len(self.exceptions) > 0:
             self.has_exceptions = True
 
+    def _from_row(row):
+        """
+        Creates a Designation from a (code, title) row of the Designation
+        Table. The entries of the table are valid already, hence they are
+        not validated again.
+
+        Return Value: returns a Designation object.
+        """
+        designation = Designation.__new__(Designation)
+        designation.exceptions = _NO_EXCEPTIONS
+        designation.has_exceptions = False
+        designation.code, designation.title = row
+        return designation
+
+    def to_dict(self):
+        """
+        Return Value: returns a dictionary of the entries, with the same
+        keys as the arguments of the constructor of all_common's Designation.
+        """
+        return {"exceptions": dict(self.exceptions), "has_exceptions": self.has_exceptions,
+                "code": self.code, "title": self.title}
+
+
+class DesignationRegistry:
+    """
+    A class that keeps all the designations of the Designation Table in
+    memory, shared by the whole process, so that validating the designation
+    code of an Employee is a dictionary lookup instead of a query.
+    It is loaded on the first lookup, kept up to date by the add, update
+    and delete methods of HRDLHandler and loaded again when older than
+    _verify_interval seconds, as other processes may write to the same
+    database. A code not found in it is looked for in the Designation
+    Table, by its key, before it is taken not to exist.
+    The dictionary is never modified in place, writers build a new one and
+    swap it, hence the lookups do not need the lock.
+
+    Attributes:
+        _designations(dict): the Designation objects keyed by their code.
+            default is None(NoneType), until loaded.
+        _loaded_at(float): the time (time.monotonic) of the last load.
+        _verify_interval(float): seconds after which the designations are
+        loaded again.
+            default is 60.0
+
+    Methods:
+        contains(code): tells whether a designation with the code exists.
+        lookup(codes): returns the designations to look the codes up in.
+        load(since): loads the designations from the Designation Table.
+        put(designation): adds or replaces a designation.
+        remove(code): removes a designation.
+        invalidate: discards the loaded designations, the next lookup
+        loads them again.
+    """
+    _designations = None
+    _loaded_at = 0.0
+    _lock = threading.Lock()
+    _verify_interval = 60.0
+
+    def contains(code):
+        """
+        Tells whether a designation with the given code exists (refer
+        lookup).
+
+        Return Value:
+            returns a bool.
+        """
+        try:
+            designations = DesignationRegistry.lookup((code,))
+        except DataLayerError as dle:
+            print(dle.message)
+            print(dle.exceptions)
+            return False
+        return code in designations
+
+    def lookup(codes):
+        """
+        Returns the designations to look the codes up in, loading them
+        first if they are not loaded yet or are older than _verify_interval
+        seconds. The codes (of int) not found are read from the database,
+        as another process may have added them since, and those which
+        exist are added.
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value:
+            returns the dictionary of Designation objects keyed by code.
+        """
+        designations = DesignationRegistry._designations
+        if designations is None or time.monotonic() - DesignationRegistry._loaded_at >= DesignationRegistry._verify_interval:
+            designations = DesignationRegistry.load(
+                time.monotonic() - DesignationRegistry._verify_interval)
+        missing = sorted({code for code in codes if isinstance(code, int) and not isinstance(
+            code, bool) and code not in designations})
+        if len(missing) > 0:
+            # another process may have added them since, they are read by
+            # their key rather than by loading the whole table again, so
+            # that the codes which do not exist cost no more than a lookup.
+            found = DesignationRegistry._fetch(missing)
+            if len(found) > 0:
+                designations = dict(designations)
+                for designation in found:
+                    DesignationRegistry.put(designation)
+                    designations[designation.code] = designation
+        return designations
+
+    def _fetch(codes):
+        # the designations of the codes which exist, read from the
+        # committed rows of the primary database.
+        store = DBConnection.getStore()
+        if store is not None:
+            rows = [store.designation(code) for code in codes]
+            return [Designation._from_row(row) for row in rows if row is not None]
+        rows = list()
+        connection = None
+        try:
+            connection = DBConnection.getConnection(joinTransaction=False)
+            for code in codes:
+                rows.append(StatementRegistry.fetchone(
+                    connection, "select * from designation where code=%s", (code,)))
+            DBConnection.commit(connection)
+        except Error as error:
+            raise DataLayerError(message=error.msg)
+        finally:
+            DBConnection.releaseConnection(connection)
+        return [Designation._from_row(row) for row in rows if row is not None]
+
+    def load(since=None):
+        """
+        Loads the designations from the Designation Table, unless they
+        are loaded already, and loaded at or after since (time.monotonic)
+        if given, so that the callers which asked at the same time share
+        one load.
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value:
+            returns the dictionary of Designation objects keyed by code.
+        """
+        with DesignationRegistry._lock:
+            if DesignationRegistry._designations is None or (since is not None and DesignationRegistry._loaded_at < since):
+                loaded_at = time.monotonic()
+                designations = dict()
+                for designation in HRDLHandler.get_designations(joinTransaction=False, useReplica=False):
+                    designations[designation.code] = designation
+                DesignationRegistry._designations = designations
+                DesignationRegistry._loaded_at = loaded_at
+            return DesignationRegistry._designations
+
+    def put(designation):
+        """
+        Adds or replaces the given designation, it has no effect if the
+        designations are not loaded yet as they will be read with it.
+        """
+        with DesignationRegistry._lock:
+            if DesignationRegistry._designations is None:
+                return
+            designations = dict(DesignationRegistry._designations)
+            designations[designation.code] = Designation(
+                designation.code, designation.title)
+            DesignationRegistry._designations = designations
+
+    def remove(code):
+        """
+        Removes the designation with the given code.
+        """
+        with DesignationRegistry._lock:
+            if DesignationRegistry._designations is None or code not in DesignationRegistry._designations:
+                return
+            designations = dict(DesignationRegistry._designations)
+            del designations[code]
+            DesignationRegistry._designations = designations
+
+    def invalidate():
+        """
+        Discards the loaded designations, they are loaded again on the
+        next lookup.
+        """
+        with DesignationRegistry._lock:
+            DesignationRegistry._designations = None
+
+
+class EntityCache:
+    """
+    A class that holds the read-through caches (LRUCache) in front of the
+    point lookups of HRDLHandler: get_employee_by_id, get_designation_by_code
+    and get_designation_by_title. The caches are sized by the <cache>
+    element of dbconfig.xml and are rebuilt (empty) whenever it changes.
+    The write methods of HRDLHandler invalidate the entries they change.
+    The cached objects are shared by all the callers and must not be
+    modified. Within a Transaction the caches are neither read nor
+    filled, as the transaction may see rows the others do not.
+
+    Attributes:
+        _caches(tuple): the (DBConfiguration, employees, designations,
+        titles) caches, employees are keyed by emp_id, designations by
+        code and titles map the casefolded title to the code.
+            default is None(NoneType), until first used.
+
+    Methods:
+        get_employee(emp_id) / put_employee(employee, version) /
+        invalidate_employee(emp_id)
+        get_designation(code) / put_designation(designation, version) /
+        invalidate_designation(code)
+        get_designation_by_title(title)
+        version: the version to be passed to put_employee/put_designation.
+        clear: removes all the cached entries.
+        statistics: returns the counters of the caches.
+    """
+    _caches = None
+    _lock = threading.Lock()
+
+    def _get():
+        dbConfig = DBUtility.getDBConfiguration()
+        caches = EntityCache._caches
+        if caches is not None and caches[0] is dbConfig:
+            return caches
+        with EntityCache._lock:
+            caches = EntityCache._caches
+            if caches is None or (caches[1].max_size, caches[1].ttl) != (dbConfig.cache_size, dbConfig.cache_ttl):
+                caches = (dbConfig, LRUCache(dbConfig.cache_size, dbConfig.cache_ttl), LRUCache(
+                    dbConfig.cache_size, dbConfig.cache_ttl), LRUCache(dbConfig.cache_size, dbConfig.cache_ttl))
+            else:
+                caches = (dbConfig,) + caches[1:]
+            EntityCache._caches = caches
+            return caches
+
+    def version():
+        """
+        Return Value:
+            returns a tuple of the versions of the caches, to be taken
+            before reading from the database and passed to the put methods.
+        """
+        _, employees, designations, titles = EntityCache._get()
+        return (employees.version(), designations.version())
+
+    def get_employee(emp_id):
+        """
+        Return Value: returns the cached Employee or None.
+        """
+        if Transaction.current() is not None:
+            return None
+        return EntityCache._get()[1].get(emp_id)
+
+    def put_employee(employee, version):
+        """
+        Caches the Employee, unless it was invalidated after the version.
+        """
+        if Transaction.current() is not None:
+            return
+        EntityCache._get()[1].put(employee.emp_id, employee, version[0])
+
+    def invalidate_employee(emp_id):
+        """
+        Removes the cached Employee with the emp_id.
+        """
+        EntityCache._get()[1].invalidate(emp_id)
+
+    def get_designation(code):
+        """
+        Return Value: returns the cached Designation or None.
+        """
+        if Transaction.current() is not None:
+            return None
+        return EntityCache._get()[2].get(code)
+
+    def get_designation_by_title(title):
+        """
+        Return Value: returns the cached Designation with the title
+        (compared case insensitively like the database does) or None.
+        """
+        if Transaction.current() is not None:
+            return None
+        _, employees, designations, titles = EntityCache._get()
+        code = titles.get(title.casefold())
+        if code is None:
+            return None
+        designation = designations.get(code)
+        if designation is None or designation.title.casefold() != title.casefold():
+            return None
+        return designation
+
+    def put_designation(designation, version):
+        """
+        Caches the Designation, unless it was invalidated after the version.
+        """
+        if Transaction.current() is not None:
+            return
+        _, employees, designations, titles = EntityCache._get()
+        designations.put(designation.code, designation, version[1])
+        titles.put(designation.title.casefold(), designation.code)
+
+    def invalidate_designation(code):
+        """
+        Removes the cached Designation with the code, the title entries
+        pointing to it are checked against the designation on lookup.
+        """
+        EntityCache._get()[2].invalidate(code)
+
+    def clear():
+        """
+        Removes all the cached entries.
+        """
+        _, employees, designations, titles = EntityCache._get()
+        employees.clear()
+        designations.clear()
+        titles.clear()
+
+    def statistics():
+        """
+        Return Value:
+            returns a dictionary of the counters (refer LRUCache.statistics)
+            of the employees, designations and titles caches.
+        """
+        _, employees, designations, titles = EntityCache._get()
+        return {
+            "employees": employees.statistics(),
+            "designations": designations.statistics(),
+            "titles": titles.statistics()
+        }
+
+
+class EmployeeNameIndex:
+    """
+    A class that keeps the names of all the employees of the Employee
+    Table in a NameIndex, shared by the whole process, so that searching
+    the employees by name does not scan the table.
+    It is loaded on the first search, kept up to date by the add, update
+    and delete methods of HRDLHandler and loaded again when older than
+    _verify_interval seconds, as other processes may write to the same
+    database.
+
+    Attributes:
+        _index(NameIndex): the index of the names keyed by employee ID.
+            default is None(NoneType), until loaded.
+        _loaded_at(float): the time (time.monotonic) of the last load.
+        _verify_interval(float): seconds after which the names are loaded
+        again.
+            default is 60.0
+
+    Methods:
+        search(name, limit): returns the IDs of the matching employees.
+        load(since): loads the names from the Employee Table.
+        put(emp_id, name): adds or replaces the name of an employee.
+        remove(emp_id): removes the name of an employee.
+        invalidate: discards the loaded names, the next search loads
+        them again.
+    """
+    _index = None
+    _loaded_at = 0.0
+    _lock = threading.Lock()
+    _verify_interval = 60.0
+
+    def search(name, limit):
+        """
+        Searches the names equal to, starting with or similar to the name,
+        loading the names first if they are not loaded yet or are older
+        than _verify_interval seconds.
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value:
+            returns a list of at most limit employee IDs, best matches first.
+        """
+        index = EmployeeNameIndex._index
+        if index is None or time.monotonic() - EmployeeNameIndex._loaded_at >= EmployeeNameIndex._verify_interval:
+            index = EmployeeNameIndex.load(
+                time.monotonic() - EmployeeNameIndex._verify_interval)
+        return [emp_id for emp_id, kind, similarity in index.search(name, limit)]
+
+    def load(since=None):
+        """
+        Loads the names from the Employee Table, unless they are loaded
+        already, and loaded at or after since (time.monotonic) if given.
+        The writers wait for the load, so that no change made while
+        reading the table is missed.
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value:
+            returns the NameIndex.
+        """
+        with EmployeeNameIndex._lock:
+            if EmployeeNameIndex._index is None or (since is not None and EmployeeNameIndex._loaded_at < since):
+                loaded_at = time.monotonic()
+                index = NameIndex()
+                store = DBConnection.getStore()
+                if store is not None:
+                    index.add_all(store.names())
+                    EmployeeNameIndex._index = index
+                    EmployeeNameIndex._loaded_at = loaded_at
+                    return index
+                connection = cursor = None
+                try:
+                    # the index is shared, it must not see the uncommitted
+                    # rows of a Transaction of this thread.
+                    connection = DBConnection.getConnection(joinTransaction=False)
+                    cursor = connection.cursor()
+                    cursor.execute("select emp_id, name from employee;")
+                    index.add_all(cursor.fetchall())
+                    connection.commit()
+                except Error as error:
+                    raise DataLayerError(message=error.msg)
+                finally:
+                    DBConnection.releaseConnection(connection, cursor)
+                EmployeeNameIndex._index = index
+                EmployeeNameIndex._loaded_at = loaded_at
+            return EmployeeNameIndex._index
+
+    def put(emp_id, name):
+        """
+        Adds or replaces the name of the employee, it has no effect if the
+        names are not loaded yet as they will be read with it.
+        """
+        with EmployeeNameIndex._lock:
+            if EmployeeNameIndex._index is not None:
+                EmployeeNameIndex._index.add(emp_id, name)
+
+    def remove(emp_id):
+        """
+        Removes the name of the employee.
+        """
+        with EmployeeNameIndex._lock:
+            if EmployeeNameIndex._index is not None:
+                EmployeeNameIndex._index.remove(emp_id)
+
+    def invalidate():
+        """
+        Discards the loaded names, they are loaded again on the next search.
+        """
+        with EmployeeNameIndex._lock:
+            EmployeeNameIndex._index = None
+
+
+class EntityCounts:
+    """
+    A class that keeps the number of employees, of designations and of
+    employees of every designation in memory, shared by the whole process,
+    so that counting them does not scan the tables.
+    The counts are loaded on first use (the server loads them when it
+    starts), kept up to date by the write methods of HRDLHandler once
+    committed and counted again from the tables when they are older than
+    _verify_interval seconds, as other processes may write to the same
+    database.
+    The employees updated or deleted are read by the write beforehand,
+    so that the designation they had is taken off its count.
+    The counts are never modified in place, writers build new ones and
+    swap them, hence the lookups do not need the lock.
+
+    Attributes:
+        _counts(tuple): the (employees, designations, headcounts, time of
+        the load) counts, headcounts maps the designation code to the
+        number of its employees, None if they are to be counted again.
+            default is None(NoneType), until loaded.
+        _version(int): changes on every write, a load which saw a write
+        happening meanwhile is not trusted.
+        _verify_interval(float): seconds after which the counts are
+        counted again from the tables.
+            default is 60.0
+
+    Methods:
+        get: returns the counts, loading them if needed.
+        load: counts the entries of the tables.
+        add_designation / remove_designation
+        add_employee(code) / remove_employee(code) / move_employee(old_code, code)
+        invalidate: discards the counts, the next lookup loads them again.
+    """
+    _counts = None
+    _lock = threading.Lock()
+    _version = 0
+    _verify_interval = 60.0
+
+    def get():
+        """
+        Returns the counts, loading them first if they are not loaded yet,
+        are older than _verify_interval seconds or the per designation
+        counts are to be counted again.
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value:
+            returns a dictionary with the employees(int), the
+            designations(int) and the headcounts(dict of designation code
+            to the number of its employees, the designations without
+            employees are left out).
+        """
+        counts = EntityCounts._counts
+        if counts is None or counts[2] is None or time.monotonic() - counts[3] >= EntityCounts._verify_interval:
+            counts = EntityCounts.load()
+        return {"employees": counts[0], "designations": counts[1], "headcounts": dict(counts[2])}
+
+    def load():
+        """
+        Counts the entries of the tables, committed ones only, and keeps
+        the counts unless a write took place meanwhile, in which case they
+        are counted again (a few times at most, then they are kept to be
+        verified on the next lookup).
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value:
+            returns the counts tuple, refer _counts.
+        """
+        for attempt in range(3):
+            version = EntityCounts._version
+            store = DBConnection.getStore()
+            if store is not None:
+                designations = store.count(MemoryStore.DESIGNATION)
+                headcounts = store.headcounts()
+            else:
+                connection = None
+                try:
+                    connection = DBConnection.getConnection(joinTransaction=False)
+                    row = StatementRegistry.fetchone(
+                        connection, "select count(*) from designation")
+                    rows = StatementRegistry.fetchall(
+                        connection, "select designation_code, count(*) from employee group by designation_code")
+                    DBConnection.commit(connection)
+                except Error as error:
+                    raise DataLayerError(message=error.msg)
+                finally:
+                    DBConnection.releaseConnection(connection)
+                designations = row[0]
+                headcounts = {code: count for code, count in rows}
+            counts = (sum(headcounts.values()), designations,
+                      headcounts, time.monotonic())
+            with EntityCounts._lock:
+                if version == EntityCounts._version:
+                    EntityCounts._counts = counts
+                    return counts
+        with EntityCounts._lock:
+            # verified again on the next lookup.
+            EntityCounts._counts = counts[:3] + (0.0,)
+            return EntityCounts._counts
+
+    def _apply(employees, designations, headcounts):
+        """
+        Adds the changes to the counts, if they are loaded. headcounts maps
+        a designation code to the change in its count, None makes the per
+        designation counts to be counted again.
+        """
+        with EntityCounts._lock:
+            EntityCounts._version += 1
+            counts = EntityCounts._counts
+            if counts is None:
+                return
+            new_headcounts = None
+            if counts[2] is not None and headcounts is not None:
+                new_headcounts = dict(counts[2])
+                for code, change in headcounts.items():
+                    count = new_headcounts.get(code, 0) + change
+                    if count > 0:
+                        new_headcounts[code] = count
+                    else:
+                        new_headcounts.pop(code, None)
+            EntityCounts._counts = (
+                counts[0] + employees, counts[1] + designations, new_headcounts, counts[3])
+
+    def add_designation():
+        """
+        Counts a designation added.
+        """
+        EntityCounts._apply(0, 1, dict())
+
+    def remove_designation():
+        """
+        Counts a designation removed, which had no employees.
+        """
+        EntityCounts._apply(0, -1, dict())
+
+    def add_employee(code):
+        """
+        Counts an employee added against the designation code.
+        """
+        EntityCounts._apply(1, 0, {code: 1})
+
+    def remove_employee(code):
+        """
+        Counts an employee removed from the designation code.
+        """
+        EntityCounts._apply(-1, 0, {code: -1})
+
+    def move_employee(old_code, code):
+        """
+        Counts an employee updated, moved from the designation old_code to
+        the designation code (the same one if it was not changed).
+        """
+        if old_code != code:
+            EntityCounts._apply(0, 0, {old_code: -1, code: 1})
+        else:
+            EntityCounts._apply(0, 0, dict())
+
+    def invalidate():
+        """
+        Discards the counts, they are loaded again on the next lookup.
+        """
+        with EntityCounts._lock:
+            EntityCounts._version += 1
+            EntityCounts._counts = None
+
 
 class Employee:
     """
@@ -149,10 +976,6 @@ class Employee:
     connecting to the MySQL database.
 
     Attributes:
-        _designation_codes_register(dict): the dictionary that holds
-        all the designation code entries from the Designation table
-        allowing only those values to be allocated to the Employee Table.
-
         emp_id(int): the employee ID entry for the Employee Table in
         Database.
         name(str): the employee name entry for the Employee Table in
@@ -190,16 +1013,19 @@ class Employee:
             accumulates all the exceptions into the exceptions
             variable of the Employee class. It also toggles
             the has_exceptions variable accordingly.
-
-        _populate_register:
-            stores the values of all the available designation codes
-            from Designation Table into the _designation_codes_register
-            variable.
+            The designation code is checked against the
+            DesignationRegistry.
+        _from_row(row): creates an Employee from a row of the Employee
+        Table, without validating it.
+        _from_values: creates an Employee from entries validated already
+        by the BatchValidator, without validating them again.
+        to_dict: returns the entries as a dictionary.
     """
-    _designation_codes_register = {}
+    __slots__ = ("exceptions", "has_exceptions", "emp_id", "name", "designation_code", "date", "month",
+                 "year", "salary", "gender", "indian", "pan_no", "aadhar", "dob")
 
-    def __init__(self, emp_id, name, designation_code, date, month, year, salary, gender, indian, pan_no, aadhar, dob=None, exceptions={}, has_exceptions=False):
-        self.exceptions = exceptions
+    def __init__(self, emp_id, name, designation_code, date, month, year, salary, gender, indian, pan_no, aadhar, dob=None, exceptions=None, has_exceptions=False):
+        self.exceptions = dict() if exceptions is None else exceptions
         self.has_exceptions = has_exceptions
         self.emp_id = emp_id
         self.name = name
@@ -213,30 +1039,11 @@ class Employee:
         self.pan_no = pan_no
         self.aadhar = aadhar
         self.dob = dob
-        Employee._populate_register()
         self._validate_values()
         if not self.has_exceptions:
             self.dob = datetime(self.year, self.month,
                                 self.date).strftime("%Y-%m-%d")
 
-    def _populate_register():
-        """
-        Stores the values of all the available designation codes
-        from Designation Table into the _designation_codes_register
-        variable.
-
-        Raise Exception:
-            raises DataLayerError when can't call the get_designations
-            method of HRDLHandler
-        """
-        try:
-            designations = HRDLHandler.get_designations()
-            for designation in designations:
-                Employee._designation_codes_register[designation.code] = designation
-        except DataLayerError as dle:
-            print(dle.message)
-            print(dle.exceptions)
-
     def _validate_values(self):
         """
         _validate_values:
@@ -289,7 +1096,7 @@ class Employee:
             if length_of_name == 0 or length_of_name > 35:
                 self.exceptions["name"] = (
                     'V', f"Value of name is {self.name}, it should be greater than zero and less than 35")
-        if ("designation_code" not in self.exceptions) and (self.designation_code not in Employee._designation_codes_register):
+        if ("designation_code" not in self.exceptions) and not DesignationRegistry.contains(self.designation_code):
             self.exceptions["designation_code"] = (
                 'V', f"Invalid Designation Code : {self.designation_code}")
         if ("dob" not in self.exceptions):
@@ -319,6 +1126,65 @@ class Employee:
         if len(self.exceptions) > 0:
             self.has_exceptions = True
 
+    def _from_row(row):
+        """
+        Creates an Employee from a row of the Employee Table. The entries
+        of the table are valid already, hence they are not validated again,
+        dob is kept as the datetime.date read and salary is made a float.
+
+        Return Value: returns an Employee object.
+        """
+        employee = Employee.__new__(Employee)
+        employee.exceptions = _NO_EXCEPTIONS
+        employee.has_exceptions = False
+        (employee.emp_id, employee.name, employee.designation_code, dob, salary,
+         employee.gender, employee.indian, employee.pan_no, employee.aadhar) = row
+        employee.dob = dob
+        employee.date = dob.day
+        employee.month = dob.month
+        employee.year = dob.year
+        employee.salary = float(salary)
+        return employee
+
+    def _from_values(emp_id, name, designation_code, date, month, year, salary, gender, indian, pan_no, aadhar):
+        """
+        Creates an Employee from entries validated already (refer the
+        validation module), like the constructor does for valid entries
+        but without validating them again.
+
+        Return Value: returns an Employee object.
+        """
+        employee = Employee.__new__(Employee)
+        employee.exceptions = dict()
+        employee.has_exceptions = False
+        employee.emp_id = emp_id
+        employee.name = name
+        employee.designation_code = designation_code
+        employee.date = date
+        employee.month = month
+        employee.year = year
+        employee.salary = salary
+        employee.gender = gender
+        employee.indian = indian
+        employee.pan_no = pan_no
+        employee.aadhar = aadhar
+        # as datetime.strftime("%Y-%m-%d") gives it, the years are of
+        # four digits.
+        employee.dob = "%04d-%02d-%02d" % (year, month, date)
+        return employee
+
+    def to_dict(self):
+        """
+        Return Value: returns a dictionary of the entries, with the same
+        keys as the arguments of the constructor of all_common's Employee,
+        dob as a "YYYY-MM-DD" string.
+        """
+        return {"exceptions": dict(self.exceptions), "has_exceptions": self.has_exceptions,
+                "emp_id": self.emp_id, "name": self.name, "designation_code": self.designation_code,
+                "date": self.date, "month": self.month, "year": self.year, "salary": self.salary,
+                "gender": self.gender, "indian": self.indian, "pan_no": self.pan_no, "aadhar": self.aadhar,
+                "dob": self.dob.isoformat() if isinstance(self.dob, date) else self.dob}
+
 
 class DBConfiguration:
     """
@@ -335,6 +1201,52 @@ class DBConfiguration:
         to be provided by the user.
         password(str): the password of database connection which is
         to be provided by the user.
+            host, port, user and password are needed by the MySQL
+            architecture only, for SQLite the database is the path of
+            the database file and for Memory the path of the snapshot
+            file, if any.
+        architecture(str): the storage backend, MySQL, SQLite or Memory.
+            default is MySQL
+        pool_min_size(int): the number of connections the pool keeps
+        open even when they are idle.
+            default is 1
+        pool_max_size(int): the maximum number of connections the pool
+        opens at the same time.
+            default is 10
+        pool_idle_timeout(float): seconds after which an idle connection
+        above pool_min_size gets closed.
+            default is 300.0
+        pool_wait_timeout(float): seconds to wait for a free connection
+        when the pool is exhausted.
+            default is 10.0
+        pool_validation_interval(float): a connection idle for longer than
+        these many seconds is pinged before it is handed out.
+            default is 5.0
+        batch_size(int): the number of rows the bulk methods of HRDLHandler
+        insert in one statement and one transaction.
+            default is 500
+        cache_size(int): the number of entries each cache of EntityCache
+        holds, 0 disables the caches.
+            default is 1000
+        cache_ttl(float): seconds for which a cached entry is served.
+            default is 30.0
+        slow_threshold(float): the calls of HRDLHandler taking longer than
+        these many seconds are logged with their statements, 0 disables
+        the logging (refer metrics module).
+            default is 1.0
+        replicas(list): the DBConfiguration objects of the read replicas,
+        given as dictionaries of the host, port, database, user and
+        password which differ from those of the primary database.
+            default is empty list([]), all the reads go to the primary
+        replica_balancing(str): round_robin sends the reads to the
+        replicas in turns, least_latency to the replica which has served
+        them the fastest lately.
+            default is round_robin
+        replica_sticky_window(float): seconds after a write of a client
+        for which its reads go to the primary database, so that it reads
+        its own writes, 0 disables it. The replicas are expected to catch
+        up with the primary within these many seconds.
+            default is 2.0
 
     Methods:
         _validate_values:
@@ -346,14 +1258,34 @@ class DBConfiguration:
                 raises DataLayerError exception.
     """
 
-    def __init__(self, host, port, database, user, password):
+    def __init__(self, host, port, database, user, password, pool_min_size=1, pool_max_size=10, pool_idle_timeout=300.0, pool_wait_timeout=10.0, pool_validation_interval=5.0, batch_size=500, cache_size=1000, cache_ttl=30.0, architecture="MySQL", slow_threshold=1.0, replicas=None, replica_balancing="round_robin", replica_sticky_window=2.0):
         self.exceptions = dict()
         self.has_exceptions = False
+        self.architecture = architecture
         self.host = host
         self.port = port
         self.database = database
         self.user = user
         self.password = password
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self.pool_idle_timeout = pool_idle_timeout
+        self.pool_wait_timeout = pool_wait_timeout
+        self.pool_validation_interval = pool_validation_interval
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.slow_threshold = slow_threshold
+        self.replica_balancing = replica_balancing
+        self.replica_sticky_window = replica_sticky_window
+        self.replicas = list()
+        for replica in (replicas or list()):
+            entries = {"host": host, "port": port, "database": database,
+                       "user": user, "password": password}
+            entries.update(replica)
+            self.replicas.append(DBConfiguration(pool_min_size=0, pool_max_size=pool_max_size, pool_idle_timeout=pool_idle_timeout,
+                                                 pool_wait_timeout=pool_wait_timeout, pool_validation_interval=pool_validation_interval,
+                                                 architecture=architecture, **entries))
         self._validate_values()
 
     def _validate_values(self):
@@ -366,65 +1298,1288 @@ class DBConfiguration:
             Exception Raising:
                 raises DataLayerError exception.
         """
-        if isinstance(self.host, str) == False:
+        backend = get_backend(self.architecture)
+        if backend is None:
+            self.exceptions["architecture"] = (
+                'V', f"architecture {self.architecture} is not supported, it should be one of {', '.join(backend.name for backend in BACKENDS.values())}")
+            required = ("host", "port", "database", "user", "password")
+        else:
+            required = backend.required
+        if "host" in required and isinstance(self.host, str) == False:
             self.exceptions["host"] = (
                 'T', f"host is of type {type(self.host)}, it should be of type {type('A')}")
-        if isinstance(self.port, int) == False:
+        if "port" in required and isinstance(self.port, int) == False:
             self.exceptions["port"] = (
                 'T', f"port is of type {type(self.port)}, it should be of type {type(10)}")
-        if isinstance(self.database, str) == False:
+        if ("database" in required or self.database != None) and isinstance(self.database, str) == False:
             self.exceptions["database"] = (
                 'T', f"database is of type {type(self.database)}, it should be of type {type('A')}")
-        if isinstance(self.user, str) == False:
+        if "user" in required and isinstance(self.user, str) == False:
             self.exceptions["user"] = (
                 'T', f"user is of type {type(self.user)}, it should be of type {type('A')}")
-        if isinstance(self.password, str) == False:
+        if "password" in required and isinstance(self.password, str) == False:
             self.exceptions["password"] = (
                 'T', f"password is of type {type(self.password)}, it should be of type {type('A')}")
-        if 'host' not in self.exceptions and len(self.host) == 0:
+        if "host" in required and 'host' not in self.exceptions and len(self.host) == 0:
             self.exceptions["host"] = ('V', "host ip/name is missing")
-        if 'port' not in self.exceptions and (self.port <= 0 or self.port >= 65535):
+        if "port" in required and 'port' not in self.exceptions and (self.port <= 0 or self.port >= 65535):
             self.exceptions['port'] = (
                 'V', "port is not in the permissible range, unable to assign.")
-        if 'database' not in self.exceptions and len(self.database) == 0:
+        if "database" in required and 'database' not in self.exceptions and len(self.database) == 0:
             self.exceptions["database"] = ('V', "database name is missing")
-        if 'user' not in self.exceptions and len(self.user) == 0:
+        if "user" in required and 'user' not in self.exceptions and len(self.user) == 0:
             self.exceptions["user"] = ('V', "user is missing")
-        if 'password' not in self.exceptions and len(self.password) == 0:
+        if "password" in required and 'password' not in self.exceptions and len(self.password) == 0:
             self.exceptions["password"] = ('V', "password is missing")
+        if self.pool_min_size < 0:
+            self.exceptions["pool_min_size"] = (
+                'V', f"pool min_size is {self.pool_min_size}, it should be greater than or equal to zero")
+        if self.pool_max_size <= 0:
+            self.exceptions["pool_max_size"] = (
+                'V', f"pool max_size is {self.pool_max_size}, it should be greater than zero")
+        elif self.pool_min_size > self.pool_max_size:
+            self.exceptions["pool_max_size"] = (
+                'V', f"pool max_size is {self.pool_max_size}, it should not be less than min_size {self.pool_min_size}")
+        if self.pool_idle_timeout <= 0:
+            self.exceptions["pool_idle_timeout"] = (
+                'V', "pool idle_timeout should be greater than zero")
+        if self.pool_wait_timeout <= 0:
+            self.exceptions["pool_wait_timeout"] = (
+                'V', "pool wait_timeout should be greater than zero")
+        if self.pool_validation_interval < 0:
+            self.exceptions["pool_validation_interval"] = (
+                'V', "pool validation_interval should be greater than or equal to zero")
+        if self.batch_size <= 0:
+            self.exceptions["batch_size"] = (
+                'V', f"batch_size is {self.batch_size}, it should be greater than zero")
+        if self.cache_size < 0:
+            self.exceptions["cache_size"] = (
+                'V', f"cache size is {self.cache_size}, it should be greater than or equal to zero")
+        if self.cache_ttl <= 0:
+            self.exceptions["cache_ttl"] = (
+                'V', "cache ttl should be greater than zero")
+        if self.slow_threshold < 0:
+            self.exceptions["slow_threshold"] = (
+                'V', "metrics slow_threshold should be greater than or equal to zero")
+        if len(self.replicas) > 0 and backend is MemoryBackend:
+            self.exceptions["replicas"] = (
+                'V', "the Memory architecture has no replicas")
+        for number, replica in enumerate(self.replicas, 1):
+            for name, exception in replica.exceptions.items():
+                self.exceptions[f"replica {number} {name}"] = exception
+        if self.replica_balancing not in ReplicaSet.BALANCINGS:
+            self.exceptions["replica_balancing"] = (
+                'V', f"replicas balancing is {self.replica_balancing}, it should be one of {', '.join(ReplicaSet.BALANCINGS)}")
+        if self.replica_sticky_window < 0:
+            self.exceptions["replica_sticky_window"] = (
+                'V', "replicas sticky_window should be greater than or equal to zero")
         if len(self.exceptions) > 0:
             self.has_exceptions = True
 
 
-class DBConnection:
+class ConnectionPool:
+    """
+    A bounded and thread-safe pool of database connections, so that
+    the connections (and their handshakes) are reused across the calls
+    of HRDLHandler instead of being opened and closed every time.
+
+    Attributes:
+        factory(function): opens and returns a new connection.
+        is_alive(function): takes a connection and returns True if it
+        is still usable.
+        min_size(int): the number of connections kept open even when idle.
+        max_size(int): the maximum number of connections open at a time.
+        idle_timeout(float): seconds after which an idle connection above
+        min_size gets closed.
+        wait_timeout(float): seconds to wait for a free connection when
+        max_size connections are already checked out.
+        validation_interval(float): a connection idle for longer than
+        these many seconds is checked with is_alive before it is handed out.
+        on_close(function): takes a connection, it is called just before
+        the pool closes the connection.
+            default is None(NoneType)
+
+    Methods:
+        acquire: checks out a connection from the pool.
+        release: returns a checked out connection to the pool.
+        fill: opens connections until min_size of them are available.
+        close: closes the idle connections and retires the pool.
+        statistics: returns the counters of the pool.
+    """
+
+    def __init__(self, factory, is_alive, min_size=1, max_size=10, idle_timeout=300.0, wait_timeout=10.0, validation_interval=5.0, on_close=None):
+        self.factory = factory
+        self.is_alive = is_alive
+        self.on_close = on_close
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.wait_timeout = wait_timeout
+        self.validation_interval = validation_interval
+        self._condition = threading.Condition()
+        self._idle = deque()
+        self._in_use = set()
+        self._size = 0
+        self._closed = False
+        self._checkouts = 0
+        self._waits = 0
+        self._misses = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._evicted = 0
+        self._failed_checks = 0
+
+    def acquire(self, blocking=True):
+        """
+        Checks out a connection, an idle one is preferred, otherwise a new
+        one is opened while the pool is below max_size, otherwise it waits
+        for wait_timeout seconds for a connection to be released, unless
+        blocking is False.
+        The idle connections are health checked before being handed out.
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value:
+            returns a connection, None if blocking is False and the pool
+            has no connection free.
+        """
+        while True:
+            connection = None
+            with self._condition:
+                stale = self._pop_expired()
+                waited = False
+                deadline = time.monotonic() + self.wait_timeout
+                opening = False
+                while not self._idle and self._size >= self.max_size:
+                    if not blocking:
+                        break
+                    if not waited:
+                        waited = True
+                        self._waits += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise DataLayerError(
+                            message=f"No database connection got free within {self.wait_timeout} seconds, please try again")
+                    self._condition.wait(remaining)
+                if self._idle:
+                    connection, last_used = self._idle.pop()
+                elif self._size < self.max_size:
+                    self._size += 1
+                    self._misses += 1
+                    opening = True
+            self._close_all(stale)
+            if connection is None and not opening:
+                return None
+            if connection is None:
+                connection = self._open()
+            elif time.monotonic() - last_used > self.validation_interval and not self._check(connection):
+                self._discard(connection)
+                continue
+            with self._condition:
+                self._checkouts += 1
+                self._in_use.add(connection)
+            return connection
+
+    def release(self, connection, discard=False):
+        """
+        Returns a checked out connection to the pool. A connection left
+        inside a transaction is rolled back first, a connection which
+        cannot be reused (or was asked to be discarded) is closed.
+        """
+        with self._condition:
+            foreign = connection not in self._in_use
+            self._in_use.discard(connection)
+            if self._closed:
+                discard = True
+        if foreign:
+            # borrowed from a pool which has been replaced since.
+            self._close_all([connection])
+            return
+        if not discard:
+            try:
+                if getattr(connection, "unread_result", False):
+                    discard = True
+                elif connection.in_transaction:
+                    connection.rollback()
+            except Exception:
+                discard = True
+        if discard:
+            self._discard(connection)
+            return
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            stale = self._pop_expired()
+            self._condition.notify()
+        self._close_all(stale)
+
+    def fill(self):
+        """
+        Opens new connections until min_size connections are available.
+
+        Exception Raising:
+            raises DataLayerError exception.
+        """
+        while True:
+            with self._condition:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            connection = self._open()
+            with self._condition:
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+
+    def close(self):
+        """
+        Closes all the idle connections and retires the pool, the
+        connections still checked out get closed on their release.
+        """
+        with self._condition:
+            self._closed = True
+            stale = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(stale)
+            self._condition.notify_all()
+        self._close_all(stale)
+
+    def statistics(self):
+        """
+        Return Value:
+            returns a dictionary with the current size of the pool and the
+            counters of checkouts, waits (checkouts which had to wait for a
+            free connection), misses (checkouts which had to open a new
+            connection), timeouts, created, discarded, evicted connections
+            and failed health checks.
+        """
+        with self._condition:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "misses": self._misses,
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "discarded": self._discarded,
+                "evicted": self._evicted,
+                "failed_checks": self._failed_checks
+            }
+
+    def _open(self):
+        try:
+            connection = self.factory()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._created += 1
+        return connection
+
+    def _check(self, connection):
+        try:
+            if self.is_alive(connection):
+                return True
+        except Exception:
+            pass
+        with self._condition:
+            self._failed_checks += 1
+        return False
+
+    def _discard(self, connection):
+        with self._condition:
+            self._size -= 1
+            self._discarded += 1
+            self._condition.notify()
+        self._close_all([connection])
+
+    def _pop_expired(self):
+        # must be called with the condition held, the idle deque is ordered
+        # from the least to the most recently used connection.
+        stale = list()
+        expiry = time.monotonic() - self.idle_timeout
+        while self._idle and self._size > self.min_size and self._idle[0][1] < expiry:
+            stale.append(self._idle.popleft()[0])
+            self._size -= 1
+            self._evicted += 1
+        return stale
+
+    def _close_all(self, connections):
+        for connection in connections:
+            try:
+                if self.on_close is not None:
+                    self.on_close(connection)
+                connection.close()
+            except Exception:
+                pass
+
+
+class ReplicaSet:
+    """
+    The read replicas of the database, with a ConnectionPool for each of
+    them, among which the reads are balanced. The connections of a replica
+    are opened when first needed, a replica which cannot be reached is
+    left out for retry_interval seconds and the read goes to the next one.
+    A replica whose connections are all checked out is not waited for,
+    the read goes to the next one (or to the primary database).
+
+    Attributes:
+        dbConfigs(list): the DBConfiguration objects of the replicas.
+        balancing(str): round_robin takes the replicas in turns,
+        least_latency takes the one which answered a ping the soonest
+        lately (an exponentially weighted average of the round trips, one
+        timed every probe_interval seconds at most, on a connection being
+        checked out), the replicas not measured yet first.
+            default is round_robin
+        retry_interval(float): seconds for which a replica which could not
+        give a connection is left out.
+            default is 10.0
+        probe_interval(float): seconds between two pings of a replica
+        for least_latency.
+            default is 1.0
+
+    Methods:
+        acquire: checks out a connection of one of the replicas.
+        release: returns the connection to the pool of its replica.
+        owns(connection): tells whether the connection is of a replica.
+        close: closes the pools of all the replicas.
+        statistics: returns the counters of every replica.
+    """
+    ROUND_ROBIN = "round_robin"
+    LEAST_LATENCY = "least_latency"
+    BALANCINGS = (ROUND_ROBIN, LEAST_LATENCY)
+    # the weight of the latest latency in the average.
+    _smoothing = 0.2
+
+    def __init__(self, dbConfigs, balancing="round_robin", retry_interval=10.0, probe_interval=1.0):
+        self.dbConfigs = dbConfigs
+        self.balancing = balancing
+        self.retry_interval = retry_interval
+        self.probe_interval = probe_interval
+        self._lock = threading.Lock()
+        self._pools = list()
+        for index, dbConfig in enumerate(dbConfigs):
+            self._pools.append(ConnectionPool(lambda index=index: self._open(index), get_backend(dbConfig.architecture).is_alive,
+                                              min_size=dbConfig.pool_min_size, max_size=dbConfig.pool_max_size,
+                                              idle_timeout=dbConfig.pool_idle_timeout, wait_timeout=dbConfig.pool_wait_timeout,
+                                              validation_interval=dbConfig.pool_validation_interval, on_close=self._forget))
+        self._connections = dict()
+        self._turn = 0
+        self._latencies = [None] * len(dbConfigs)
+        self._probed = [None] * len(dbConfigs)
+        self._left_out = [0.0] * len(dbConfigs)
+        self._reads = [0] * len(dbConfigs)
+        self._failures = [0] * len(dbConfigs)
+        self._busy = [0] * len(dbConfigs)
+
+    def acquire(self):
+        """
+        Checks out a connection of the replica chosen by the balancing,
+        trying the others in turn if it cannot give one at once.
+
+        Return Value:
+            returns a connection, None if no replica could give one.
+        """
+        for index in self._order():
+            try:
+                connection = self._pools[index].acquire(blocking=False)
+                if connection is not None and not self._probe(index, connection):
+                    self._pools[index].release(connection, discard=True)
+                    raise DataLayerError(message="the replica did not answer")
+            except DataLayerError:
+                with self._lock:
+                    self._failures[index] += 1
+                    self._left_out[index] = time.monotonic() + \
+                        self.retry_interval
+                continue
+            with self._lock:
+                if connection is None:
+                    self._busy[index] += 1
+                    continue
+                self._reads[index] += 1
+            return connection
+        return None
+
+    def release(self, connection, discard=False):
+        """
+        Returns the connection to the pool of its replica.
+        """
+        with self._lock:
+            index = self._connections.get(connection)
+        if index is None:
+            self._forget(connection)
+            try:
+                connection.close()
+            except Exception:
+                pass
+            return
+        self._pools[index].release(connection, discard)
+
+    def owns(self, connection):
+        """
+        Return Value:
+            returns True if the connection was opened by one of the replicas.
+        """
+        return connection in self._connections
+
+    def close(self):
+        """
+        Closes the pools of all the replicas, the connections still checked
+        out get closed on their release.
+        """
+        for pool in self._pools:
+            pool.close()
+
+    def statistics(self):
+        """
+        Return Value:
+            returns a list with a dictionary for every replica, of its host
+            and database, the reads it served, the times it could not give
+            a connection, the times all its connections were checked out
+            (the read went elsewhere), its average latency in seconds (None
+            until measured), whether it is left out now and the counters of
+            its pool (refer ConnectionPool.statistics).
+        """
+        now = time.monotonic()
+        with self._lock:
+            replicas = [{
+                "host": dbConfig.host,
+                "database": dbConfig.database,
+                "reads": self._reads[index],
+                "failures": self._failures[index],
+                "busy": self._busy[index],
+                "latency": self._latencies[index],
+                "left_out": self._left_out[index] > now
+            } for index, dbConfig in enumerate(self.dbConfigs)]
+        for index, replica in enumerate(replicas):
+            replica["pool"] = self._pools[index].statistics()
+        return replicas
+
+    def _order(self):
+        # the replicas not left out, in the order they are to be tried.
+        now = time.monotonic()
+        with self._lock:
+            indexes = [index for index in range(len(self._pools))
+                       if self._left_out[index] <= now]
+            if self.balancing == ReplicaSet.LEAST_LATENCY:
+                indexes.sort(key=lambda index: self._latencies[index] or 0.0)
+            else:
+                turn = self._turn % len(self._pools)
+                self._turn += 1
+                indexes = [index for index in indexes if index >= turn] + \
+                    [index for index in indexes if index < turn]
+        return indexes
+
+    def _probe(self, index, connection):
+        """
+        Pings the replica on the connection, for least_latency, unless it
+        was pinged within probe_interval seconds, and counts the round
+        trip in its latency.
+
+        Return Value:
+            returns False if the ping failed.
+        """
+        if self.balancing != ReplicaSet.LEAST_LATENCY:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            probed = self._probed[index]
+            if probed is not None and now - probed < self.probe_interval:
+                return True
+            self._probed[index] = now
+        started = time.perf_counter()
+        try:
+            alive = get_backend(self.dbConfigs[index].architecture).is_alive(connection)
+        except Exception:
+            alive = False
+        latency = time.perf_counter() - started
+        if alive:
+            with self._lock:
+                average = self._latencies[index]
+                self._latencies[index] = latency if average is None else average + \
+                    ReplicaSet._smoothing * (latency - average)
+        return alive
+
+    def _open(self, index):
+        connection = DBConnection._connect(self.dbConfigs[index])
+        with self._lock:
+            self._connections[connection] = index
+        return connection
+
+    def _forget(self, connection):
+        StatementRegistry.forget(connection)
+        with self._lock:
+            self._connections.pop(connection, None)
+
+
+class DBConnection:
+    """
+    A class that sets the connection between the database whose details
+    are provided by the user and this module.
+    The connections are borrowed from a ConnectionPool which is created
+    from the configuration and recreated whenever the configuration changes.
+
+    Methods:
+        getConnection:
+            this method utilizes the data returned by DBUtility class'
+            getDBConfiguration method and checks out a connection between
+            the database and the module from the pool.
+        releaseConnection:
+            returns the connection borrowed by getConnection to the pool.
+        commit:
+            commits the work done on the connection, unless it belongs
+            to a Transaction.
+        onCommit:
+            runs a function once the work done is committed.
+        onRollback:
+            runs a function if the Transaction of the work rolls back.
+        getPoolStatistics:
+            returns the counters of the pool.
+        getReplicaStatistics:
+            returns the counters of the read replicas.
+        setClient:
+            names the client the calls of the thread are made for.
+        getClient:
+            returns the client the calls of the thread are made for.
+        markWrite:
+            notes that a client has just written.
+        shareWrites:
+            keeps the times of the writes in memory shared with the
+            processes forked afterwards.
+        mayBeStale:
+            tells whether what was read on a connection may be out of date.
+        getBackend:
+            returns the storage backend configured.
+        getStore:
+            returns the MemoryStore of the Memory architecture.
+        closeConnections:
+            closes the pools of the primary database and of the replicas.
+
+    The reads may be asked to be made on a read replica, refer the
+    <replicas> element of dbconfig.xml, the writes are always made on the
+    primary database. For sticky_window seconds after a client has
+    written, its reads are made on the primary database as well, so that
+    it reads what it has written even if the replicas lag behind.
+    The times of the writes are kept by the process, or in shared memory
+    once shareWrites is called, so that the processes of a supervisor
+    serving the same clients see each other's writes (refer shareWrites).
+    """
+    _pool = None
+    _pool_config = None
+    _pool_lock = threading.Lock()
+    _store = None
+    _replicas = None
+    _writes = dict()
+    _last_write = None
+    _shared_writes = None
+    _local = threading.local()
+
+    def getConnection(joinTransaction=True, replica=False):
+        """
+        It utilizes the data returned by DBUtility class'
+        getDBConfiguration method and checks out a connection between
+        the database and the module from the pool.
+        Within a Transaction, the connection of the Transaction is
+        returned instead, unless joinTransaction is False.
+        If replica is True, the connection is of a read replica when any
+        is configured, unless the client of the thread wrote within the
+        sticky_window, or no replica can give one.
+        The connection must be given back with releaseConnection.
+
+        Exception Raising:
+            raises DataLayerError exception.
+        """
+        transaction = Transaction.current()
+        if joinTransaction and transaction is not None:
+            return transaction.connection
+        dbConfig = DBUtility.getDBConfiguration()
+        if dbConfig.has_exceptions:
+            raise DataLayerError(exceptions=dbConfig.exceptions)
+        started = time.perf_counter()
+        connection = None
+        if replica and len(dbConfig.replicas) > 0 and not DBConnection._isSticky(dbConfig):
+            connection = DBConnection._getReplicas(dbConfig).acquire()
+        if connection is None:
+            connection = DBConnection._getPool(dbConfig).acquire()
+        Metrics.record(Metrics.ACQUIRE, time.perf_counter() - started)
+        return connection
+
+    def releaseConnection(connection, cursor=None, discard=False):
+        """
+        Closes the cursor (if any) and returns the connection to the pool
+        it was borrowed from. It accepts None for both the arguments, so
+        that it can be called from a finally block unconditionally.
+        The connection of a Transaction is kept until the Transaction ends.
+        """
+        if cursor is not None:
+            try:
+                cursor.close()
+            except:
+                pass
+        if connection is None:
+            return
+        transaction = Transaction.current()
+        if transaction is not None and transaction.connection is connection:
+            if discard or getattr(connection, "unread_result", False):
+                # the rows left unread must be read before the next statement.
+                try:
+                    connection.consume_results()
+                except Exception:
+                    transaction._failed = True
+            return
+        replicas = DBConnection._replicas
+        if replicas is not None and replicas[1].owns(connection):
+            replicas[1].release(connection, discard)
+            return
+        pool = DBConnection._pool
+        if pool is None:
+            StatementRegistry.forget(connection)
+            try:
+                connection.close()
+            except:
+                pass
+            return
+        pool.release(connection, discard)
+
+    def commit(connection):
+        """
+        Commits the work done on the connection, it does nothing for the
+        connection of a Transaction, which commits when it ends.
+
+        Exception Raising:
+            raises Error (the error of the backend).
+        """
+        transaction = Transaction.current()
+        if transaction is not None and transaction.connection is connection:
+            return
+        started = time.perf_counter()
+        connection.commit()
+        Metrics.record(Metrics.COMMIT, time.perf_counter() - started)
+
+    def onCommit(function, *arguments):
+        """
+        Calls the function with the arguments once the work done is
+        committed, that is now, or when the Transaction of the thread
+        commits, it is not called if the Transaction rolls back.
+        It is used to update the in-memory structures (caches, registries)
+        only with what has been committed.
+        """
+        transaction = Transaction.current()
+        if transaction is None:
+            function(*arguments)
+        else:
+            transaction._actions.append((function, arguments))
+
+    def onRollback(function, *arguments):
+        """
+        Calls the function with the arguments if the Transaction of the
+        thread rolls back, it is not called outside of a Transaction.
+        It is used to undo what a write did to the objects given to it
+        (the ids generated), so that they can be written again.
+        """
+        transaction = Transaction.current()
+        if transaction is not None:
+            transaction._undo.append((function, arguments))
+
+    def getPoolStatistics():
+        """
+        Return Value:
+            returns a dictionary of the counters of the connection pool,
+            refer ConnectionPool.statistics, or an empty dictionary if no
+            connection has been requested yet.
+        """
+        pool = DBConnection._pool
+        if pool is None:
+            return dict()
+        return pool.statistics()
+
+    def getReplicaStatistics():
+        """
+        Return Value:
+            returns a list of the counters of the read replicas, refer
+            ReplicaSet.statistics, or an empty list if no read has been
+            made on them yet.
+        """
+        replicas = DBConnection._replicas
+        if replicas is None:
+            return list()
+        return replicas[1].statistics()
+
+    def setClient(client):
+        """
+        Names the client the calls of HRDLHandler made by the thread are
+        for (the address of the client, for the server), the writes and
+        the stickiness of the reads are tracked by it. None names the
+        thread itself, which is the default.
+        """
+        DBConnection._local.client = client
+
+    def getClient():
+        """
+        Return Value:
+            returns the client named by setClient for the thread, or the
+            identifier of the thread if none is named.
+        """
+        client = getattr(DBConnection._local, "client", None)
+        if client is None:
+            return threading.get_ident()
+        return client
+
+    def markWrite(client=None):
+        """
+        Notes that the client (the client of the thread, if None) has just
+        written, its reads are made on the primary database for
+        sticky_window seconds. The write methods of HRDLHandler call it,
+        for the client of the thread which wrote, once their work commits.
+        """
+        now = time.monotonic()
+        if client is None:
+            client = DBConnection.getClient()
+        shared = DBConnection._shared_writes
+        if shared is not None:
+            shared[DBConnection._slot(shared, client)] = now
+            shared[0] = now
+            return
+        writes = DBConnection._writes
+        if len(writes) >= 1024 and client not in writes:
+            # the clients which wrote long ago are not sticky anymore.
+            expiry = now - DBUtility.getDBConfiguration().replica_sticky_window
+            for key, written in list(writes.items()):
+                if written < expiry:
+                    writes.pop(key, None)
+        writes[client] = now
+        DBConnection._last_write = now
+
+    def shareWrites(slots=4096):
+        """
+        Keeps the times of the writes of the clients in memory shared with
+        the processes forked afterwards, instead of in the process, so
+        that a client whose next request is served by another process of
+        the supervisor (refer network_server) still reads what it has
+        written, and no process caches what a replica may not have caught
+        up with. The process about to fork calls it.
+        The clients are spread upon the slots by a hash of their name, two
+        clients falling into the same slot make each other sticky, which
+        only sends more of their reads to the primary database.
+
+        Arguments:
+            slots(int): the number of slots.
+                default is 4096
+        """
+        # slot 0 holds the time of the last write by any client, 0.0 is
+        # never (time.monotonic is shared by the processes).
+        DBConnection._shared_writes = multiprocessing.RawArray("d", slots + 1)
+
+    def mayBeStale(connection):
+        """
+        Tells whether the rows read on the connection may be out of date,
+        that is the connection is of a replica and a write took place,
+        by any client, within the sticky_window. What may be stale is not
+        to be put in the caches shared by all the clients.
+
+        Return Value:
+            returns a bool.
+        """
+        replicas = DBConnection._replicas
+        if connection is None or replicas is None or not replicas[1].owns(connection):
+            return False
+        last_write = DBConnection._last_write
+        shared = DBConnection._shared_writes
+        if shared is not None:
+            last_write = shared[0] or None
+        return last_write is not None and time.monotonic() - last_write < DBUtility.getDBConfiguration().replica_sticky_window
+
+    def _isSticky(dbConfig):
+        client = DBConnection.getClient()
+        shared = DBConnection._shared_writes
+        if shared is not None:
+            written = shared[DBConnection._slot(shared, client)] or None
+        else:
+            written = DBConnection._writes.get(client)
+        return written is not None and time.monotonic() - written < dbConfig.replica_sticky_window
+
+    def _slot(shared, client):
+        # the slot of the client, slot 0 being the last write by any.
+        return zlib.crc32(str(client).encode("utf-8")) % (len(shared) - 1) + 1
+
+    def _getReplicas(dbConfig):
+        replicas = DBConnection._replicas
+        if replicas is not None and replicas[2] is dbConfig:
+            return replicas[1]
+        key = DBConnection._replicasKey(dbConfig)
+        with DBConnection._pool_lock:
+            replicas = DBConnection._replicas
+            if replicas is not None and replicas[0] == key:
+                # the configuration file was rewritten without changing
+                # anything the replicas depend on.
+                DBConnection._replicas = (key, replicas[1], dbConfig)
+            else:
+                DBConnection._replicas = (key, ReplicaSet(
+                    dbConfig.replicas, dbConfig.replica_balancing), dbConfig)
+                if replicas is not None:
+                    replicas[1].close()
+            return DBConnection._replicas[1]
+
+    def _replicasKey(dbConfig):
+        return (dbConfig.replica_balancing,) + tuple(DBConnection._poolKey(replica) for replica in dbConfig.replicas)
+
+    def _getPool(dbConfig):
+        pool = DBConnection._pool
+        if pool is not None and DBConnection._pool_config is dbConfig:
+            return pool
+        with DBConnection._pool_lock:
+            if DBConnection._pool is not None and DBConnection._poolKey(DBConnection._pool_config) == DBConnection._poolKey(dbConfig):
+                # the configuration file was rewritten without changing
+                # anything the pool depends on.
+                DBConnection._pool_config = dbConfig
+            else:
+                old_pool = DBConnection._pool
+                pool = ConnectionPool(lambda: DBConnection._connect(dbConfig), get_backend(dbConfig.architecture).is_alive,
+                                      min_size=dbConfig.pool_min_size, max_size=dbConfig.pool_max_size,
+                                      idle_timeout=dbConfig.pool_idle_timeout, wait_timeout=dbConfig.pool_wait_timeout,
+                                      validation_interval=dbConfig.pool_validation_interval, on_close=StatementRegistry.forget)
+                pool.fill()
+                DBConnection._pool = pool
+                DBConnection._pool_config = dbConfig
+                if old_pool is not None:
+                    old_pool.close()
+            return DBConnection._pool
+
+    def _poolKey(dbConfig):
+        return (dbConfig.architecture, dbConfig.host, dbConfig.port, dbConfig.database, dbConfig.user, dbConfig.password,
+                dbConfig.pool_min_size, dbConfig.pool_max_size, dbConfig.pool_idle_timeout,
+                dbConfig.pool_wait_timeout, dbConfig.pool_validation_interval)
+
+    def getBackend():
+        """
+        Return Value:
+            returns the backend class (refer backends module) of the
+            architecture configured in dbconfig.xml.
+
+        Exception Raising:
+            raises DataLayerError exception.
+        """
+        dbConfig = DBUtility.getDBConfiguration()
+        if dbConfig.has_exceptions:
+            raise DataLayerError(exceptions=dbConfig.exceptions)
+        return get_backend(dbConfig.architecture)
+
+    def getStore():
+        """
+        Returns the MemoryStore which holds the tables when the Memory
+        architecture is configured. It is created on the first call, from
+        the snapshot file named by the database of dbconfig.xml if the file
+        exists, and created again if the file named changes.
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value:
+            returns the MemoryStore, None for the other architectures.
+        """
+        dbConfig = DBUtility.getDBConfiguration()
+        if dbConfig.has_exceptions:
+            raise DataLayerError(exceptions=dbConfig.exceptions)
+        if get_backend(dbConfig.architecture) is not MemoryBackend:
+            return None
+        store = DBConnection._store
+        if store is not None and store[0] == dbConfig.database:
+            return store[1]
+        replaced = False
+        with DBConnection._pool_lock:
+            if DBConnection._store is None or DBConnection._store[0] != dbConfig.database:
+                memoryStore = MemoryStore()
+                if dbConfig.database != None and os.path.isfile(dbConfig.database):
+                    try:
+                        memoryStore.load(dbConfig.database)
+                    except (OSError, ValueError) as error:
+                        raise DataLayerError(message=str(error))
+                replaced = DBConnection._store is not None
+                DBConnection._store = (dbConfig.database, memoryStore)
+            memoryStore = DBConnection._store[1]
+        if replaced:
+            # the registries hold what the previous store had.
+            DesignationRegistry.invalidate()
+            EmployeeNameIndex.invalidate()
+            EntityCounts.invalidate()
+        return memoryStore
+
+    def closeConnections():
+        """
+        Closes the pool of the primary database and those of the read
+        replicas, the next getConnection opens new ones. A process about
+        to fork calls it so that the children do not share the sockets
+        (or files) of the connections of the parent.
+        """
+        with DBConnection._pool_lock:
+            pool, DBConnection._pool, DBConnection._pool_config = DBConnection._pool, None, None
+            replicas, DBConnection._replicas = DBConnection._replicas, None
+        if pool is not None:
+            pool.close()
+        if replicas is not None:
+            replicas[1].close()
+
+    def _connect(dbConfig):
+        try:
+            return get_backend(dbConfig.architecture).connect(dbConfig)
+        except Error as error:
+            raise DataLayerError(message=error.msg)
+
+
+class Transaction:
+    """
+    A context manager which makes the HRDLHandler methods called within it,
+    by the same thread, work on one connection and in one database
+    transaction. The transaction is committed when the block ends, or
+    rolled back if an exception leaves the block, so that the operations
+    within it take effect together or not at all.
+
+        with Transaction():
+            for employee in employees:
+                employee.designation_code = new_code
+                HRDLHandler.update_employee(employee)
+            HRDLHandler.delete_designation(old_code)
+
+    The caches and registries of the process are updated only after the
+    commit, hence within the block the lookups bypass the caches and an
+    Employee is validated against the committed designations only.
+    Transactions do not nest.
+    An error of the database within the block makes the transaction roll
+    back when it ends, even if the error was caught, as the database may
+    have undone the transaction already (a deadlock does on MySQL) and
+    what is left of it must not be committed as if whole.
+    With the Memory architecture the transaction locks the MemoryStore
+    instead, the other threads wait for it to end.
+
+    Attributes:
+        connection: the connection of the transaction.
+            default is None(NoneType), until the block is entered, and for
+            the Memory architecture.
+        committed(bool): whether the transaction has committed, it stays
+        False if the block ended with rollback_only, an error of the
+        database or a failure.
+            default is False
+
+    Methods:
+        current: returns the Transaction of the calling thread, if any.
+        rollback_only: makes the transaction roll back when it ends.
+    """
+    _local = threading.local()
+
+    def __init__(self):
+        self.connection = None
+        self.committed = False
+        self._store = None
+        self._actions = list()
+        self._undo = list()
+        self._failed = False
+
+    def current():
+        """
+        Return Value:
+            returns the Transaction in progress in the calling thread, None
+            if there is none.
+        """
+        return getattr(Transaction._local, "transaction", None)
+
+    def rollback_only(self):
+        """
+        Makes the transaction roll back, instead of committing, when the
+        block ends without an exception.
+        """
+        self._failed = True
+
+    def _rolled_back(self):
+        for function, arguments in reversed(self._undo):
+            function(*arguments)
+
+    def _errored(connection):
+        # an error of the database on the connection of the transaction of
+        # the thread, if any, dooms the transaction.
+        transaction = Transaction.current()
+        if transaction is not None and transaction.connection is connection:
+            transaction._failed = True
+
+    def __enter__(self):
+        if Transaction.current() is not None:
+            raise DataLayerError(
+                message="A transaction is already in progress in this thread")
+        self._store = DBConnection.getStore()
+        if self._store is not None:
+            # the MemoryStore stays locked for the thread until the end.
+            try:
+                self._store.begin()
+            except Error as error:
+                raise DataLayerError(message=error.msg)
+        else:
+            self.connection = DBConnection.getConnection()
+        Transaction._local.transaction = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        Transaction._local.transaction = None
+        connection = self.connection
+        discard = False
+        try:
+            if self._store is not None:
+                if exc_type is None and not self._failed:
+                    self._store.commit()
+                    self.committed = True
+                    for function, arguments in self._actions:
+                        function(*arguments)
+                else:
+                    self._store.rollback()
+                    self._rolled_back()
+            elif exc_type is None and not self._failed:
+                try:
+                    started = time.perf_counter()
+                    connection.commit()
+                    Metrics.record(Metrics.COMMIT,
+                                   time.perf_counter() - started)
+                except Error as error:
+                    discard = True
+                    self._rolled_back()
+                    raise DataLayerError(message=error.msg)
+                self.committed = True
+                for function, arguments in self._actions:
+                    function(*arguments)
+            else:
+                try:
+                    connection.rollback()
+                except Error:
+                    discard = True
+                self._rolled_back()
+        finally:
+            self._actions = list()
+            self._undo = list()
+            DBConnection.releaseConnection(connection, discard=discard)
+        return False
+
+
+class StatementRegistry:
+    """
+    A class that keeps the prepared statements of every pooled connection,
+    so that the database parses a statement once per connection instead
+    of on every call of HRDLHandler.
+    Every statement gets its own prepared cursor, created on the first
+    execution of the statement on a connection and reused until the pool
+    closes the connection. The SQL text itself is the key of a statement.
+    The executions of every statement are counted and timed.
+
+    Methods:
+        execute(connection, sql, params): executes the statement, for the
+        statements which return no rows.
+        fetchall(connection, sql, params): executes the statement and
+        returns all of its rows.
+        fetchone(connection, sql, params): executes the statement and
+        returns its first row.
+        forget(connection): drops the statements of a connection.
+        statistics: returns the counters and timings of every statement.
+    """
+    _statements = dict()
+    _counters = dict()
+    _lock = threading.Lock()
+
+    def execute(connection, sql, params=()):
+        """
+        Executes the statement on the connection, preparing it first if it
+        was not prepared on the connection yet.
+
+        Exception Raising:
+            raises Error (the error of the backend).
+
+        Return Value:
+            returns the prepared cursor, for its rowcount and lastrowid,
+            it must not be closed.
+        """
+        return StatementRegistry._run(connection, sql, params, None)
+
+    def fetchall(connection, sql, params=()):
+        """
+        Executes the statement on the connection like execute.
+
+        Exception Raising:
+            raises Error (the error of the backend).
+
+        Return Value:
+            returns the list of all the rows.
+        """
+        return StatementRegistry._run(connection, sql, params, lambda cursor: cursor.fetchall())
+
+    def fetchone(connection, sql, params=()):
+        """
+        Executes the statement on the connection like execute, all of its
+        rows are read so that the connection is free for the next one.
+
+        Exception Raising:
+            raises Error (the error of the backend).
+
+        Return Value:
+            returns the first row, None if there is none.
+        """
+        rows = StatementRegistry.fetchall(connection, sql, params)
+        return rows[0] if len(rows) > 0 else None
+
+    def forget(connection):
+        """
+        Drops the statements of the connection, it is called when the
+        connection is closed, which deallocates them on the server.
+        """
+        with StatementRegistry._lock:
+            StatementRegistry._statements.pop(connection, None)
+
+    def statistics():
+        """
+        Return Value:
+            returns a dictionary keyed by SQL text, with the number of
+            executions and preparations of the statement and the total,
+            average and maximum seconds taken by its executions.
+        """
+        with StatementRegistry._lock:
+            statistics = dict()
+            for sql, (executions, prepares, total_time, max_time) in StatementRegistry._counters.items():
+                statistics[sql] = {
+                    "executions": executions,
+                    "prepares": prepares,
+                    "total_time": total_time,
+                    "average_time": total_time / executions if executions > 0 else 0.0,
+                    "max_time": max_time
+                }
+            return statistics
+
+    def _run(connection, sql, params, fetch):
+        # a connection is used by one thread at a time, hence only the
+        # dictionary of all the connections needs the lock.
+        statements = StatementRegistry._statements.get(connection)
+        if statements is None:
+            with StatementRegistry._lock:
+                statements = StatementRegistry._statements.setdefault(
+                    connection, dict())
+        entry = statements.get(sql)
+        prepared = entry is None
+        if prepared:
+            # the cursor prepares again unless given the very same string.
+            entry = (sql, connection.cursor(prepared=True))
+            statements[sql] = entry
+        started = time.perf_counter()
+        try:
+            entry[1].execute(entry[0], params)
+            executed = time.perf_counter()
+            result = entry[1] if fetch is None else fetch(entry[1])
+        except Error:
+            Transaction._errored(connection)
+            statements.pop(sql, None)
+            try:
+                entry[1].close()
+            except Exception:
+                pass
+            raise
+        elapsed = time.perf_counter() - started
+        Metrics.record(Metrics.EXECUTE, executed - started, sql, params)
+        if fetch is not None:
+            Metrics.record(Metrics.FETCH, started + elapsed - executed)
+        with StatementRegistry._lock:
+            counters = StatementRegistry._counters.get(sql)
+            if counters is None:
+                counters = StatementRegistry._counters[sql] = [0, 0, 0.0, 0.0]
+            counters[0] += 1
+            counters[1] += 1 if prepared else 0
+            counters[2] += elapsed
+            counters[3] = max(counters[3], elapsed)
+        return result
+
+
+class BulkResult:
+    """
+    A class that holds the outcome of a bulk insert method of HRDLHandler,
+    the objects which failed are reported here instead of aborting the
+    rest of the batch.
+
+    Attributes:
+        ids(list): the generated code/emp_id of every object, in the order
+        of the objects given, None for the objects which were not inserted.
+        errors(dict): the DataLayerError of every object which was not
+        inserted, keyed by its position in the objects given.
+            default is empty dictionary({})
+        has_errors(bool): The boolean used to determine the presence
+        of errors.
+            default is False
+    """
+
+    def __init__(self, count):
+        self.ids = [None] * count
+        self.errors = dict()
+        self.has_errors = False
+
+    def _add_error(self, index, error):
+        self.errors[index] = error
+        self.has_errors = True
+
+
+class Page:
     """
-    A class that sets the connection between the database whose details
-    are provided by the user and this module.
+    A class that holds one page of a keyset paginated listing of
+    HRDLHandler, along with the cursors of the pages around it.
+    The cursors are opaque strings which remember the key (code/emp_id)
+    the neighbouring page starts after or ends before, so that fetching
+    any page costs one indexed range scan no matter how deep it is.
+
+    Attributes:
+        items(list): the Designation/Employee objects of the page.
+        next_cursor(str): the cursor of the following page.
+            default is None(NoneType), when there is no following page
+        previous_cursor(str): the cursor of the preceding page.
+            default is None(NoneType), when there is no preceding page
 
     Methods:
-        getConnection:
-            this method utilizes the data returned by DBUtility class'
-            getDBConfiguration method and sets the connection between
-            the database and the module.
+        encode_cursor(direction, key): creates a cursor.
+        decode_cursor(cursor): returns the direction and the key of a cursor.
     """
-    def getConnection():
+    default_page_size = 20
+    max_page_size = 500
+
+    def __init__(self, items, next_cursor=None, previous_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def encode_cursor(direction, key):
         """
-        It utilizes the data returned by DBUtility class'
-        getDBConfiguration method and sets the connection between
-        the database and the module.
+        Creates a cursor for the page after (direction 'after') or
+        before (direction 'before') the given key.
+
+        Return Value: returns a str.
+        """
+        return base64.urlsafe_b64encode(json.dumps({direction: key}).encode("utf-8")).decode("ascii")
+
+    def decode_cursor(cursor):
+        """
+        Returns the direction and the key of the cursor, a None cursor
+        stands for the first page.
 
         Exception Raising:
             raises DataLayerError exception.
+
+        Return Value: returns a tuple of direction(str) and key(int).
         """
-        dbConfig = DBUtility.getDBConfiguration()
-        if dbConfig.has_exceptions:
-            raise DataLayerError(exceptions=dbConfig.exceptions)
+        if cursor == None:
+            return ("after", 0)
         try:
-            connection = connect(host=dbConfig.host, port=dbConfig.port,
-                                 database=dbConfig.database, user=dbConfig.user, password=dbConfig.password)
-        except Error as error:
-            raise DataLayerError(message=error.msg)
-        return connection
+            position = json.loads(base64.urlsafe_b64decode(
+                cursor.encode("ascii")).decode("utf-8"))
+            ((direction, key),) = position.items()
+        except Exception:
+            raise DataLayerError(message=f"Invalid page cursor : {cursor}")
+        if direction not in ("after", "before") or not isinstance(key, int) or key < 0:
+            raise DataLayerError(message=f"Invalid page cursor : {cursor}")
+        return (direction, key)
 
 
 class HRDLHandler:
@@ -432,12 +2587,18 @@ class HRDLHandler:
     A class which consist of all the methods that perform
     CRUD operation on the database, specifically to the
     Designation and the Employee tables.
+    Every method commits its own work, unless it is called within a
+    Transaction, which commits the work of all of them at once.
 
     Methods:
         add_designation: adding a new designation entry to
         the Designation Table.
         add_employee: adding a new employee entry to
         the Employee Table.
+        add_designations: adding many new designation entries to the
+        Designation Table in batches.
+        add_employees: adding many new employee entries to the Employee
+        Table in batches.
         update_designation: updates a designation entry to
         the Designation Table.
         update_employee: updates an employee entry to
@@ -449,6 +2610,12 @@ class HRDLHandler:
         get_designations: retrieves all the entries from the Designation
         Table.
         get_employees: retrieves all the entries from the Employee Table.
+        iter_employees: retrieves all the entries from the Employee Table
+        one batch at a time, as a generator.
+        get_designations_page: retrieves one page of the entries from the
+        Designation Table.
+        get_employees_page: retrieves one page of the entries from the
+        Employee Table.
         get_designation_by_code: retrieves a entry from the Designation
         Table that has the specific designation code given by the user.
         get_employee_by_id: retrieves an entry from the Employee Table
@@ -457,12 +2624,26 @@ class HRDLHandler:
         Table that has the specific designation title given by the user.
         get_employee_by_name: retrieves all the entries from the Employee Table
         that has the specific employee's name given by the user.
+        search_employees: retrieves the entries from the Employee Table whose
+        name is equal to, starts with or is similar to the name given by
+        the user.
         get_designation_count: retrieves the number, the total of entries
         present in the Designation Table.
         get_employee_count: retrieves the number, the total of entries
         present in the Employee Table.
+        get_statistics: retrieves the number of entries of both the tables
+        and the number of employees of every designation.
+        save_snapshot: saves the entries of both the tables to a snapshot
+        file, for the Memory architecture.
+        load_snapshot: replaces the entries of the Memory architecture with
+        those of a snapshot file.
+    With the Memory architecture the methods work upon the MemoryStore of
+    DBConnection.getStore in place of a database.
+    The calls of the methods and their phases are timed by Metrics, refer
+    metrics module.
     """
 
+    @Metrics.instrument
     def add_designation(designation):
         """
         Adds a new entry to the Designation Table
@@ -480,30 +2661,37 @@ class HRDLHandler:
         if designation.code != 0:
             raise DataLayerError(
                 "Designation Code must be assigned zero, as it is auto generated.")
+        store = DBConnection.getStore()
+        if store is not None:
+            designation.code = HRDLHandler._in_store(
+                store.insert_designation, designation.title)
+            DBConnection.onRollback(setattr, designation, "code", 0)
+            DBConnection.onCommit(DesignationRegistry.put, designation)
+            DBConnection.onCommit(EntityCounts.add_designation)
+            return
+        connection = None
         try:
             connection = DBConnection.getConnection()
-            cursor = connection.cursor()
-            cursor.execute(
-                "select code from designation where title=%s", (designation.title,))
-            rows = cursor.fetchall()
+            rows = StatementRegistry.fetchall(
+                connection, "select code from designation where title=%s", (designation.title,))
             if len(rows) > 0:
                 raise DataLayerError(
                     message=f"{designation.title} already exists")
-            cursor.execute(
-                "insert into designation (title) values (%s)", (designation.title,))
-            designation.code = cursor.lastrowid
-            connection.commit()
+            result = StatementRegistry.execute(
+                connection, "insert into designation (title) values (%s)", (designation.title,))
+            designation.code = result.lastrowid
+            DBConnection.onRollback(setattr, designation, "code", 0)
+            DBConnection.commit(connection)
+            DBConnection.onCommit(DesignationRegistry.put, designation)
+            DBConnection.onCommit(EntityCounts.add_designation)
+            DBConnection.onCommit(
+                DBConnection.markWrite, DBConnection.getClient())
         except Error as err:
             raise DataLayerError(message=err.msg)
         finally:
-            try:
-                if cursor.is_open():
-                    cursor.close()
-                if connection.is_connected():
-                    connection.close()
-            except:
-                pass
+            DBConnection.releaseConnection(connection)
 
+    @Metrics.instrument
     def add_employee(employee):
         """
         Adds a new entry to the Employee Table
@@ -521,30 +2709,353 @@ class HRDLHandler:
         if employee.emp_id != 0:
             raise DataLayerError(
                 "Employee ID must be assigned zero, as it is auto generated.")
+        store = DBConnection.getStore()
+        if store is not None:
+            rows = store.employees_by_name(employee.name)
+            employee.emp_id = HRDLHandler._in_store(
+                store.insert_employee, HRDLHandler._employee_values(employee))
+            DBConnection.onRollback(setattr, employee, "emp_id", 0)
+            if len(rows) > 0:
+                print(
+                    f"There are {len(rows) + 1} employees with same name now!")
+            DBConnection.onCommit(EmployeeNameIndex.put,
+                                  employee.emp_id, employee.name)
+            DBConnection.onCommit(EntityCounts.add_employee,
+                                  employee.designation_code)
+            return
+        connection = None
         try:
             connection = DBConnection.getConnection()
-            cursor = connection.cursor()
-            cursor.execute(
-                "select emp_id from employee where name=%s", (employee.name,))
-            rows = cursor.fetchall()
-            cursor.execute("insert into employee (name,designation_code,DOB,salary,gender,is_indian,pan_no,aadhar_no) values (%s,%s,%s,%s,%s,%s,%s,%s)", (
+            rows = StatementRegistry.fetchall(
+                connection, "select emp_id from employee where name=%s", (employee.name,))
+            result = StatementRegistry.execute(connection, "insert into employee (name,designation_code,DOB,salary,gender,is_indian,pan_no,aadhar_no) values (%s,%s,%s,%s,%s,%s,%s,%s)", (
                 employee.name, employee.designation_code, employee.dob, employee.salary, employee.gender.capitalize(), employee.indian, employee.pan_no, employee.aadhar))
             if len(rows) > 0:
                 print(
                     f"There are {len(rows) + 1} employees with same name now!")
-            employee.emp_id = cursor.lastrowid
-            connection.commit()
+            employee.emp_id = result.lastrowid
+            DBConnection.onRollback(setattr, employee, "emp_id", 0)
+            DBConnection.commit(connection)
+            DBConnection.onCommit(EmployeeNameIndex.put,
+                                  employee.emp_id, employee.name)
+            DBConnection.onCommit(EntityCounts.add_employee,
+                                  employee.designation_code)
+            DBConnection.onCommit(
+                DBConnection.markWrite, DBConnection.getClient())
         except Error as err:
             raise DataLayerError(message=err.msg)
         finally:
+            DBConnection.releaseConnection(connection)
+
+    @Metrics.instrument
+    def add_designations(designations, chunk_size=None):
+        """
+        Adds many new entries to the Designation Table, the designations
+        are validated as in add_designation and inserted chunk_size at a
+        time with a single multi-row insert and commit per chunk.
+        The generated codes are assigned to the Designation objects.
+
+        Attributes:
+            designations(iterable): the Designation objects to be added.
+            chunk_size(int): the number of designations per insert.
+                default is the batch_size of dbconfig.xml
+
+        Exception Raising:
+            raises DataLayerError exception, only if the batch cannot be
+            processed at all. The errors of the individual designations
+            are reported in the returned object.
+
+        Return Value: returns a BulkResult object.
+        """
+        designations = list(designations)
+        result = BulkResult(len(designations))
+        titles = set()
+        valid = list()
+        for index, designation in enumerate(designations):
+            if designation == None:
+                result._add_error(index, DataLayerError(
+                    message="Designation Required"))
+            elif not isinstance(designation, Designation):
+                result._add_error(index, DataLayerError(
+                    f"Found type {type(designation)}, required type <class 'Designation'>"))
+            elif designation.has_exceptions:
+                result._add_error(index, DataLayerError(
+                    exceptions=designation.exceptions))
+            elif designation.code != 0:
+                result._add_error(index, DataLayerError(
+                    "Designation Code must be assigned zero, as it is auto generated."))
+            elif designation.title in titles:
+                result._add_error(index, DataLayerError(
+                    message=f"{designation.title} already exists"))
+            else:
+                titles.add(designation.title)
+                valid.append(index)
+        store = DBConnection.getStore()
+        if store is not None:
+            HRDLHandler._insert_into_store(store.insert_designation, [
+                                           designations[index].title for index in valid], valid, result)
+            valid = list()
+        for chunk in HRDLHandler._chunks(valid, chunk_size):
+            connection = cursor = None
             try:
-                if cursor.is_open():
-                    cursor.close()
-                if connection.is_connected():
-                    connection.close()
-            except:
-                pass
+                connection = DBConnection.getConnection()
+                cursor = connection.cursor()
+                sql = "select title from designation where title in (" + \
+                    ",".join(["%s"] * len(chunk)) + ")"
+                params = tuple(designations[index].title for index in chunk)
+                started = time.perf_counter()
+                cursor.execute(sql, params)
+                existing = set(row[0] for row in cursor.fetchall())
+                Metrics.record(Metrics.EXECUTE, time.perf_counter() -
+                               started, sql, params)
+                new_chunk = list()
+                for index in chunk:
+                    if designations[index].title in existing:
+                        result._add_error(index, DataLayerError(
+                            message=f"{designations[index].title} already exists"))
+                    else:
+                        new_chunk.append(index)
+                HRDLHandler._insert_chunk(connection, cursor, "insert into designation (title) values (%s)",
+                                          [(designations[index].title,) for index in new_chunk], new_chunk, result)
+            except Error as err:
+                Transaction._errored(connection)
+                for index in chunk:
+                    if index not in result.errors and result.ids[index] is None:
+                        result._add_error(
+                            index, DataLayerError(message=err.msg))
+            finally:
+                DBConnection.releaseConnection(connection, cursor)
+        for index, code in enumerate(result.ids):
+            if code is not None:
+                designations[index].code = code
+                DBConnection.onRollback(
+                    setattr, designations[index], "code", 0)
+                DBConnection.onCommit(
+                    DesignationRegistry.put, designations[index])
+                DBConnection.onCommit(EntityCounts.add_designation)
+        if len(result.errors) < len(result.ids):
+            DBConnection.onCommit(
+                DBConnection.markWrite, DBConnection.getClient())
+        return result
+
+    @Metrics.instrument
+    def add_employees(employees, chunk_size=None):
+        """
+        Adds many new entries to the Employee Table, the employees are
+        validated as in add_employee and inserted chunk_size at a time
+        with a single multi-row insert and commit per chunk.
+        The generated employee IDs are assigned to the Employee objects.
+        Unlike add_employee, it does not look for the employees having
+        the same name.
+
+        Attributes:
+            employees(iterable): the Employee objects to be added.
+            chunk_size(int): the number of employees per insert.
+                default is the batch_size of dbconfig.xml
+
+        Exception Raising:
+            raises DataLayerError exception, only if the batch cannot be
+            processed at all. The errors of the individual employees
+            are reported in the returned object.
+
+        Return Value: returns a BulkResult object.
+        """
+        employees = list(employees)
+        result = BulkResult(len(employees))
+        valid = list()
+        for index, employee in enumerate(employees):
+            if employee == None:
+                result._add_error(index, DataLayerError(
+                    message="Employee Required"))
+            elif not isinstance(employee, Employee):
+                result._add_error(index, DataLayerError(
+                    f"Found type {type(employee)}, required type <class 'Employee'>"))
+            elif employee.has_exceptions:
+                result._add_error(index, DataLayerError(
+                    exceptions=employee.exceptions))
+            elif employee.emp_id != 0:
+                result._add_error(index, DataLayerError(
+                    "Employee ID must be assigned zero, as it is auto generated."))
+            else:
+                valid.append(index)
+        store = DBConnection.getStore()
+        if store is not None:
+            HRDLHandler._insert_into_store(store.insert_employee, [HRDLHandler._employee_values(
+                employees[index]) for index in valid], valid, result)
+            valid = list()
+        for chunk in HRDLHandler._chunks(valid, chunk_size):
+            connection = cursor = None
+            try:
+                connection = DBConnection.getConnection()
+                cursor = connection.cursor()
+                rows = list()
+                for index in chunk:
+                    employee = employees[index]
+                    rows.append((employee.name, employee.designation_code, employee.dob, employee.salary,
+                                 employee.gender.capitalize(), employee.indian, employee.pan_no, employee.aadhar))
+                HRDLHandler._insert_chunk(connection, cursor, "insert into employee (name,designation_code,DOB,salary,gender,is_indian,pan_no,aadhar_no) values (%s,%s,%s,%s,%s,%s,%s,%s)",
+                                          rows, chunk, result)
+            except Error as err:
+                Transaction._errored(connection)
+                for index in chunk:
+                    if index not in result.errors and result.ids[index] is None:
+                        result._add_error(
+                            index, DataLayerError(message=err.msg))
+            finally:
+                DBConnection.releaseConnection(connection, cursor)
+        for index, emp_id in enumerate(result.ids):
+            if emp_id is not None:
+                employees[index].emp_id = emp_id
+                DBConnection.onRollback(
+                    setattr, employees[index], "emp_id", 0)
+                DBConnection.onCommit(
+                    EmployeeNameIndex.put, emp_id, employees[index].name)
+                DBConnection.onCommit(
+                    EntityCounts.add_employee, employees[index].designation_code)
+        if len(result.errors) < len(result.ids):
+            DBConnection.onCommit(
+                DBConnection.markWrite, DBConnection.getClient())
+        return result
+
+    def _chunks(indexes, chunk_size):
+        """
+        Splits the list of indexes into lists of chunk_size indexes,
+        chunk_size defaults to the batch_size of dbconfig.xml.
+
+        Exception Raising:
+            raises DataLayerError exception.
+        """
+        if chunk_size is None:
+            chunk_size = DBUtility.getDBConfiguration().batch_size
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise DataLayerError(
+                f"Invalid chunk size : {chunk_size}, it should be an int greater than zero")
+        return [indexes[start:start + chunk_size] for start in range(0, len(indexes), chunk_size)]
+
+    def _insert_chunk(connection, cursor, sql, rows, indexes, result):
+        """
+        Inserts the rows with one multi-row insert and commits it, storing
+        the generated ids against the indexes in the result. If the backend
+        cannot tell the ids of a multi-row insert (refer id_increment of
+        the backends module), the rows are inserted one at a time, for the
+        id of each, and committed together.
+        If the insert fails, the rows are inserted one at a time so that
+        only the failing rows get reported in the result, except within a
+        Transaction, which a rollback would undo as a whole, there the
+        failure is raised for the whole chunk.
+        """
+        if len(rows) == 0:
+            return
+        try:
+            increment = DBConnection.getBackend().id_increment(cursor)
+            started = time.perf_counter()
+            if increment is None:
+                ids = list()
+                for row in rows:
+                    cursor.execute(sql, row)
+                    ids.append(cursor.lastrowid)
+            else:
+                cursor.executemany(sql, rows)
+                # a multi-row insert reports the first id generated, the
+                # following ones are consecutive for a single statement.
+                ids = [cursor.lastrowid + position *
+                       increment for position in range(len(rows))]
+            Metrics.record(Metrics.EXECUTE, time.perf_counter() - started,
+                           sql, f"{len(rows)} rows, the first {rows[0]!r}")
+            DBConnection.commit(connection)
+        except Error:
+            if Transaction.current() is not None:
+                raise
+            connection.rollback()
+            for index, row in zip(indexes, rows):
+                try:
+                    cursor.execute(sql, row)
+                    result.ids[index] = cursor.lastrowid
+                    DBConnection.commit(connection)
+                except Error as err:
+                    connection.rollback()
+                    result.ids[index] = None
+                    result._add_error(index, DataLayerError(message=err.msg))
+            return
+        for index, generated in zip(indexes, ids):
+            result.ids[index] = generated
+
+    def _insert_into_store(insert, rows, indexes, result):
+        """
+        Inserts the rows into the MemoryStore one at a time, storing the
+        generated ids against the indexes in the result. Within a
+        Transaction the first failure is raised, like _insert_chunk.
+        """
+        for index, row in zip(indexes, rows):
+            try:
+                result.ids[index] = insert(row)
+            except Error as err:
+                if Transaction.current() is not None:
+                    raise DataLayerError(message=err.msg)
+                result._add_error(index, DataLayerError(message=err.msg))
+
+    def _change_employee(connection, sql, params, emp_id):
+        """
+        Reads the designation code of the employee and runs the update or
+        delete statement, whose last parameters are the employee ID and
+        that designation code (after params), so that EntityCounts learns
+        which designation the employee had. The row is locked by the read
+        where the backend can (refer row_lock of the backends module),
+        elsewhere a write of another connection in between makes the
+        statement match no row and the code is read again.
+
+        Exception Raising:
+            raises Error (the error of the backend), or DataLayerError if
+            the employee keeps being changed by others.
+
+        Return Value:
+            returns the designation code the employee had, None if there
+            is no such employee.
+        """
+        select = "select designation_code from employee where emp_id=%s" + \
+            DBConnection.getBackend().row_lock
+        for attempt in range(3):
+            row = StatementRegistry.fetchone(connection, select, (emp_id,))
+            if row is None:
+                return None
+            result = StatementRegistry.execute(
+                connection, sql, params + (emp_id, row[0]))
+            if result.rowcount == 1:
+                return row[0]
+        raise DataLayerError(
+            message=f"{emp_id} is being changed by someone else, please try again")
+
+    def _in_store(function, *arguments):
+        """
+        Calls the function of the MemoryStore with the arguments, the
+        DatabaseError it raises is raised as DataLayerError.
+        """
+        try:
+            return function(*arguments)
+        except Error as err:
+            raise DataLayerError(message=err.msg)
+
+    def _employee_values(employee):
+        """
+        Return Value: returns the tuple of the columns of the Employee Table
+        after emp_id, as kept by the MemoryStore.
+        """
+        dob = date.fromisoformat(employee.dob) if isinstance(
+            employee.dob, str) else employee.dob
+        return (employee.name, employee.designation_code, dob, employee.salary, employee.gender.capitalize(),
+                employee.indian, employee.pan_no, employee.aadhar)
+
+    def _hydrate(from_row, rows):
+        """
+        Return Value: returns the list of the objects made out of the rows
+        by from_row, the time taken is recorded as the hydrate phase.
+        """
+        started = time.perf_counter()
+        objects = [from_row(row) for row in rows]
+        Metrics.record(Metrics.HYDRATE, time.perf_counter() - started)
+        return objects
 
+    @Metrics.instrument
     def update_designation(designation):
         """
         Updates an existing entry in the Designation Table
@@ -562,35 +3073,32 @@ class HRDLHandler:
         if designation.code <= 0:
             raise DataLayerError(
                 "Designation Code must not be zero, as it is the primary key.")
+        store = DBConnection.getStore()
+        if store is not None:
+            HRDLHandler._in_store(store.update_designation,
+                                  designation.code, designation.title)
+            DBConnection.onCommit(DesignationRegistry.put, designation)
+            return
+        connection = None
         try:
             connection = DBConnection.getConnection()
-            cursor = connection.cursor()
-            cursor.execute(
-                "select code from designation where code=%s", (designation.code,))
-            rows = cursor.fetchall()
-            if len(rows) != 1:
+            result = StatementRegistry.execute(connection, "update designation set title=%s where code=%s",
+                                               (designation.title, designation.code))
+            if result.rowcount != 1:
                 raise DataLayerError(
                     message=f"Code : {designation.code} does not exists")
-            cursor.execute("update designation set title=%s where code=%s",
-                           (designation.title, designation.code))
-            cursor.execute(
-                "select title from designation where code=%s", (designation.code,))
-            updated_data = cursor.fetchall()
-            connection.commit()
-            if len(updated_data) != 1 or (updated_data[0][0] != designation.title):
-                raise Error(
-                    "Updation failed due to unknown interrupt, please try again")
+            DBConnection.commit(connection)
+            DBConnection.onCommit(
+                EntityCache.invalidate_designation, designation.code)
+            DBConnection.onCommit(DesignationRegistry.put, designation)
+            DBConnection.onCommit(
+                DBConnection.markWrite, DBConnection.getClient())
         except Error as err:
             raise DataLayerError(message=err.msg)
         finally:
-            try:
-                if cursor.is_open():
-                    cursor.close()
-                if connection.is_connected():
-                    connection.close()
-            except:
-                pass
+            DBConnection.releaseConnection(connection)
 
+    @Metrics.instrument
     def update_employee(employee):
         """
         Updates an existing entry in the Employee Table
@@ -608,35 +3116,38 @@ class HRDLHandler:
         if employee.emp_id == 0:
             raise DataLayerError(
                 "Employee ID must not be assigned zero, it must already exist.")
+        store = DBConnection.getStore()
+        if store is not None:
+            row = HRDLHandler._in_store(store.update_employee, employee.emp_id,
+                                        HRDLHandler._employee_values(employee))
+            DBConnection.onCommit(EmployeeNameIndex.put,
+                                  employee.emp_id, employee.name)
+            DBConnection.onCommit(EntityCounts.move_employee,
+                                  row[2], employee.designation_code)
+            return
+        connection = None
         try:
             connection = DBConnection.getConnection()
-            cursor = connection.cursor()
-            cursor.execute(
-                "select emp_id from employee where emp_id=%s", (employee.emp_id,))
-            rows = cursor.fetchall()
-            if len(rows) != 1:
+            old_code = HRDLHandler._change_employee(connection, "update employee set name=%s, designation_code=%s, DOB=%s, salary=%s, gender=%s, is_indian=%s, pan_no=%s, aadhar_no=%s where emp_id=%s and designation_code=%s", (employee.name,
+                                                    employee.designation_code, employee.dob, employee.salary, employee.gender.capitalize(), employee.indian, employee.pan_no, employee.aadhar), employee.emp_id)
+            if old_code is None:
                 raise DataLayerError(
                     message=f"{employee.emp_id} does not exists")
-            cursor.execute("update employee set name=%s, designation_code=%s, DOB=%s, salary=%s, gender=%s, is_indian=%s, pan_no=%s, aadhar_no=%s where emp_id=%s", (employee.name,
-                                                                                                                                                                     employee.designation_code, employee.dob, employee.salary, employee.gender.capitalize(), employee.indian, employee.pan_no, employee.aadhar, employee.emp_id))
-            cursor.execute(
-                "select name from employee where emp_id=%s", (employee.emp_id,))
-            updated_data = cursor.fetchall()
-            connection.commit()
-            if len(updated_data) != 1 or (updated_data[0][0] != employee.name):
-                raise Error(
-                    "Updation failed due to unknown interrupt, please try again")
+            DBConnection.commit(connection)
+            DBConnection.onCommit(
+                EntityCache.invalidate_employee, employee.emp_id)
+            DBConnection.onCommit(EmployeeNameIndex.put,
+                                  employee.emp_id, employee.name)
+            DBConnection.onCommit(EntityCounts.move_employee,
+                                  old_code, employee.designation_code)
+            DBConnection.onCommit(
+                DBConnection.markWrite, DBConnection.getClient())
         except Error as err:
             raise DataLayerError(message=err.msg)
         finally:
-            try:
-                if cursor.is_open():
-                    cursor.close()
-                if connection.is_connected():
-                    connection.close()
-            except:
-                pass
+            DBConnection.releaseConnection(connection)
 
+    @Metrics.instrument
     def delete_designation(code):
         """
         Removes an existing entry from the Designation Table
@@ -651,38 +3162,38 @@ class HRDLHandler:
                 f"Found type {type(code)}, required type {type(0)}")
         if code <= 0:
             raise DataLayerError(f"Invalid entry for code : {code}")
+        store = DBConnection.getStore()
+        if store is not None:
+            HRDLHandler._in_store(store.delete_designation, code)
+            DBConnection.onCommit(DesignationRegistry.remove, code)
+            DBConnection.onCommit(EntityCounts.remove_designation)
+            return
+        connection = None
         try:
             connection = DBConnection.getConnection()
-            cursor = connection.cursor()
-            cursor.execute(
-                "select emp_id from employee where designation_code=%s", (code,))
-            rows = cursor.fetchall()
-            if len(rows) != 0:
-                raise DataLayerError(
-                    message=f"The designation code : {code}, cannot be deleted as employees exist against it")
-            cursor.execute(
-                "select code from designation where code=%s", (code,))
-            rows = cursor.fetchall()
-            if len(rows) != 1:
+            result = StatementRegistry.execute(
+                connection, "delete from designation where code=%s and not exists (select 1 from employee where designation_code=%s)", (code, code))
+            if result.rowcount != 1:
+                # only a failed delete needs to find out why it failed.
+                row = StatementRegistry.fetchone(
+                    connection, "select exists (select 1 from employee where designation_code=%s)", (code,))
+                if row[0]:
+                    raise DataLayerError(
+                        message=f"The designation code : {code}, cannot be deleted as employees exist against it")
                 raise DataLayerError(message=f"Code : {code} does not exists")
-            cursor.execute("delete from designation where code=%s", (code,))
-            cursor.execute("select * from designation where code=%s", (code,))
-            updated_data = cursor.fetchall()
-            connection.commit()
-            if len(updated_data) != 0:
-                raise Error()
+            DBConnection.commit(connection)
+            DBConnection.onCommit(EntityCache.invalidate_designation, code)
+            DBConnection.onCommit(DesignationRegistry.remove, code)
+            DBConnection.onCommit(EntityCounts.remove_designation)
+            DBConnection.onCommit(
+                DBConnection.markWrite, DBConnection.getClient())
         except Error:
             raise DataLayerError(
                 message="Deletion failed due to unknown interrupt, please try again")
         finally:
-            try:
-                if cursor.is_open():
-                    cursor.close()
-                if connection.is_connected():
-                    connection.close()
-            except:
-                pass
+            DBConnection.releaseConnection(connection)
 
+    @Metrics.instrument
     def delete_employee(emp_id):
         """
         Removes an existing entry from the Employee Table
@@ -697,66 +3208,69 @@ class HRDLHandler:
                 f"Found type {type(emp_id)}, required type {type(0)}")
         if emp_id <= 0:
             raise DataLayerError(f"Invalid entry for employee ID : {emp_id}")
+        store = DBConnection.getStore()
+        if store is not None:
+            row = HRDLHandler._in_store(store.delete_employee, emp_id)
+            DBConnection.onCommit(EmployeeNameIndex.remove, emp_id)
+            DBConnection.onCommit(EntityCounts.remove_employee, row[2])
+            return
+        connection = None
         try:
             connection = DBConnection.getConnection()
-            cursor = connection.cursor()
-            cursor.execute(
-                "select emp_id from employee where emp_id=%s", (emp_id,))
-            rows = cursor.fetchall()
-            if len(rows) != 1:
+            old_code = HRDLHandler._change_employee(
+                connection, "delete from employee where emp_id=%s and designation_code=%s", (), emp_id)
+            if old_code is None:
                 raise DataLayerError(message=f"{emp_id} does not exists")
-            cursor.execute("delete from employee where emp_id=%s", (emp_id,))
-            cursor.execute(
-                "select emp_id from employee where emp_id=%s", (emp_id,))
-            updated_data = cursor.fetchall()
-            connection.commit()
-            if len(updated_data) != 0:
-                raise Error()
+            DBConnection.commit(connection)
+            DBConnection.onCommit(EntityCache.invalidate_employee, emp_id)
+            DBConnection.onCommit(EmployeeNameIndex.remove, emp_id)
+            DBConnection.onCommit(EntityCounts.remove_employee, old_code)
+            DBConnection.onCommit(
+                DBConnection.markWrite, DBConnection.getClient())
         except Error as err:
             raise DataLayerError(
                 message="Deletion failed due to unknown interrupt, please try again")
         finally:
-            try:
-                if cursor.is_open():
-                    cursor.close()
-                if connection.is_connected():
-                    connection.close()
-            except:
-                pass
+            DBConnection.releaseConnection(connection)
 
-    def get_designations():
+    @Metrics.instrument
+    def get_designations(joinTransaction=True, useReplica=True):
         """
         Retrieves all the existing Designation entries from the
         Designation Table.
 
+        Attributes:
+            joinTransaction(bool): whether to read within the Transaction
+            of the thread, if any, or only the committed entries.
+                default is True
+            useReplica(bool): whether the entries may be read from a read
+            replica, if any is configured.
+                default is True
+
         Exception Raising:
             raises DataLayerError exception.
 
         Return Value: returns a list of Designation objects.
         """
+        store = DBConnection.getStore()
+        if store is not None:
+            return HRDLHandler._hydrate(Designation._from_row, store.designations())
         designations = list()
+        connection = None
         try:
-            connection = DBConnection.getConnection()
-            cursor = connection.cursor()
-            cursor.execute("select * from designation order by code;")
-            rows = cursor.fetchall()
-            connection.commit()
-            for data in rows:
-                code, title = data
-                designation = Designation(code, title)
-                designations.append(designation)
+            connection = DBConnection.getConnection(
+                joinTransaction, replica=useReplica)
+            rows = StatementRegistry.fetchall(
+                connection, "select * from designation order by code")
+            DBConnection.commit(connection)
+            designations = HRDLHandler._hydrate(Designation._from_row, rows)
         except Error as error:
             raise DataLayerError(message=error.msg)
         finally:
-            try:
-                if cursor.is_open():
-                    cursor.close()
-                if connection.is_connected():
-                    connection.close()
-            except:
-                pass
+            DBConnection.releaseConnection(connection)
         return designations
 
+    @Metrics.instrument
     def get_employees():
         """
         Retrieves all the existing Employee entries from the
@@ -767,41 +3281,183 @@ class HRDLHandler:
 
         Return Value: returns a list of Employee objects.
         """
+        store = DBConnection.getStore()
+        if store is not None:
+            return HRDLHandler._hydrate(Employee._from_row, store.employees())
         employees = list()
+        connection = None
         try:
-            connection = DBConnection.getConnection()
-            cursor = connection.cursor()
-            cursor.execute("select * from employee;")
-            rows = cursor.fetchall()
-            connection.commit()
-            for data in rows:
-                emp_id = data[0]
-                name = data[1]
-                designation_code = data[2]
-                dob = data[3]
-                day = dob.strftime("%d")
-                month = dob.strftime("%m")
-                year = dob.strftime("%Y")
-                salary = data[4]
-                gender = data[5]
-                indian = data[6]
-                pan_no = data[7]
-                aadhar = data[8]
-                employee = Employee(emp_id, name, designation_code, day,
-                                    month, year, salary, gender, indian, pan_no, aadhar)
-                employees.append(employee)
+            connection = DBConnection.getConnection(replica=True)
+            rows = StatementRegistry.fetchall(
+                connection, "select * from employee")
+            DBConnection.commit(connection)
+            employees = HRDLHandler._hydrate(Employee._from_row, rows)
         except Error as error:
             raise DataLayerError(message=error.msg)
         finally:
-            try:
-                if cursor.is_open():
-                    cursor.close()
-                if connection.is_connected():
-                    connection.close()
-            except:
-                pass
+            DBConnection.releaseConnection(connection)
         return employees
 
+    @Metrics.instrument
+    def iter_employees(batch_size=None):
+        """
+        Retrieves all the existing Employee entries from the Employee
+        Table lazily, the rows are streamed from the server (unbuffered
+        cursor) batch_size at a time and turned into Employee objects
+        only as they are consumed, so the memory used does not grow with
+        the size of the table.
+        The connection is borrowed on the first iteration and given back
+        as soon as the iteration ends or the generator is closed, a
+        generator abandoned halfway should be closed to free it.
+
+        Attributes:
+            batch_size(int): the number of rows fetched at a time.
+                default is the batch_size of dbconfig.xml
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value: returns a generator of Employee objects, ordered
+        by employee ID.
+        """
+        if batch_size is None:
+            batch_size = DBUtility.getDBConfiguration().batch_size
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise DataLayerError(
+                f"Invalid batch size : {batch_size}, it should be an int greater than zero")
+        store = DBConnection.getStore()
+        if store is not None:
+            for employee in HRDLHandler._hydrate(Employee._from_row, store.employees()):
+                yield employee
+            return
+        connection = cursor = None
+        exhausted = False
+        try:
+            connection = DBConnection.getConnection(replica=True)
+            # the cursors of mysql.connector are unbuffered by default.
+            cursor = connection.cursor()
+            started = time.perf_counter()
+            cursor.execute("select * from employee order by emp_id;")
+            Metrics.record(Metrics.EXECUTE, time.perf_counter() - started,
+                           "select * from employee order by emp_id;", ())
+            while True:
+                started = time.perf_counter()
+                rows = cursor.fetchmany(batch_size)
+                Metrics.record(Metrics.FETCH, time.perf_counter() - started)
+                if len(rows) == 0:
+                    break
+                for employee in HRDLHandler._hydrate(Employee._from_row, rows):
+                    yield employee
+            exhausted = True
+            DBConnection.commit(connection)
+        except Error as error:
+            raise DataLayerError(message=error.msg)
+        finally:
+            # a connection left with unread rows cannot be reused.
+            DBConnection.releaseConnection(
+                connection, cursor, discard=not exhausted)
+
+    @Metrics.instrument
+    def get_designations_page(cursor=None, page_size=None):
+        """
+        Retrieves one page of the existing Designation entries from the
+        Designation Table ordered by code, using the code as the key
+        of the page (keyset pagination).
+
+        Attributes:
+            cursor(str): next_cursor/previous_cursor of a Page returned
+            earlier.
+                default is None(NoneType), for the first page
+            page_size(int): the maximum number of entries in the page.
+                default is Page.default_page_size
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value: returns a Page of Designation objects.
+        """
+        return HRDLHandler._get_page("designation", "code", Designation._from_row, cursor, page_size)
+
+    @Metrics.instrument
+    def get_employees_page(cursor=None, page_size=None):
+        """
+        Retrieves one page of the existing Employee entries from the
+        Employee Table ordered by employee ID, using the employee ID as
+        the key of the page (keyset pagination).
+
+        Attributes:
+            cursor(str): next_cursor/previous_cursor of a Page returned
+            earlier.
+                default is None(NoneType), for the first page
+            page_size(int): the maximum number of entries in the page.
+                default is Page.default_page_size
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value: returns a Page of Employee objects.
+        """
+        return HRDLHandler._get_page("employee", "emp_id", Employee._from_row, cursor, page_size)
+
+    def _get_page(table, key, from_row, cursor, page_size):
+        """
+        Fetches the page of the table described by the cursor, one row
+        more than the page_size is asked for to know whether there is
+        a page beyond it.
+        """
+        if page_size == None:
+            page_size = Page.default_page_size
+        if not isinstance(page_size, int) or page_size <= 0 or page_size > Page.max_page_size:
+            raise DataLayerError(
+                f"Invalid page size : {page_size}, it should be greater than 0 and not exceed {Page.max_page_size}")
+        direction, position = Page.decode_cursor(cursor)
+        store = DBConnection.getStore()
+        if store is not None:
+            rows = store.page(table, direction, position, page_size + 1)
+            return HRDLHandler._to_page(rows, from_row, direction, position, page_size)
+        connection = None
+        try:
+            connection = DBConnection.getConnection(replica=True)
+            if direction == "after":
+                rows = StatementRegistry.fetchall(
+                    connection, f"select * from {table} where {key} > %s order by {key} limit %s", (position, page_size + 1))
+            else:
+                rows = StatementRegistry.fetchall(
+                    connection, f"select * from {table} where {key} < %s order by {key} desc limit %s", (position, page_size + 1))
+            DBConnection.commit(connection)
+        except Error as error:
+            raise DataLayerError(message=error.msg)
+        finally:
+            DBConnection.releaseConnection(connection)
+        return HRDLHandler._to_page(rows, from_row, direction, position, page_size)
+
+    def _to_page(rows, from_row, direction, position, page_size):
+        """
+        Makes the Page out of the rows fetched for it, in the order of
+        the fetch (decreasing keys for direction 'before').
+        """
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if direction == "before":
+            rows.reverse()
+        items = HRDLHandler._hydrate(from_row, rows)
+        if len(rows) == 0:
+            if direction == "after" and position > 0:
+                return Page(items, previous_cursor=Page.encode_cursor("before", position + 1))
+            if direction == "before":
+                return Page(items, next_cursor=Page.encode_cursor("after", max(position - 1, 0)))
+            return Page(items)
+        first_key = rows[0][0]
+        last_key = rows[-1][0]
+        if direction == "after":
+            next_cursor = Page.encode_cursor("after", last_key) if has_more else None
+            previous_cursor = Page.encode_cursor("before", first_key) if position > 0 else None
+        else:
+            next_cursor = Page.encode_cursor("after", last_key)
+            previous_cursor = Page.encode_cursor("before", first_key) if has_more else None
+        return Page(items, next_cursor, previous_cursor)
+
+    @Metrics.instrument
     def get_designation_by_code(code):
         """
         Retrieves an existing Designation entry which matches the
@@ -823,28 +3479,36 @@ class HRDLHandler:
                 f"Found type {type(code)}, required type {type(0)}")
         if code <= 0:
             raise DataLayerError(f"Invalid Code : {code}")
+        store = DBConnection.getStore()
+        if store is not None:
+            row = store.designation(code)
+            if row == None:
+                raise DataLayerError(message=f"Code : {code} does not exists")
+            return Designation._from_row(row)
+        designation = EntityCache.get_designation(code)
+        if designation is not None:
+            return designation
+        version = EntityCache.version()
+        connection = None
         try:
-            connection = DBConnection.getConnection()
-            cursor = connection.cursor()
-            cursor.execute("select * from designation where code=%s", (code,))
-            row = cursor.fetchone()
-            connection.commit()
+            connection = DBConnection.getConnection(replica=True)
+            row = StatementRegistry.fetchone(
+                connection, "select * from designation where code=%s", (code,))
+            DBConnection.commit(connection)
             if row == None:
                 raise DataLayerError(message=f"Code : {code} does not exists")
-            code, title = row
-            designation = Designation(code, title)
+            designation = Designation._from_row(row)
+            # a replica may not have caught up with the latest writes yet.
+            cacheable = not DBConnection.mayBeStale(connection)
         except Error as error:
             raise DataLayerError(message=error.msg)
         finally:
-            try:
-                if cursor.is_open():
-                    cursor.close()
-                if connection.is_connected():
-                    connection.close()
-            except:
-                pass
+            DBConnection.releaseConnection(connection)
+        if cacheable:
+            EntityCache.put_designation(designation, version)
         return designation
 
+    @Metrics.instrument
     def get_employee_by_id(emp_id):
         """
         Retrieves an existing Employee entry which matches the
@@ -867,41 +3531,38 @@ class HRDLHandler:
                 f"Found type {type(emp_id)}, required type {type(0)}")
         if emp_id <= 0:
             raise DataLayerError(f"Invalid employee ID : {emp_id}")
+        store = DBConnection.getStore()
+        if store is not None:
+            row = store.employee(emp_id)
+            if row == None:
+                raise DataLayerError(
+                    message=f"Employee ID : {emp_id} does not exists")
+            return Employee._from_row(row)
+        employee = EntityCache.get_employee(emp_id)
+        if employee is not None:
+            return employee
+        version = EntityCache.version()
+        connection = None
         try:
-            connection = DBConnection.getConnection()
-            cursor = connection.cursor()
-            cursor.execute("select * from employee where emp_id=%s", (emp_id,))
-            row = cursor.fetchone()
-            connection.commit()
+            connection = DBConnection.getConnection(replica=True)
+            row = StatementRegistry.fetchone(
+                connection, "select * from employee where emp_id=%s", (emp_id,))
+            DBConnection.commit(connection)
             if row == None:
                 raise DataLayerError(
                     message=f"Employee ID : {emp_id} does not exists")
-            emp_id = row[0]
-            name = row[1]
-            designation_code = row[2]
-            dob = row[3]
-            day = dob.strftime("%d")
-            month = dob.strftime("%m")
-            year = dob.strftime("%Y")
-            salary = row[4]
-            gender = row[5]
-            indian = row[6]
-            pan_no = row[7]
-            aadhar = row[8]
-            employee = Employee(emp_id, name, designation_code, day,
-                                month, year, salary, gender, indian, pan_no, aadhar)
+            employee = Employee._from_row(row)
+            # a replica may not have caught up with the latest writes yet.
+            cacheable = not DBConnection.mayBeStale(connection)
         except Error as error:
             raise DataLayerError(message=error.msg)
         finally:
-            try:
-                if cursor.is_open():
-                    cursor.close()
-                if connection.is_connected():
-                    connection.close()
-            except:
-                pass
+            DBConnection.releaseConnection(connection)
+        if cacheable:
+            EntityCache.put_employee(employee, version)
         return employee
 
+    @Metrics.instrument
     def get_designation_by_title(title):
         """
         Retrieves an existing Designation entry which matches the
@@ -924,30 +3585,38 @@ class HRDLHandler:
         if len(title) <= 0 or len(title) > 35:
             raise DataLayerError(
                 f"The length of title exceeds max limit, it should be greater than 0 and less than 35.")
+        store = DBConnection.getStore()
+        if store is not None:
+            row = store.designation_by_title(title)
+            if row == None:
+                raise DataLayerError(
+                    message=f"Designation : {title} does not exists")
+            return Designation._from_row(row)
+        designation = EntityCache.get_designation_by_title(title)
+        if designation is not None:
+            return designation
+        version = EntityCache.version()
+        connection = None
         try:
-            connection = DBConnection.getConnection()
-            cursor = connection.cursor()
-            cursor.execute(
-                "select * from designation where title=%s", (title,))
-            row = cursor.fetchone()
-            connection.commit()
+            connection = DBConnection.getConnection(replica=True)
+            row = StatementRegistry.fetchone(
+                connection, "select * from designation where title=%s", (title,))
+            DBConnection.commit(connection)
             if row == None:
                 raise DataLayerError(
                     message=f"Designation : {title} does not exists")
-            code, title = row
-            designation = Designation(code, title)
+            designation = Designation._from_row(row)
+            # a replica may not have caught up with the latest writes yet.
+            cacheable = not DBConnection.mayBeStale(connection)
         except Error as error:
             raise DataLayerError(message=error.msg)
         finally:
-            try:
-                if cursor.is_open():
-                    cursor.close()
-                if connection.is_connected():
-                    connection.close()
-            except:
-                pass
+            DBConnection.releaseConnection(connection)
+        if cacheable:
+            EntityCache.put_designation(designation, version)
         return designation
 
+    @Metrics.instrument
     def get_employee_by_name(name):
         """
         Retrives a list of all the existing Employee entry which
@@ -972,44 +3641,92 @@ class HRDLHandler:
         if len(name) <= 0 or len(name) > 35:
             raise DataLayerError(
                 f"The length of name exceeds max limit, it should be greater than 0 and less than 35.")
+        store = DBConnection.getStore()
+        if store is not None:
+            return HRDLHandler._hydrate(Employee._from_row, store.employees_by_name(name))
+        connection = None
         try:
-            connection = DBConnection.getConnection()
+            connection = DBConnection.getConnection(replica=True)
+            rows = StatementRegistry.fetchall(
+                connection, "select * from employee where name=%s", (name,))
+            DBConnection.commit(connection)
+            employees = HRDLHandler._hydrate(Employee._from_row, rows)
+        except Error as error:
+            raise DataLayerError(message=error.msg)
+        finally:
+            DBConnection.releaseConnection(connection)
+            return employees
+
+    @Metrics.instrument
+    def search_employees(name, limit=10):
+        """
+        Retrieves the employees whose name is equal to the given name
+        ignoring the case, then those whose name or any word of it starts
+        with the given name and then those whose name is similar to it.
+        The matches are found in the EmployeeNameIndex, only the matching
+        entries are read from the Employee Table.
+
+        Attributes:
+            name(str): the name, or a part of it, to be searched.
+            limit(int): the maximum number of employees to be retrieved.
+                default is 10
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value: returns a list of Employee class objects, best
+        matches first.
+        """
+        if name == None:
+            raise DataLayerError(message="Employee Name Required")
+        if not isinstance(name, str):
+            raise DataLayerError(
+                f"Found type {type(name)}, required type {type('A')}")
+        if len(name.strip()) <= 0:
+            raise DataLayerError(message="Employee Name Required")
+        if len(name) > 35:
+            raise DataLayerError(
+                message="The length of name exceeds max limit, it should not exceed 35.")
+        if not isinstance(limit, int) or isinstance(limit, bool):
+            raise DataLayerError(
+                f"Found type {type(limit)}, required type {type(0)}")
+        if limit <= 0 or limit > Page.max_page_size:
+            raise DataLayerError(
+                f"Invalid entry for limit : {limit}, it should be greater than 0 and should not exceed {Page.max_page_size}")
+        emp_ids = EmployeeNameIndex.search(name.strip(), limit)
+        if len(emp_ids) == 0:
+            return list()
+        store = DBConnection.getStore()
+        if store is not None:
+            return HRDLHandler._hydrate(Employee._from_row, store.employees_by_ids(emp_ids))
+        employees = dict()
+        connection = cursor = None
+        try:
+            connection = DBConnection.getConnection(replica=True)
             cursor = connection.cursor()
-            cursor.execute("select * from employee where name=%s", (name,))
+            sql = f"select * from employee where emp_id in ({','.join(['%s'] * len(emp_ids))})"
+            started = time.perf_counter()
+            cursor.execute(sql, tuple(emp_ids))
+            executed = time.perf_counter()
             rows = cursor.fetchall()
-            connection.commit()
-            for data in rows:
-                emp_id = data[0]
-                name = data[1]
-                designation_code = data[2]
-                dob = data[3]
-                day = dob.strftime("%d")
-                month = dob.strftime("%m")
-                year = dob.strftime("%Y")
-                salary = data[4]
-                gender = data[5]
-                indian = data[6]
-                pan_no = data[7]
-                aadhar = data[8]
-                employee = Employee(emp_id, name, designation_code, day,
-                                    month, year, salary, gender, indian, pan_no, aadhar)
-                employees.append(employee)
+            Metrics.record(Metrics.EXECUTE, executed -
+                           started, sql, tuple(emp_ids))
+            Metrics.record(Metrics.FETCH, time.perf_counter() - executed)
+            DBConnection.commit(connection)
+            for employee in HRDLHandler._hydrate(Employee._from_row, rows):
+                employees[employee.emp_id] = employee
         except Error as error:
             raise DataLayerError(message=error.msg)
         finally:
-            try:
-                if cursor.is_open():
-                    cursor.close()
-                if connection.is_connected():
-                    connection.close()
-            except:
-                pass
-            return employees
+            DBConnection.releaseConnection(connection, cursor)
+        return [employees[emp_id] for emp_id in emp_ids if emp_id in employees]
 
+    @Metrics.instrument
     def get_designation_count():
         """
         Retrieves the value of the total number of entries present in
-        the Designation Table.
+        the Designation Table, from the EntityCounts unless called within
+        a Transaction.
 
         Exception Raising:
             raises DataLayerError exception.
@@ -1017,29 +3734,30 @@ class HRDLHandler:
         Return Value: returns an int equal to the total entries in
         the Designation Table.
         """
+        store = DBConnection.getStore()
+        if store is not None:
+            return store.count(MemoryStore.DESIGNATION)
+        if Transaction.current() is None:
+            return EntityCounts.get()["designations"]
+        connection = None
         try:
             connection = DBConnection.getConnection()
-            cursor = connection.cursor()
-            cursor.execute("select count(*) as cnt from designation;")
-            row = cursor.fetchone()
-            connection.commit()
+            row = StatementRegistry.fetchone(
+                connection, "select count(*) as cnt from designation")
+            DBConnection.commit(connection)
             count = row[0]
         except Error as error:
             raise DataLayerError(message=error.msg)
         finally:
-            try:
-                if cursor.is_open():
-                    cursor.close()
-                if connection.is_connected():
-                    connection.close()
-            except:
-                pass
+            DBConnection.releaseConnection(connection)
         return count
 
+    @Metrics.instrument
     def get_employee_count():
         """
         Retrieves the value of the total number of entries present in
-        the Employee Table.
+        the Employee Table, from the EntityCounts unless called within
+        a Transaction.
 
         Exception Raising:
             raises DataLayerError exception.
@@ -1047,21 +3765,98 @@ class HRDLHandler:
         Return Value: returns an int equal to the total entries in
         the Employee Table.
         """
+        store = DBConnection.getStore()
+        if store is not None:
+            return store.count(MemoryStore.EMPLOYEE)
+        if Transaction.current() is None:
+            return EntityCounts.get()["employees"]
+        connection = None
         try:
             connection = DBConnection.getConnection()
-            cursor = connection.cursor()
-            cursor.execute("select count(*) as cnt from employee;")
-            row = cursor.fetchone()
-            connection.commit()
+            row = StatementRegistry.fetchone(
+                connection, "select count(*) as cnt from employee")
+            DBConnection.commit(connection)
             count = row[0]
         except Error as error:
             raise DataLayerError(message=error.msg)
         finally:
-            try:
-                if cursor.is_open():
-                    cursor.close()
-                if connection.is_connected():
-                    connection.close()
-            except:
-                pass
+            DBConnection.releaseConnection(connection)
         return count
+
+    @Metrics.instrument
+    def get_statistics():
+        """
+        Retrieves the number of entries present in the Designation and
+        the Employee Tables and the number of employees of every
+        designation, from the EntityCounts.
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value: returns a dictionary, refer EntityCounts.get.
+        """
+        return EntityCounts.get()
+
+    @Metrics.instrument
+    def save_snapshot(path=None):
+        """
+        Saves all the entries of the Designation and Employee Tables to a
+        snapshot file, which the Memory architecture loads its tables from
+        (refer memory module). With the Memory architecture the tables of
+        the MemoryStore are saved, with the others the tables are read
+        from the database, so that the Memory architecture can serve a
+        copy of the database.
+
+        Attributes:
+            path(str): the path of the snapshot file.
+                default is the database of dbconfig.xml, for the Memory
+                architecture only
+
+        Exception Raising:
+            raises DataLayerError exception.
+        """
+        store = DBConnection.getStore()
+        if path == None and store is not None:
+            path = DBUtility.getDBConfiguration().database
+        if not isinstance(path, str) or len(path) == 0:
+            raise DataLayerError(message="Snapshot file path Required")
+        if store is None:
+            store = MemoryStore()
+            store.fill([(designation.code, designation.title) for designation in HRDLHandler.get_designations()],
+                       [(employee.emp_id,) + HRDLHandler._employee_values(employee) for employee in HRDLHandler.iter_employees()])
+        try:
+            store.save(path)
+        except OSError as error:
+            raise DataLayerError(message=str(error))
+
+    @Metrics.instrument
+    def load_snapshot(path=None):
+        """
+        Replaces all the entries of the tables of the MemoryStore with those
+        of a snapshot file saved by save_snapshot, for the Memory
+        architecture only.
+
+        Attributes:
+            path(str): the path of the snapshot file.
+                default is the database of dbconfig.xml
+
+        Exception Raising:
+            raises DataLayerError exception.
+        """
+        store = DBConnection.getStore()
+        if store is None:
+            raise DataLayerError(
+                message="Snapshots can be loaded with the Memory architecture only")
+        if path == None:
+            path = DBUtility.getDBConfiguration().database
+        if not isinstance(path, str) or len(path) == 0:
+            raise DataLayerError(message="Snapshot file path Required")
+        try:
+            store.load(path)
+        except (OSError, ValueError) as error:
+            raise DataLayerError(message=str(error))
+        except Error as error:
+            raise DataLayerError(message=error.msg)
+        DesignationRegistry.invalidate()
+        EmployeeNameIndex.invalidate()
+        EntityCounts.invalidate()
@@ -0,0 +1,430 @@
+import os
+import json
+import bisect
+import threading
+from datetime import date
+try:
+    from data_layer.backends import DatabaseError
+except ImportError:
+    # imported as a script module from within the data_layer folder.
+    from backends import DatabaseError
+
+"""
+It is a module of the Data Layer that provides the store of the Memory
+architecture, which keeps the Designation and Employee tables in the
+memory of the process instead of a database.
+It serves as a baseline free of any I/O, to tell the time spent by the
+network layer from the time spent by the database, and as a read-mostly
+copy of the database loaded from a snapshot file when the server starts.
+"""
+
+
+class MemoryStore:
+    """
+    A thread-safe in-memory copy of the Designation and Employee tables.
+    The rows are tuples with the columns in the order of the tables,
+    (code, title) and (emp_id, name, designation_code, DOB, salary, gender,
+    is_indian, pan_no, aadhar_no), so that they are turned into objects
+    just like the rows read from a database.
+
+    The rows are kept in dictionaries keyed by code and emp_id (the
+    primary indexes), along with sorted lists of the keys for the pages.
+    The secondary indexes map the casefolded title to the codes, the
+    casefolded name to the employee IDs and the designation code to the
+    employee IDs, the text is compared case insensitively like the default
+    collation of MySQL does.
+    The store fails the writes a database would fail (a duplicate title,
+    a missing row, a missing designation or one still in use) with
+    DatabaseError.
+
+    Between begin and commit/rollback the store is locked by the calling
+    thread, the changes made meanwhile are recorded and undone by
+    rollback. The generated codes and employee IDs are not reused, like
+    the auto increment columns of a database.
+
+    Methods:
+        insert_designation(title) / update_designation(code, title) /
+        delete_designation(code)
+        insert_employee(values) / update_employee(emp_id, values) /
+        delete_employee(emp_id)
+        designation(code) / designation_by_title(title) / designations
+        employee(emp_id) / employees_by_name(name) / employees_by_ids(emp_ids)
+        / employees / names
+        page(table, direction, position, limit): returns the rows of a page.
+        count(table): returns the number of rows of a table.
+        headcounts: returns the number of employees of every designation.
+        begin / commit / rollback: a transaction of the calling thread.
+        save(path) / load(path): writes / reads a snapshot file.
+    """
+
+    DESIGNATION = "designation"
+    EMPLOYEE = "employee"
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._undo = None
+        self._clear()
+
+    def _clear(self):
+        self._designations = dict()
+        self._employees = dict()
+        self._keys = {MemoryStore.DESIGNATION: list(),
+                      MemoryStore.EMPLOYEE: list()}
+        self._titles = dict()
+        self._names = dict()
+        self._members = dict()
+        self._next_code = 1
+        self._next_emp_id = 1
+
+    def insert_designation(self, title):
+        """
+        Adds a designation with a new code.
+
+        Exception Raising:
+            raises DatabaseError, if the title exists already.
+
+        Return Value: returns the code generated.
+        """
+        with self._lock:
+            if len(self._titles.get(title.casefold(), ())) > 0:
+                raise DatabaseError(f"{title} already exists")
+            code = self._next_code
+            self._next_code += 1
+            self._put_designation((code, title))
+            return code
+
+    def update_designation(self, code, title):
+        """
+        Exception Raising:
+            raises DatabaseError, if the code does not exist.
+        """
+        with self._lock:
+            if code not in self._designations:
+                raise DatabaseError(f"Code : {code} does not exists")
+            self._put_designation((code, title))
+
+    def delete_designation(self, code):
+        """
+        Exception Raising:
+            raises DatabaseError, if the code does not exist or employees
+            exist against it.
+        """
+        with self._lock:
+            if len(self._members.get(code, ())) > 0:
+                raise DatabaseError(
+                    f"The designation code : {code}, cannot be deleted as employees exist against it")
+            if code not in self._designations:
+                raise DatabaseError(f"Code : {code} does not exists")
+            self._drop_designation(code)
+
+    def insert_employee(self, values):
+        """
+        Adds an employee with a new employee ID, values are the columns
+        of the row after emp_id.
+
+        Exception Raising:
+            raises DatabaseError, if the designation code does not exist.
+
+        Return Value: returns the employee ID generated.
+        """
+        with self._lock:
+            self._check_designation(values[1])
+            emp_id = self._next_emp_id
+            self._next_emp_id += 1
+            self._put_employee((emp_id,) + tuple(values))
+            return emp_id
+
+    def update_employee(self, emp_id, values):
+        """
+        Replaces the columns after emp_id of the employee.
+
+        Exception Raising:
+            raises DatabaseError, if the employee ID or the designation
+            code does not exist.
+
+        Return Value: returns the row of the employee before the update.
+        """
+        with self._lock:
+            row = self._employees.get(emp_id)
+            if row is None:
+                raise DatabaseError(f"{emp_id} does not exists")
+            self._check_designation(values[1])
+            self._put_employee((emp_id,) + tuple(values))
+            return row
+
+    def delete_employee(self, emp_id):
+        """
+        Exception Raising:
+            raises DatabaseError, if the employee ID does not exist.
+
+        Return Value: returns the row of the employee deleted.
+        """
+        with self._lock:
+            row = self._employees.get(emp_id)
+            if row is None:
+                raise DatabaseError(f"{emp_id} does not exists")
+            self._drop_employee(emp_id)
+            return row
+
+    def designation(self, code):
+        """
+        Return Value: returns the row of the code, None if there is none.
+        """
+        with self._lock:
+            return self._designations.get(code)
+
+    def designation_by_title(self, title):
+        """
+        Return Value: returns the row with the title (ignoring the case)
+        and the lowest code, None if there is none.
+        """
+        with self._lock:
+            codes = self._titles.get(title.casefold())
+            if not codes:
+                return None
+            return self._designations[min(codes)]
+
+    def designations(self):
+        """
+        Return Value: returns the list of all the rows, ordered by code.
+        """
+        with self._lock:
+            return [self._designations[code] for code in self._keys[MemoryStore.DESIGNATION]]
+
+    def employee(self, emp_id):
+        """
+        Return Value: returns the row of the employee ID, None if there
+        is none.
+        """
+        with self._lock:
+            return self._employees.get(emp_id)
+
+    def employees_by_name(self, name):
+        """
+        Return Value: returns the list of the rows with the name (ignoring
+        the case), ordered by employee ID.
+        """
+        with self._lock:
+            return [self._employees[emp_id] for emp_id in sorted(self._names.get(name.casefold(), ()))]
+
+    def employees_by_ids(self, emp_ids):
+        """
+        Return Value: returns the list of the rows of the employee IDs
+        which exist, in the order of the IDs given.
+        """
+        with self._lock:
+            return [self._employees[emp_id] for emp_id in emp_ids if emp_id in self._employees]
+
+    def employees(self):
+        """
+        Return Value: returns the list of all the rows, ordered by
+        employee ID.
+        """
+        with self._lock:
+            return [self._employees[emp_id] for emp_id in self._keys[MemoryStore.EMPLOYEE]]
+
+    def names(self):
+        """
+        Return Value: returns the list of (emp_id, name) of all the
+        employees.
+        """
+        with self._lock:
+            return [(row[0], row[1]) for row in self._employees.values()]
+
+    def headcounts(self):
+        """
+        Return Value: returns a dictionary of the designation code to the
+        number of its employees, for the designations having employees.
+        """
+        with self._lock:
+            return {code: len(emp_ids) for code, emp_ids in self._members.items()}
+
+    def page(self, table, direction, position, limit):
+        """
+        Returns at most limit rows of the table with the key greater than
+        the position in increasing order (direction 'after') or lower than
+        the position in decreasing order (direction 'before').
+
+        Return Value: returns a list of rows.
+        """
+        with self._lock:
+            keys = self._keys[table]
+            rows = self._designations if table == MemoryStore.DESIGNATION else self._employees
+            if direction == "after":
+                start = bisect.bisect_right(keys, position)
+                return [rows[key] for key in keys[start:start + limit]]
+            end = bisect.bisect_left(keys, position)
+            return [rows[key] for key in reversed(keys[max(end - limit, 0):end])]
+
+    def count(self, table):
+        """
+        Return Value: returns the number of rows of the table.
+        """
+        with self._lock:
+            return len(self._keys[table])
+
+    def begin(self):
+        """
+        Starts a transaction of the calling thread, the other threads wait
+        for it to end before using the store.
+
+        Exception Raising:
+            raises DatabaseError, if the thread has begun one already.
+        """
+        self._lock.acquire()
+        if self._undo is not None:
+            self._lock.release()
+            raise DatabaseError("A transaction is already in progress")
+        self._undo = list()
+
+    def commit(self):
+        """
+        Ends the transaction of the calling thread, keeping its changes.
+        """
+        self._undo = None
+        self._lock.release()
+
+    def rollback(self):
+        """
+        Ends the transaction of the calling thread, undoing its changes.
+        """
+        try:
+            undo = self._undo
+            self._undo = None
+            for function, argument in reversed(undo):
+                function(argument)
+        finally:
+            self._lock.release()
+
+    def save(self, path):
+        """
+        Writes the rows of the tables, along with the next code and employee
+        ID to be generated, to the snapshot file as JSON. The file is written
+        aside and renamed over the old one, so that it is never left half
+        written.
+
+        Exception Raising:
+            raises OSError.
+        """
+        with self._lock:
+            snapshot = {
+                "version": 1,
+                "next_code": self._next_code,
+                "next_emp_id": self._next_emp_id,
+                "designations": [list(row) for row in self.designations()],
+                "employees": [[emp_id, name, code, dob.isoformat(), float(salary), gender, indian, pan_no, aadhar]
+                              for emp_id, name, code, dob, salary, gender, indian, pan_no, aadhar in self.employees()]
+            }
+        temporary = f"{path}.tmp"
+        with open(temporary, "wt") as f:
+            json.dump(snapshot, f)
+        os.replace(temporary, path)
+
+    def load(self, path):
+        """
+        Replaces the rows of the tables with those of the snapshot file.
+
+        Exception Raising:
+            raises OSError, or ValueError if the file is not a snapshot.
+        """
+        with open(path, "rt") as f:
+            try:
+                snapshot = json.load(f)
+                designations = [(code, title)
+                                for code, title in snapshot["designations"]]
+                employees = [(emp_id, name, code, date.fromisoformat(dob), salary, gender, indian, pan_no, aadhar)
+                             for emp_id, name, code, dob, salary, gender, indian, pan_no, aadhar in snapshot["employees"]]
+                next_code = snapshot["next_code"]
+                next_emp_id = snapshot["next_emp_id"]
+            except (KeyError, TypeError, ValueError) as error:
+                raise ValueError(f"{path} is not a valid snapshot : {error}")
+        self.fill(designations, employees, next_code, next_emp_id)
+
+    def fill(self, designations, employees, next_code=None, next_emp_id=None):
+        """
+        Replaces the rows of the tables with the given rows, the next code
+        and employee ID default to one more than the highest ones.
+        """
+        with self._lock:
+            if self._undo is not None:
+                raise DatabaseError(
+                    "The store cannot be replaced within a transaction")
+            self._clear()
+            for row in sorted(designations):
+                self._put_designation(tuple(row))
+            for row in sorted(employees, key=lambda row: row[0]):
+                self._put_employee(tuple(row))
+            keys = self._keys[MemoryStore.DESIGNATION]
+            self._next_code = max(next_code or 0, keys[-1] + 1 if keys else 1)
+            keys = self._keys[MemoryStore.EMPLOYEE]
+            self._next_emp_id = max(
+                next_emp_id or 0, keys[-1] + 1 if keys else 1)
+
+    def _check_designation(self, code):
+        if code not in self._designations:
+            raise DatabaseError(f"Invalid Designation Code : {code}")
+
+    def _put_designation(self, row):
+        code, title = row
+        old_row = self._designations.get(code)
+        if old_row is None:
+            MemoryStore._insort(self._keys[MemoryStore.DESIGNATION], code)
+            self._record(self._drop_designation, code)
+        else:
+            MemoryStore._unindex(self._titles, old_row[1].casefold(), code)
+            self._record(self._put_designation, old_row)
+        self._designations[code] = row
+        self._titles.setdefault(title.casefold(), set()).add(code)
+
+    def _drop_designation(self, code):
+        row = self._designations.pop(code)
+        MemoryStore._remove(self._keys[MemoryStore.DESIGNATION], code)
+        MemoryStore._unindex(self._titles, row[1].casefold(), code)
+        self._record(self._put_designation, row)
+
+    def _put_employee(self, row):
+        emp_id, name, code = row[:3]
+        old_row = self._employees.get(emp_id)
+        if old_row is None:
+            MemoryStore._insort(self._keys[MemoryStore.EMPLOYEE], emp_id)
+            self._record(self._drop_employee, emp_id)
+        else:
+            MemoryStore._unindex(self._names, old_row[1].casefold(), emp_id)
+            MemoryStore._unindex(self._members, old_row[2], emp_id)
+            self._record(self._put_employee, old_row)
+        self._employees[emp_id] = row
+        self._names.setdefault(name.casefold(), set()).add(emp_id)
+        self._members.setdefault(code, set()).add(emp_id)
+
+    def _drop_employee(self, emp_id):
+        row = self._employees.pop(emp_id)
+        MemoryStore._remove(self._keys[MemoryStore.EMPLOYEE], emp_id)
+        MemoryStore._unindex(self._names, row[1].casefold(), emp_id)
+        MemoryStore._unindex(self._members, row[2], emp_id)
+        self._record(self._put_employee, row)
+
+    def _record(self, function, argument):
+        # the undo functions record again while undoing, rollback has
+        # already taken the log away by then.
+        if self._undo is not None:
+            self._undo.append((function, argument))
+
+    def _insort(keys, key):
+        # the generated keys are the highest so far, appending is the
+        # common case.
+        if len(keys) == 0 or keys[-1] < key:
+            keys.append(key)
+        else:
+            bisect.insort(keys, key)
+
+    def _remove(keys, key):
+        index = bisect.bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            del keys[index]
+
+    def _unindex(index, value, key):
+        keys = index.get(value)
+        if keys is not None:
+            keys.discard(key)
+            if len(keys) == 0:
+                del index[value]
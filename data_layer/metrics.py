@@ -0,0 +1,264 @@
+import time
+import bisect
+import logging
+import inspect
+import functools
+import threading
+
+"""
+It is a module of the Data Layer that measures where the time of the
+HRDLHandler methods goes. Every call of a method is timed, along with
+its phases (getting a connection, executing the statements, fetching
+the rows, making the objects out of them and committing), into
+histograms cheap enough to be always on. The calls slower than a
+threshold are logged with the statements they executed.
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class Histogram:
+    """
+    A thread-safe histogram of durations, counted into buckets whose
+    bounds grow by a fourth of an octave (about 19%) from a microsecond to
+    a couple of minutes, so that recording is a binary search and the
+    percentiles are exact to a bucket.
+
+    Methods:
+        record(seconds): counts a duration.
+        percentile(percent): returns the duration below which the given
+        percent of the durations are.
+        snapshot: returns the count, total, mean, p50, p95, p99 and max.
+    """
+
+    BOUNDS = [1e-6 * 2 ** (step / 4) for step in range(109)]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = [0] * (len(Histogram.BOUNDS) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def record(self, seconds):
+        """
+        Counts the duration.
+        """
+        index = bisect.bisect_left(Histogram.BOUNDS, seconds)
+        with self._lock:
+            self._buckets[index] += 1
+            self._count += 1
+            self._total += seconds
+            if seconds > self._max:
+                self._max = seconds
+
+    def percentile(self, percent):
+        """
+        Return Value:
+            returns the upper bound of the bucket holding the duration below
+            which percent of the durations are, at most the maximum duration,
+            0.0 if nothing is recorded.
+        """
+        with self._lock:
+            return self._percentile(percent)
+
+    def snapshot(self):
+        """
+        Return Value:
+            returns a dictionary of the count, total, mean, p50, p95, p99 and
+            max, the durations are in seconds.
+        """
+        with self._lock:
+            return {
+                "count": self._count,
+                "total": self._total,
+                "mean": self._total / self._count if self._count > 0 else 0.0,
+                "p50": self._percentile(50),
+                "p95": self._percentile(95),
+                "p99": self._percentile(99),
+                "max": self._max
+            }
+
+    def _percentile(self, percent):
+        if self._count == 0:
+            return 0.0
+        rank = self._count * percent / 100
+        seen = 0
+        for index, count in enumerate(self._buckets):
+            seen += count
+            if seen >= rank and count > 0:
+                if index == len(Histogram.BOUNDS):
+                    return self._max
+                return min(Histogram.BOUNDS[index], self._max)
+        return self._max
+
+
+class _Call:
+    # the call of an instrumented method in progress.
+    __slots__ = ("operation", "started", "phases", "statements")
+
+    def __init__(self, operation):
+        self.operation = operation
+        self.started = time.perf_counter()
+        self.phases = dict()
+        self.statements = list()
+
+
+class Metrics:
+    """
+    A class that holds the histograms of the calls of the instrumented
+    methods and of their phases, keyed by the name of the method, shared
+    by the whole process.
+    The phases are recorded against the innermost instrumented call in
+    progress in the thread, those recorded outside of any call go under
+    the 'other' operation.
+
+    Attributes:
+        slow_threshold(float): the seconds beyond which a call is logged
+        (as a warning of the data_layer.metrics logger) along with the
+        statements it executed, 0 disables the logging.
+            default is 1.0, set from the <metrics> element of dbconfig.xml
+        max_statements(int): the number of statements of a call kept for
+        the log.
+            default is 20
+
+    Methods:
+        instrument(function): the decorator which times the calls.
+        record(phase, seconds, sql, params): records a phase of the call
+        in progress.
+        snapshot: returns the histograms of every operation.
+        reset: discards all the histograms.
+    """
+    ACQUIRE = "acquire"
+    EXECUTE = "execute"
+    FETCH = "fetch"
+    HYDRATE = "hydrate"
+    COMMIT = "commit"
+
+    slow_threshold = 1.0
+    max_statements = 20
+    _operations = dict()
+    _lock = threading.Lock()
+    _local = threading.local()
+
+    def instrument(function):
+        """
+        Decorates the function to time its calls under its name, to count
+        the exceptions it raises and to log its slow calls. The calls of a
+        generator function last from the first item to the last, only the
+        time spent in the generator itself is counted.
+        """
+        operation = function.__name__
+        if inspect.isgeneratorfunction(function):
+            @functools.wraps(function)
+            def generator(*arguments, **keywords):
+                call = _Call(operation)
+                busy = 0.0
+                failed = False
+                iterator = function(*arguments, **keywords)
+                try:
+                    while True:
+                        previous = Metrics._enter(call)
+                        started = time.perf_counter()
+                        try:
+                            item = next(iterator)
+                        except StopIteration:
+                            break
+                        except BaseException:
+                            failed = True
+                            raise
+                        finally:
+                            busy += time.perf_counter() - started
+                            Metrics._local.call = previous
+                        yield item
+                finally:
+                    iterator.close()
+                    Metrics._finish(call, busy, failed)
+            return generator
+
+        @functools.wraps(function)
+        def wrapper(*arguments, **keywords):
+            call = _Call(operation)
+            previous = Metrics._enter(call)
+            failed = False
+            try:
+                return function(*arguments, **keywords)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                Metrics._local.call = previous
+                Metrics._finish(
+                    call, time.perf_counter() - call.started, failed)
+        return wrapper
+
+    def record(phase, seconds, sql=None, params=None):
+        """
+        Records the seconds taken by a phase of the call in progress, the
+        statement executed (if given) is kept for the log of a slow call.
+        """
+        call = getattr(Metrics._local, "call", None)
+        operation = "other" if call is None else call.operation
+        phases = Metrics._get(operation)[1]
+        histogram = phases.get(phase)
+        if histogram is None:
+            with Metrics._lock:
+                histogram = phases.setdefault(phase, Histogram())
+        histogram.record(seconds)
+        if call is not None:
+            call.phases[phase] = call.phases.get(phase, 0.0) + seconds
+            if sql is not None and len(call.statements) < Metrics.max_statements:
+                call.statements.append((sql, params, seconds))
+
+    def snapshot():
+        """
+        Return Value:
+            returns a dictionary keyed by operation, with the histogram
+            snapshot (refer Histogram.snapshot) of its calls, the number of
+            its calls which raised an exception and the histogram snapshots
+            of its phases.
+        """
+        with Metrics._lock:
+            operations = list(Metrics._operations.items())
+        snapshot = dict()
+        for operation, (calls, phases, errors) in operations:
+            snapshot[operation] = {
+                "calls": calls.snapshot(),
+                "errors": errors[0],
+                "phases": {phase: histogram.snapshot() for phase, histogram in list(phases.items())}
+            }
+        return snapshot
+
+    def reset():
+        """
+        Discards all the histograms and counts.
+        """
+        with Metrics._lock:
+            Metrics._operations = dict()
+
+    def _enter(call):
+        previous = getattr(Metrics._local, "call", None)
+        Metrics._local.call = call
+        return previous
+
+    def _get(operation):
+        entry = Metrics._operations.get(operation)
+        if entry is None:
+            with Metrics._lock:
+                entry = Metrics._operations.setdefault(
+                    operation, (Histogram(), dict(), [0]))
+        return entry
+
+    def _finish(call, seconds, failed):
+        calls, phases, errors = Metrics._get(call.operation)
+        calls.record(seconds)
+        if failed:
+            with Metrics._lock:
+                errors[0] += 1
+        if Metrics.slow_threshold > 0 and seconds >= Metrics.slow_threshold:
+            phases = ", ".join(f"{phase} {seconds:.6f}s" for phase,
+                               seconds in call.phases.items())
+            statements = "".join(f"\n    {sql} {params!r} ({seconds:.6f}s)" for sql,
+                                 params, seconds in call.statements)
+            logger.warning(
+                f"slow call of {call.operation} took {seconds:.6f}s ({phases}){statements}")
@@ -0,0 +1,228 @@
+from datetime import datetime
+try:
+    from data_layer.hr import DBConnection, DataLayerError, Error
+except ImportError:
+    # imported as a script module from within the data_layer folder.
+    from hr import DBConnection, DataLayerError, Error
+
+"""
+It is a module of the Data Layer that creates the tables used by the
+HRApplication and keeps their indexes up to date.
+The changes to the schema are written as migrations, numbered in the
+order they are to be applied, and the numbers of the applied migrations
+are recorded in the schema_version table, so that running it again
+applies only the new ones.
+Every storage backend has its own list of migrations, as the products
+differ in their SQL for tables and indexes.
+"""
+
+
+class Migration:
+    """
+    A class which holds one change to the schema of the database.
+
+    Attributes:
+        version(int): the number of the migration, the migrations are
+        applied in the increasing order of it.
+        description(str): what the migration changes.
+        steps(list): the changes, each step is either an SQL statement or
+        an Index object.
+    """
+
+    def __init__(self, version, description, steps):
+        self.version = version
+        self.description = description
+        self.steps = steps
+
+
+class Index:
+    """
+    A class which holds a secondary index to be created on a table.
+    MySQL has no 'create index if not exists', so the index is created
+    only if no index of the table starts with the same columns.
+
+    Attributes:
+        table(str): the name of the table.
+        name(str): the name of the index.
+        columns(tuple): the indexed columns, in order.
+    """
+
+    def __init__(self, table, name, columns):
+        self.table = table
+        self.name = name
+        self.columns = columns
+
+
+INDEXES = [
+    Index("designation", "designation_title", ("title",)),
+    Index("employee", "employee_name", ("name",)),
+    Index("employee", "employee_designation_code", ("designation_code",)),
+    Index("employee", "employee_pan_no", ("pan_no",)),
+    Index("employee", "employee_aadhar_no", ("aadhar_no",))
+]
+
+MYSQL_MIGRATIONS = [
+    Migration(1, "create the designation and employee tables", [
+        """create table if not exists designation (
+            code int not null auto_increment,
+            title char(35) not null,
+            primary key (code)
+        ) engine=InnoDB""",
+        """create table if not exists employee (
+            emp_id int not null auto_increment,
+            name char(35) not null,
+            designation_code int not null,
+            DOB date not null,
+            salary decimal(12,2) not null,
+            gender char(1) not null,
+            is_indian tinyint(1) not null,
+            pan_no char(10) not null,
+            aadhar_no char(10) not null,
+            primary key (emp_id),
+            foreign key (designation_code) references designation (code)
+        ) engine=InnoDB"""
+    ]),
+    Migration(2, "add the secondary indexes used by the lookups", INDEXES)
+]
+
+# the text columns compare case insensitively, like the default
+# collation of MySQL does.
+SQLITE_MIGRATIONS = [
+    Migration(1, "create the designation and employee tables", [
+        """create table if not exists designation (
+            code integer primary key autoincrement,
+            title varchar(35) not null collate nocase
+        )""",
+        """create table if not exists employee (
+            emp_id integer primary key autoincrement,
+            name varchar(35) not null collate nocase,
+            designation_code integer not null references designation (code),
+            DOB date not null,
+            salary decimal(12,2) not null,
+            gender char(1) not null,
+            is_indian integer not null,
+            pan_no char(10) not null collate nocase,
+            aadhar_no char(10) not null collate nocase
+        )"""
+    ]),
+    Migration(2, "add the secondary indexes used by the lookups", INDEXES)
+]
+
+MIGRATIONS = {"MySQL": MYSQL_MIGRATIONS, "SQLite": SQLITE_MIGRATIONS}
+
+
+class SchemaManager:
+    """
+    A class which applies the migrations of the storage backend to the
+    database configured in dbconfig.xml. It is safe to run on every start
+    of the server, the tables and indexes which exist already are left as
+    they are.
+
+    Methods:
+        migrate: applies the migrations which are not applied yet.
+        get_applied_versions: retrieves the versions of the applied
+        migrations.
+    """
+
+    def migrate(migrations=None):
+        """
+        Creates the schema_version table if needed and applies, in order,
+        the migrations which are not recorded in it.
+
+        Attributes:
+            migrations(list): the Migration objects to be applied.
+                default is the migrations of the configured backend
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value: returns the list of the versions applied now.
+        """
+        if DBConnection.getStore() is not None:
+            # the Memory architecture has no schema, getting the store
+            # loads its tables from the snapshot file instead.
+            return list()
+        backend = DBConnection.getBackend()
+        if migrations is None:
+            migrations = MIGRATIONS[backend.name]
+        insert_ignore = "insert or ignore" if backend.name == "SQLite" else "insert ignore"
+        applied = list()
+        connection = cursor = None
+        try:
+            connection = DBConnection.getConnection()
+            cursor = connection.cursor()
+            cursor.execute("""create table if not exists schema_version (
+                version int not null,
+                description varchar(100) not null,
+                applied_on datetime not null,
+                primary key (version)
+            )""" + ("" if backend.name == "SQLite" else " engine=InnoDB"))
+            versions = SchemaManager._applied_versions(cursor)
+            for migration in sorted(migrations, key=lambda migration: migration.version):
+                if migration.version in versions:
+                    continue
+                for step in migration.steps:
+                    if isinstance(step, Index):
+                        SchemaManager._create_index(cursor, step, backend)
+                    else:
+                        cursor.execute(step)
+                # a server started at the same time may have applied it too.
+                cursor.execute(f"{insert_ignore} into schema_version (version, description, applied_on) values (%s,%s,%s)",
+                               (migration.version, migration.description, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+                connection.commit()
+                applied.append(migration.version)
+        except Error as error:
+            raise DataLayerError(message=error.msg)
+        finally:
+            DBConnection.releaseConnection(connection, cursor)
+        return applied
+
+    def get_applied_versions():
+        """
+        Retrieves the versions of the migrations applied to the database.
+
+        Exception Raising:
+            raises DataLayerError exception.
+
+        Return Value: returns a sorted list of int.
+        """
+        if DBConnection.getStore() is not None:
+            return list()
+        connection = cursor = None
+        try:
+            connection = DBConnection.getConnection()
+            cursor = connection.cursor()
+            versions = SchemaManager._applied_versions(cursor)
+            connection.commit()
+        except Error as error:
+            raise DataLayerError(message=error.msg)
+        finally:
+            DBConnection.releaseConnection(connection, cursor)
+        return sorted(versions)
+
+    def _applied_versions(cursor):
+        cursor.execute("select version from schema_version")
+        return set(row[0] for row in cursor.fetchall())
+
+    def _create_index(cursor, index, backend):
+        """
+        Creates the index, unless an index of the table already starts
+        with its columns (the primary key or the index of a foreign key
+        serve the lookups just as well). SQLite has 'if not exists'.
+        """
+        if backend.name == "SQLite":
+            cursor.execute(
+                f"create index if not exists {index.name} on {index.table} ({','.join(index.columns)})")
+            return
+        cursor.execute("""select index_name, column_name from information_schema.statistics
+            where table_schema=database() and table_name=%s order by index_name, seq_in_index""", (index.table,))
+        existing = dict()
+        for index_name, column_name in cursor.fetchall():
+            existing.setdefault(index_name, list()).append(
+                column_name.lower())
+        wanted = [column.lower() for column in index.columns]
+        for columns in existing.values():
+            if columns[:len(wanted)] == wanted:
+                return
+        cursor.execute(
+            f"create index {index.name} on {index.table} ({','.join(index.columns)})")
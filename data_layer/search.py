@@ -0,0 +1,181 @@
+import bisect
+import threading
+
+"""
+It is a module of the Data Layer that provides the in-memory index used
+to search the employees by their name.
+"""
+
+
+class NameIndex:
+    """
+    A thread-safe in-memory index of names, which finds the names equal
+    to (ignoring the case), starting with or similar to a searched text.
+
+    The names are casefolded and kept in a sorted list, once as a whole
+    and once from every word after the first, so that the prefix matches
+    are a binary search. The similar names are found through an inverted
+    index of the trigrams (three letter pieces) of the names, ranked by
+    the share of trigrams they have in common with the searched text,
+    compared with the whole name and with each of its words.
+
+    Attributes:
+        threshold(float): the minimum similarity, between 0 and 1, of a
+        name to be returned as similar.
+            default is 0.3
+
+    Methods:
+        add(key, name): indexes the name against the key, replacing the
+        name indexed against the key earlier, if any.
+        add_all(entries): indexes many (key, name) pairs at once.
+        remove(key): removes the name indexed against the key.
+        search(text, limit): returns the keys of the matching names.
+        trigrams(text): returns the trigrams of a text.
+        similarity(trigrams, name): returns the similarity of a name.
+    """
+
+    EXACT = 3
+    PREFIX = 2
+    SIMILAR = 1
+
+    def __init__(self, threshold=0.3):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._names = dict()
+        self._prefixes = list()
+        self._trigrams = dict()
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, key, name):
+        """
+        Indexes the name against the key, replacing the name indexed
+        against the key earlier, if any.
+        """
+        with self._lock:
+            self._remove(key)
+            folded = name.casefold()
+            self._names[key] = folded
+            for prefix in NameIndex._prefix_entries(folded):
+                bisect.insort(self._prefixes, (prefix, key))
+            for trigram in NameIndex.trigrams(folded):
+                self._trigrams.setdefault(trigram, set()).add(key)
+
+    def add_all(self, entries):
+        """
+        Indexes the (key, name) pairs as add does, the sorted list is
+        sorted once for all of them instead of being inserted into
+        for every name, as when the index is loaded.
+        """
+        latest = dict()
+        for key, name in entries:
+            latest[key] = name
+        with self._lock:
+            prefixes = list()
+            for key, name in latest.items():
+                self._remove(key)
+                folded = name.casefold()
+                self._names[key] = folded
+                for prefix in NameIndex._prefix_entries(folded):
+                    prefixes.append((prefix, key))
+                for trigram in NameIndex.trigrams(folded):
+                    self._trigrams.setdefault(trigram, set()).add(key)
+            self._prefixes.extend(prefixes)
+            self._prefixes.sort()
+
+    def remove(self, key):
+        """
+        Removes the name indexed against the key, if any.
+        """
+        with self._lock:
+            self._remove(key)
+
+    def search(self, text, limit):
+        """
+        Searches the names equal to the text ignoring the case, then the
+        names (or any of their words) starting with the text and then the
+        names similar to the text.
+
+        Return Value:
+            returns a list of at most limit (key, kind, similarity) tuples,
+            kind is one of EXACT, PREFIX and SIMILAR, best matches first.
+        """
+        folded = text.casefold()
+        with self._lock:
+            matches = dict()
+            start = bisect.bisect_left(self._prefixes, (folded,))
+            for index in range(start, len(self._prefixes)):
+                prefix, key = self._prefixes[index]
+                if not prefix.startswith(folded):
+                    break
+                kind = NameIndex.EXACT if self._names[key] == folded else NameIndex.PREFIX
+                if matches.get(key, (0,))[0] < kind:
+                    matches[key] = (kind, 1.0)
+            trigrams = NameIndex.trigrams(folded)
+            shared = dict()
+            for trigram in trigrams:
+                for key in self._trigrams.get(trigram, ()):
+                    shared[key] = shared.get(key, 0) + 1
+            # a name sharing count trigrams cannot be more similar than
+            # count / len(trigrams), whichever of its words is compared.
+            minimum = self.threshold * len(trigrams)
+            for key, count in shared.items():
+                if count < minimum or key in matches:
+                    continue
+                similarity = NameIndex.similarity(trigrams, self._names[key])
+                if similarity >= self.threshold:
+                    matches[key] = (NameIndex.SIMILAR, similarity)
+            ranked = sorted(matches.items(), key=lambda item: (
+                -item[1][0], -item[1][1], self._names[item[0]], item[0]))
+        return [(key, kind, similarity) for key, (kind, similarity) in ranked[:limit]]
+
+    def trigrams(text):
+        """
+        Return Value:
+            returns the set of trigrams of the words of the text, every word
+            is padded with two spaces in front and one at the end.
+        """
+        trigrams = set()
+        for word in text.split():
+            padded = f"  {word} "
+            for index in range(len(padded) - 2):
+                trigrams.add(padded[index:index + 3])
+        return trigrams
+
+    def similarity(trigrams, name):
+        """
+        Return Value:
+            returns the similarity, between 0 and 1, of the trigrams of a
+            searched text to the name, the higher of the share of trigrams in
+            common with the whole name and with its closest word.
+        """
+        best = 0.0
+        for text in [name] + name.split():
+            other = NameIndex.trigrams(text)
+            shared = len(trigrams & other)
+            if shared > 0:
+                best = max(best, shared / (len(trigrams) + len(other) - shared))
+        return best
+
+    def _prefix_entries(folded):
+        entries = {folded}
+        words = folded.split()
+        for index in range(1, len(words)):
+            entries.add(" ".join(words[index:]))
+        return entries
+
+    def _remove(self, key):
+        folded = self._names.pop(key, None)
+        if folded is None:
+            return
+        for prefix in NameIndex._prefix_entries(folded):
+            index = bisect.bisect_left(self._prefixes, (prefix, key))
+            if index < len(self._prefixes) and self._prefixes[index] == (prefix, key):
+                del self._prefixes[index]
+        for trigram in NameIndex.trigrams(folded):
+            keys = self._trigrams.get(trigram)
+            if keys is not None:
+                keys.discard(key)
+                if len(keys) == 0:
+                    del self._trigrams[trigram]
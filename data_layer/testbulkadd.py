@@ -0,0 +1,16 @@
+from hr import Designation, HRDLHandler, DataLayerError
+import sys
+
+try:
+    designations = [Designation(0, title) for title in sys.argv[1:]]
+    result = HRDLHandler.add_designations(designations)
+    for designation, code in zip(designations, result.ids):
+        if code is not None:
+            print(f"Designation : {designation.title} added with code {code}")
+    for index, dle in result.errors.items():
+        print(f"Designation : {designations[index].title} not added")
+        print(dle.message)
+        print(dle.exceptions)
+except DataLayerError as dle:
+    print(dle.message)
+    print(dle.exceptions)
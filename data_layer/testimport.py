@@ -0,0 +1,46 @@
+from hr import HRDLHandler, DataLayerError
+from validation import BatchValidator
+import csv
+import sys
+
+"""
+It is used to import the employees of a CSV file, whose rows are the
+name, designation code, date, month, year of birth, basic salary, gender,
+indian (1 or 0), PAN number and Aadhar number, validated all at once
+"""
+
+try:
+    with open(sys.argv[1], newline="") as csvFile:
+        rows = [row for row in csv.reader(csvFile) if len(row) > 0]
+    columns = [list(column) for column in zip(*rows)] or [list()] * 10
+    names, pans, aadhars, genders = columns[0], columns[8], columns[9], columns[6]
+    integers = list()
+    for column in (columns[1], columns[2], columns[3], columns[4], columns[7]):
+        integers.append([int(value) if value.strip().lstrip("-").isdigit() else value
+                         for value in column])
+    salaries = list()
+    for value in columns[5]:
+        try:
+            salaries.append(float(value))
+        except ValueError:
+            salaries.append(value)
+    employees, exceptions = BatchValidator.make_employees([0] * len(rows), names, integers[0], integers[1], integers[2],
+                                                          integers[3], salaries, genders, integers[4], pans, aadhars)
+    for index, exception in exceptions.items():
+        print(f"Row {index + 1} : {names[index]} not imported")
+        print(exception)
+    valid = [employee for employee in employees if employee is not None]
+    result = HRDLHandler.add_employees(valid)
+    for employee, emp_id in zip(valid, result.ids):
+        if emp_id is not None:
+            print(f"Employee : {employee.name} added with ID {emp_id}")
+    for index, dle in result.errors.items():
+        print(f"Employee : {valid[index].name} not added")
+        print(dle.message)
+        print(dle.exceptions)
+except (OSError, IndexError) as error:
+    print("Usage : python testimport.py <employees.csv>")
+    print(error)
+except DataLayerError as dle:
+    print(dle.message)
+    print(dle.exceptions)
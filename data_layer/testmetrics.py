@@ -0,0 +1,23 @@
+from hr import HRDLHandler, DataLayerError
+from metrics import Metrics
+import sys
+
+"""
+It is used to time the reads of the Data Layer, repeated as many times
+as given, and to print the histograms of their calls and phases
+"""
+
+try:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    for i in range(repeat):
+        HRDLHandler.get_designations()
+        HRDLHandler.get_employees_page()
+        for employee in HRDLHandler.get_employees()[:10]:
+            HRDLHandler.get_employee_by_id(employee.emp_id)
+    for operation, metrics in Metrics.snapshot().items():
+        print(f"{operation} : {metrics['calls']['count']} calls, {metrics['errors']} errors")
+        for phase, histogram in [("total", metrics["calls"])] + list(metrics["phases"].items()):
+            print(f"    {phase:8} p50 {histogram['p50'] * 1000:.3f}ms p95 {histogram['p95'] * 1000:.3f}ms p99 {histogram['p99'] * 1000:.3f}ms max {histogram['max'] * 1000:.3f}ms")
+except DataLayerError as dle:
+    print(dle.message)
+    print(dle.exceptions)
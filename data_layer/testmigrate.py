@@ -0,0 +1,15 @@
+from hr import DataLayerError
+from schema import SchemaManager
+
+"""
+It is used to create the tables and indexes of the DataBase, applying
+only the migrations which are not applied yet
+"""
+
+try:
+    applied = SchemaManager.migrate()
+    print(f"Migrations applied now : {applied}")
+    print(f"Migrations applied in all : {SchemaManager.get_applied_versions()}")
+except DataLayerError as dle:
+    print(dle.message)
+    print(dle.exceptions)
@@ -0,0 +1,23 @@
+from hr import HRDLHandler, DataLayerError, Transaction
+import sys
+
+"""
+It is used to move all the Employees of a Designation to another
+Designation and delete the former, as a single transaction
+"""
+
+try:
+    old_code = int(sys.argv[1])
+    new_code = int(sys.argv[2])
+    with Transaction():
+        moved = 0
+        for employee in HRDLHandler.get_employees():
+            if employee.designation_code == old_code:
+                employee.designation_code = new_code
+                HRDLHandler.update_employee(employee)
+                moved += 1
+        HRDLHandler.delete_designation(old_code)
+    print(f"{moved} Employees moved to Designation Code : {new_code}, Designation Code : {old_code} deleted")
+except DataLayerError as dle:
+    print(dle.message)
+    print(dle.exceptions)
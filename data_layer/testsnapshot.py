@@ -0,0 +1,15 @@
+from hr import HRDLHandler, DataLayerError
+import sys
+
+"""
+It is used to save all the Designations and Employees to a snapshot
+file, which a server of the Memory architecture loads its tables from
+"""
+
+try:
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    HRDLHandler.save_snapshot(path)
+    print(f"{HRDLHandler.get_designation_count()} Designations and {HRDLHandler.get_employee_count()} Employees saved")
+except DataLayerError as dle:
+    print(dle.message)
+    print(dle.exceptions)
@@ -0,0 +1,257 @@
+from array import array
+from calendar import monthrange
+from itertools import repeat
+try:
+    from data_layer.hr import Designation, Employee, DesignationRegistry, DataLayerError
+except ImportError:
+    # imported as a script module from within the data_layer folder.
+    from hr import Designation, Employee, DesignationRegistry, DataLayerError
+
+"""
+It is a module of the Data Layer that validates many Designation and
+Employee entries at once, for the bulk imports.
+The entries are given as columns, a list per entry, and every rule of
+Designation._validate_values and Employee._validate_values is checked
+over a whole column at a time, with the builtin functions (all, map,
+min, max, set operations) doing the looping, the rows are looked at one
+by one only in the columns which have a failure.
+The outcome is a mask holding a bit per entry for every row, 0 for the
+valid rows, the messages are built only for the rows which failed.
+"""
+
+
+class BatchValidator:
+    """
+    A class which validates columns of Designation and Employee entries,
+    with the same rules (and messages) as the constructors.
+
+    Attributes:
+        the bits of the masks, one per entry:
+        CODE, TITLE for the designations.
+        EMP_ID, NAME, DESIGNATION_CODE, DOB, SALARY, GENDER, INDIAN,
+        PAN_NO, AADHAR for the employees.
+
+    Methods:
+        validate_designations(codes, titles): returns the mask.
+        validate_employees(emp_ids, names, ...): returns the mask.
+        make_designations(codes, titles): returns the Designation objects
+        and the exceptions of the rows which failed.
+        make_employees(emp_ids, names, ...): returns the Employee objects
+        and the exceptions of the rows which failed.
+    """
+    CODE = 1
+    TITLE = 2
+
+    EMP_ID = 1
+    NAME = 2
+    DESIGNATION_CODE = 4
+    DOB = 8
+    SALARY = 16
+    GENDER = 32
+    INDIAN = 64
+    PAN_NO = 128
+    AADHAR = 256
+
+    def validate_designations(codes, titles):
+        """
+        Validates the columns of designation entries, the columns are to
+        be of the same length.
+
+        Attributes:
+            codes(list): the codes, of int.
+            titles(list): the titles, of str.
+
+        Exception Raising:
+            raises DataLayerError exception, if the columns differ in length.
+
+        Return Value:
+            returns an array of unsigned short, one per row, holding the
+            CODE and TITLE bits of the entries which failed.
+        """
+        mask = BatchValidator._mask(codes, titles)
+        BatchValidator._check(mask, BatchValidator.CODE, codes, int,
+                              lambda column: min(column) >= 0, lambda code: code >= 0)
+        BatchValidator._check(mask, BatchValidator.TITLE, titles, str,
+                              BatchValidator._fits, lambda title: 0 < len(title) <= 35)
+        return mask
+
+    def validate_employees(emp_ids, names, designation_codes, dates, months, years, salaries, genders, indians, pan_nos, aadhars):
+        """
+        Validates the columns of employee entries, the columns are to be
+        of the same length. The designation codes are checked against the
+        DesignationRegistry, the date of birth is checked to be a date of
+        the calendar as well.
+
+        Attributes:
+            emp_ids(list): the employee IDs, of int.
+            names(list): the names, of str.
+            designation_codes(list): the designation codes, of int.
+            dates, months, years(list): the parts of the date of birth,
+            of int.
+            salaries(list): the salaries, of float.
+            genders(list): the genders, of str.
+            indians(list): the is_indian entries, of int.
+            pan_nos(list): the PAN numbers, of str.
+            aadhars(list): the Aadhar numbers, of str.
+
+        Exception Raising:
+            raises DataLayerError exception, if the columns differ in length.
+
+        Return Value:
+            returns an array of unsigned short, one per row, holding the
+            bits of the entries which failed.
+        """
+        mask = BatchValidator._mask(emp_ids, names, designation_codes, dates, months,
+                                    years, salaries, genders, indians, pan_nos, aadhars)
+        BatchValidator._check(mask, BatchValidator.EMP_ID, emp_ids, int,
+                              lambda column: min(column) >= 0, lambda emp_id: emp_id >= 0)
+        BatchValidator._check(mask, BatchValidator.NAME, names, str,
+                              BatchValidator._fits, lambda name: 0 < len(name) <= 35)
+        try:
+            designations = DesignationRegistry.lookup(designation_codes)
+        except DataLayerError:
+            designations = dict()
+        BatchValidator._check(mask, BatchValidator.DESIGNATION_CODE, designation_codes, int,
+                              lambda column: designations.keys() >= set(column), lambda code: code in designations)
+        BatchValidator._check_dob(mask, dates, months, years)
+        BatchValidator._check(mask, BatchValidator.SALARY, salaries, float,
+                              lambda column: min(column) > 0, lambda salary: salary > 0)
+        BatchValidator._check(mask, BatchValidator.GENDER, genders, str,
+                              lambda column: set(column) <= BatchValidator._GENDERS, lambda gender: gender in BatchValidator._GENDERS)
+        BatchValidator._check(mask, BatchValidator.INDIAN, indians, int,
+                              lambda column: set(column) <= BatchValidator._INDIANS, lambda indian: indian in BatchValidator._INDIANS)
+        BatchValidator._check(mask, BatchValidator.PAN_NO, pan_nos, str,
+                              lambda column: set(map(len, column)) == {10}, lambda pan_no: len(pan_no) == 10)
+        BatchValidator._check(mask, BatchValidator.AADHAR, aadhars, str,
+                              lambda column: set(map(len, column)) == {10}, lambda aadhar: len(aadhar) == 10)
+        return mask
+
+    def make_designations(codes, titles):
+        """
+        Validates the columns of designation entries and creates the
+        Designation objects of the valid rows without validating them
+        again.
+
+        Exception Raising:
+            raises DataLayerError exception, if the columns differ in length.
+
+        Return Value:
+            returns a tuple of the list of Designation objects, None for
+            the rows which failed, and a dictionary of the exceptions of
+            every row which failed (as in Designation.exceptions), keyed
+            by its position.
+        """
+        mask = BatchValidator.validate_designations(codes, titles)
+        designations = list()
+        exceptions = dict()
+        for index, failed in enumerate(mask):
+            if failed:
+                designations.append(None)
+                exceptions[index] = Designation(
+                    codes[index], titles[index]).exceptions
+            else:
+                designations.append(Designation._from_row(
+                    (codes[index], titles[index])))
+        return designations, exceptions
+
+    def make_employees(emp_ids, names, designation_codes, dates, months, years, salaries, genders, indians, pan_nos, aadhars):
+        """
+        Validates the columns of employee entries and creates the Employee
+        objects of the valid rows without validating them again, ready for
+        HRDLHandler.add_employees.
+
+        Exception Raising:
+            raises DataLayerError exception, if the columns differ in length.
+
+        Return Value:
+            returns a tuple of the list of Employee objects, None for the
+            rows which failed, and a dictionary of the exceptions of every
+            row which failed (as in Employee.exceptions), keyed by its
+            position.
+        """
+        columns = (emp_ids, names, designation_codes, dates, months,
+                   years, salaries, genders, indians, pan_nos, aadhars)
+        mask = BatchValidator.validate_employees(*columns)
+        employees = list()
+        exceptions = dict()
+        for index, row in enumerate(zip(*columns)):
+            if mask[index]:
+                employees.append(None)
+                exceptions[index] = BatchValidator._employee_exceptions(
+                    row, mask[index])
+            else:
+                employees.append(Employee._from_values(*row))
+        return employees, exceptions
+
+    _GENDERS = frozenset("MmFf")
+    _INDIANS = frozenset((0, 1))
+
+    def _mask(*columns):
+        size = len(columns[0])
+        for column in columns:
+            if len(column) != size:
+                raise DataLayerError(
+                    message=f"The columns differ in length, found {len(column)} rows, expected {size}")
+        return array('H', bytes(2 * size))
+
+    def _fits(column):
+        lengths = list(map(len, column))
+        return min(lengths) > 0 and max(lengths) <= 35
+
+    def _check(mask, bit, column, kind, column_valid, value_valid):
+        """
+        Sets the bit of the rows whose entry is not of the kind or is not
+        valid. The whole column is checked at once when all its entries
+        are of the kind, the entries are looked at one by one only when
+        the column has a failure.
+        """
+        if len(column) == 0:
+            return
+        if all(map(isinstance, column, repeat(kind))):
+            if column_valid(column):
+                return
+            failed = [index for index, value in enumerate(column)
+                      if not value_valid(value)]
+        else:
+            failed = [index for index, value in enumerate(column)
+                      if not isinstance(value, kind) or not value_valid(value)]
+        for index in failed:
+            mask[index] |= bit
+
+    def _check_dob(mask, dates, months, years):
+        if len(dates) == 0:
+            return
+        if all(map(isinstance, dates, repeat(int))) and all(map(isinstance, months, repeat(int))) and all(map(isinstance, years, repeat(int))) \
+                and min(dates) > 0 and max(dates) <= 31 and min(months) > 0 and max(months) <= 12 and min(years) > 1950 and max(years) <= 2020:
+            # only the days past the 28th can be beyond the end of the month.
+            failed = [index for index, date in enumerate(dates)
+                      if date > 28 and date > monthrange(years[index], months[index])[1]]
+        else:
+            failed = [index for index, (date, month, year) in enumerate(zip(dates, months, years))
+                      if not BatchValidator._valid_dob(date, month, year)]
+        for index in failed:
+            mask[index] |= BatchValidator.DOB
+
+    def _valid_dob(date, month, year):
+        if not isinstance(date, int) or not isinstance(month, int) or not isinstance(year, int):
+            return False
+        if date <= 0 or date > 31 or month <= 0 or month > 12 or year <= 1950 or year > 2020:
+            return False
+        return date <= monthrange(year, month)[1]
+
+    def _employee_exceptions(row, failed):
+        """
+        Builds the exceptions of a row which failed, with the messages of
+        Employee._validate_values.
+        """
+        try:
+            exceptions = Employee(*row).exceptions
+        except ValueError:
+            # a date past the end of its month, Employee validates the
+            # parts of the date one by one.
+            exceptions = dict()
+        if failed & BatchValidator.DOB and "dob" not in exceptions:
+            date, month, year = row[3:6]
+            exceptions["dob"] = (
+                'V', f"Invalid Date of Birth : {date}/{month}/{year}, there is no such date")
+        return exceptions
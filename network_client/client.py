@@ -1,55 +1,171 @@
 import sys
 from network_client.config import Configuration
 from network_common.wrappers import Request, Response
+from network_common.protocol import send_message, receive_message, send_frame, receive_frame, negotiate, set_no_delay
 import socket
+import time
 
 
 class NetworkClient:
     """
     A class which enables socket programming
     and controls the client-side of the network programming.
+    The connection to the server is kept alive and reused by the
+    following requests, a connection found closed by the server (after
+    it stayed idle for too long) before the request is sent is opened
+    again. A request is never sent twice, as the server may have run it
+    already, a connection which breaks once the request is sent fails
+    the request.
+    The messages are sent in the compact binary framing, negotiated when
+    the connection is opened (refer protocol module of network_common). A
+    server which turns the hello away, or does not answer it within
+    negotiation_timeout seconds, is taken to be an older one: the client
+    connects again in the legacy framing and keeps to it for the
+    connections it opens in the next negotiation_retry seconds, after
+    which it asks again (the server may have been upgraded, or merely
+    slow to answer).
+
+    Arguments:
+        keep_alive(bool): whether the connection is kept for the next
+        request, or closed after every response.
+            default is True
+        binary(bool): whether the compact framing is asked for.
+            default is True
+        negotiation_timeout(float): the seconds to wait for the server to
+        answer the negotiation.
+            default is 2.0
+        negotiation_retry(float): the seconds for which the legacy framing
+        is used once the negotiation failed.
+            default is 60.0
 
     Method:
         send(request): This method takes the request object and sends
         it to the server and then receives the response from the server.
+        close: closes the connection kept alive, if any.
     """
 
-    def __init__(self):
+    def __init__(self, keep_alive=True, binary=True, negotiation_timeout=2.0, negotiation_retry=60.0):
         self.server_configuration = Configuration()
         self.server_configuration._obj._validate_values()
         if self.server_configuration._obj.has_exceptions:
             for exception in self.server_configuration._obj.exceptions.values():
                 print(exception[1])
             sys.exit()  # needs to be converted to code raises exceptions.
+        self.keep_alive = keep_alive
+        self.binary = binary
+        self.negotiation_timeout = negotiation_timeout
+        self.negotiation_retry = negotiation_retry
+        self._legacy_until = None
+        self._socket = None
+        self._version = None
+        self._request_id = 0
 
     def send(self, request):
         """
-        It connects the client socket to the server socket and sends
-        request to it while receiving the response.
+        It connects the client socket to the server socket, unless it is
+        connected already, and sends request to it while receiving the
+        response.
         It receives a response(JSON String) and then converts it into a Response class
         object.
+        A connection which was kept alive is checked before the request
+        is sent, a new one is opened if the server has closed it.
+
+        Raises:
+            OSError:
+                if the server cannot be reached or the connection breaks.
 
         Return Value:
             returns a Response class object.
         """
-        client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        client_socket.connect((self.server_configuration._obj.host, self.server_configuration._obj.port))
         request_data = request.to_json()
-        client_socket.sendall(bytes(str(len(request_data)).ljust(1024), encoding="utf-8"))
-        client_socket.sendall(bytes(request_data, encoding="utf-8"))
-        databytes = b""
-        to_recieve = 1024
-        while len(databytes) < to_recieve:
-            dbytes = client_socket.recv(to_recieve - len(databytes))
-            databytes += dbytes
-        response_data_length = int(databytes.decode("utf-8").strip())
-        databytes = b""
-        to_recieve = response_data_length
-        while len(databytes) < to_recieve:
-            dbytes = client_socket.recv(to_recieve - len(databytes))
-            databytes += dbytes
-        response_data = databytes.decode("utf-8")
-        client_socket.shutdown(socket.SHUT_RDWR)
-        client_socket.close()
+        if self._socket is not None and not self._is_open():
+            self.close()
+        if self._socket is None:
+            self._socket = self._connect()
+        try:
+            response_data = self._exchange(request_data)
+        except (OSError, ValueError):
+            self.close()
+            raise
+        if not self.keep_alive:
+            self.close()
         response = Response.from_json(response_data)
         return response
+
+    def close(self):
+        """
+        Closes the connection kept alive, the next request opens a new one.
+        """
+        client_socket = self._socket
+        self._socket = None
+        if client_socket is None:
+            return
+        try:
+            client_socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        client_socket.close()
+
+    def _is_open(self):
+        """
+        Tells whether the connection kept alive can take the next request,
+        without waiting: the server sends nothing in between two requests,
+        hence anything readable is the end of the connection (or data out
+        of step with the requests).
+        """
+        self._socket.setblocking(False)
+        try:
+            self._socket.recv(1, socket.MSG_PEEK)
+            return False
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        finally:
+            try:
+                self._socket.setblocking(True)
+            except OSError:
+                pass
+
+    def _exchange(self, request_data):
+        if self._version is None:
+            send_message(self._socket, request_data)
+            response_data = receive_message(self._socket)
+            if response_data is None:
+                raise ConnectionError("connection closed by the server")
+            return response_data
+        self._request_id = (self._request_id + 1) % 2**32
+        send_frame(self._socket, request_data,
+                   self._request_id, version=self._version)
+        frame = receive_frame(self._socket)
+        if frame is None:
+            raise ConnectionError("connection closed by the server")
+        if frame[1] != self._request_id:
+            raise ValueError(
+                f"response to request {frame[1]} received, expected {self._request_id}")
+        return frame[2]
+
+    def _connect(self):
+        address = (self.server_configuration._obj.host,
+                   self.server_configuration._obj.port)
+        client_socket = socket.create_connection(address)
+        set_no_delay(client_socket)
+        self._version = None
+        if not self.binary or (self._legacy_until is not None and time.monotonic() < self._legacy_until):
+            return client_socket
+        try:
+            client_socket.settimeout(self.negotiation_timeout)
+            self._version = negotiate(client_socket)
+            client_socket.settimeout(None)
+            self._legacy_until = None
+            return client_socket
+        except (socket.timeout, ConnectionError, ValueError):
+            # an older server, which fails on the hello or does not answer.
+            client_socket.close()
+            self._legacy_until = time.monotonic() + self.negotiation_retry
+        except OSError:
+            client_socket.close()
+            raise
+        client_socket = socket.create_connection(address)
+        set_no_delay(client_socket)
+        return client_socket
@@ -0,0 +1,409 @@
+import json
+import time
+import socket
+import struct
+import asyncio
+
+"""
+A module that holds the framing of the messages exchanged between the
+server and the client: every message (a JSON String) is preceded by a
+header of HEADER_SIZE bytes holding its length in bytes, as ASCII digits
+padded with spaces.
+A connection may carry any number of request/response exchanges (keep
+alive), the peer which is done simply closes it in between two messages.
+A client which closes the connection after its first response, as the
+older clients do, is served just the same.
+The functions work upon blocking sockets, read_message reads from the
+stream of an asyncio server.
+
+The clients which know of it speak the compact framing instead: every
+message is preceded by a binary header of FRAME_HEADER.size bytes, the
+MAGIC, the version of the framing, the flags, the ID of the request
+(echoed back in its response) and the length of the message in bytes.
+A client asks for it at connect time with a hello, a legacy message
+offering the version it speaks (a Request of the "protocol" manager, which
+an older server turns away), and the server answers with a FLAG_HELLO
+frame (with an empty message) of the version agreed upon. The server
+tells the two framings apart by the first bytes of every message (a
+legacy header starts with a digit), hence the older clients are served
+as they were, refer receive_request and send_response.
+"""
+
+HEADER_SIZE = 1024
+
+MAGIC = b"\x89HRF"
+VERSION = 1
+FLAG_HELLO = 1
+# magic, version, flags, request id, length
+FRAME_HEADER = struct.Struct("!4sBBII")
+# the start of the hello, refer encode_hello.
+HELLO_PREFIX = '{"manager": "protocol", "action": "hello"'
+
+
+def send_message(connection, message):
+    """
+    Sends the message, preceded by its header, in a single write so that
+    a connection kept alive does not wait on the acknowledgement of the
+    header before the message goes out.
+
+    Arguments:
+        connection(socket.socket): the connected socket.
+        message(str): the JSON String to be sent.
+
+    Raises:
+        OSError:
+            if the connection is broken.
+    """
+    connection.sendall(encode_message(message))
+
+
+def encode_message(message):
+    """
+    Return Value:
+        returns the bytes of the message preceded by its header.
+    """
+    data = message.encode("utf-8")
+    return str(len(data)).ljust(HEADER_SIZE).encode("utf-8") + data
+
+
+def receive_message(connection):
+    """
+    Receives the next message of the connection.
+
+    Arguments:
+        connection(socket.socket): the connected socket.
+
+    Raises:
+        ConnectionError:
+            if the connection is closed in the middle of a message.
+        ValueError:
+            if the header does not hold a length.
+        OSError:
+            if the connection is broken or times out (socket.timeout).
+
+    Return Value:
+        returns the message as a str, None if the peer closed the
+        connection before the message began.
+    """
+    header = _receive_exactly(connection, HEADER_SIZE)
+    if header is None:
+        return None
+    length = int(header.decode("utf-8").strip())
+    data = _receive_exactly(connection, length)
+    if data is None and length > 0:
+        raise ConnectionError("connection closed before the message ended")
+    return (data or b"").decode("utf-8")
+
+
+async def read_message(reader, timeout=None):
+    """
+    Reads the next message of the stream of an asyncio connection.
+
+    Arguments:
+        reader(asyncio.StreamReader): the stream of the connection.
+        timeout(float): the seconds to wait for the message to begin and
+        then to end.
+            default is None(NoneType), waits for ever
+
+    Raises:
+        ConnectionError:
+            if the connection is closed in the middle of a message.
+        ValueError:
+            if the header does not hold a length.
+        asyncio.TimeoutError:
+            if the message does not arrive within the timeout.
+
+    Return Value:
+        returns the message as a str, None if the peer closed the
+        connection before the message began.
+    """
+    try:
+        header = await asyncio.wait_for(reader.readexactly(HEADER_SIZE), timeout)
+    except asyncio.IncompleteReadError as error:
+        if len(error.partial) == 0:
+            return None
+        raise ConnectionError("connection closed before the message ended")
+    length = int(header.decode("utf-8").strip())
+    try:
+        data = await asyncio.wait_for(reader.readexactly(length), timeout)
+    except asyncio.IncompleteReadError:
+        raise ConnectionError("connection closed before the message ended")
+    return data.decode("utf-8")
+
+
+def encode_frame(message, request_id, flags=0, version=VERSION):
+    """
+    Return Value:
+        returns the bytes of the message preceded by its binary header.
+    """
+    data = message.encode("utf-8")
+    return FRAME_HEADER.pack(MAGIC, version, flags, request_id, len(data)) + data
+
+
+def send_frame(connection, message, request_id, flags=0, version=VERSION):
+    """
+    Sends the message, preceded by its binary header, in a single write.
+
+    Arguments:
+        connection(socket.socket): the connected socket.
+        message(str): the JSON String to be sent.
+        request_id(int): the ID of the request, from 0 to 2**32 - 1.
+        flags(int): the flags of the frame.
+            default is 0
+        version(int): the version of the framing agreed upon.
+            default is VERSION
+
+    Raises:
+        OSError:
+            if the connection is broken.
+    """
+    connection.sendall(encode_frame(message, request_id, flags, version))
+
+
+def receive_frame(connection):
+    """
+    Receives the next frame of the connection.
+
+    Raises:
+        ConnectionError:
+            if the connection is closed in the middle of a frame.
+        ValueError:
+            if the frame does not start with the MAGIC, or is of a version
+            not supported.
+        OSError:
+            if the connection is broken or times out (socket.timeout).
+
+    Return Value:
+        returns a tuple of the flags, the request ID and the message (str)
+        of the frame, None if the peer closed the connection before the
+        frame began.
+    """
+    header = _receive_exactly(connection, FRAME_HEADER.size)
+    if header is None:
+        return None
+    version, flags, request_id, length = _unpack_frame_header(header)
+    return flags, request_id, _receive_rest(connection, length).decode("utf-8")
+
+
+def encode_hello(version=VERSION):
+    """
+    Return Value:
+        returns the bytes of the hello of a client offering the version of
+        the compact framing, a legacy message.
+    """
+    return encode_message(HELLO_PREFIX + ', "json_string": ' +
+                          json.dumps(json.dumps({"version": version})) + "}")
+
+
+def negotiate(connection):
+    """
+    Asks the server, on a connection just opened, for the compact framing.
+
+    Raises:
+        ConnectionError:
+            if the server closes the connection instead of answering.
+        ValueError:
+            if the answer is not a FLAG_HELLO frame.
+        OSError:
+            if the connection is broken or times out (socket.timeout), an
+            older server does not answer at all.
+
+    Return Value:
+        returns the version of the framing agreed upon.
+    """
+    connection.sendall(encode_hello())
+    header = _receive_exactly(connection, FRAME_HEADER.size)
+    if header is None:
+        raise ConnectionError("connection closed by the server")
+    version, flags, request_id, length = _unpack_frame_header(header)
+    _receive_rest(connection, length)
+    if not flags & FLAG_HELLO:
+        raise ValueError("the server did not answer the hello")
+    return version
+
+
+def receive_request(connection, timeout=None):
+    """
+    Receives the next message of the connection, in either framing, and
+    answers it if it is a hello, so that the caller may watch the
+    connection again until the request comes.
+
+    Arguments:
+        connection(socket.socket): the connected socket.
+        timeout(float): the seconds within which the whole message is to
+        arrive, however slowly its bytes trickle in, the server calls it
+        once the connection is readable, hence once the message began.
+            default is None(NoneType), waits for ever
+
+    Raises:
+        ConnectionError:
+            if the connection is closed in the middle of a message.
+        ValueError:
+            if the message is framed in neither way.
+        OSError:
+            if the connection is broken or the message takes longer than
+            timeout (socket.timeout).
+
+    Return Value:
+        returns a tuple of the message (str), None for an answered hello,
+        and the ID of the request, None for the legacy framing, or None if
+        the peer closed the connection before the message began.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    start = _receive_exactly(connection, len(MAGIC), deadline)
+    if start is None:
+        return None
+    if start != MAGIC:
+        header = start + _receive_rest(connection, HEADER_SIZE - len(MAGIC), deadline)
+        length = int(header.decode("utf-8").strip())
+        message = _receive_rest(connection, length, deadline).decode("utf-8")
+        version = _hello_version(message)
+        if version is None:
+            return message, None
+        send_frame(connection, "", 0, FLAG_HELLO, version)
+        return None, None
+    header = start + _receive_rest(connection, FRAME_HEADER.size - len(MAGIC), deadline)
+    version, flags, request_id, length = _unpack_frame_header(header)
+    data = _receive_rest(connection, length, deadline)
+    return data.decode("utf-8"), request_id
+
+
+def send_response(connection, message, request_id):
+    """
+    Sends the response to a request received by receive_request, in the
+    framing of the request.
+    """
+    connection.sendall(encode_response(message, request_id))
+
+
+def encode_response(message, request_id):
+    """
+    Return Value:
+        returns the bytes of the response to a request of the ID, in the
+        framing of the request (legacy if the ID is None).
+    """
+    if request_id is None:
+        return encode_message(message)
+    return encode_frame(message, request_id)
+
+
+async def read_request(reader, writer, timeout=None, message_timeout=None):
+    """
+    Reads the next request of the stream of an asyncio connection, in
+    either framing, and answers the hellos on the way (refer
+    receive_request).
+
+    Arguments:
+        reader(asyncio.StreamReader): the stream of the connection.
+        writer(asyncio.StreamWriter): the stream the answers are written to.
+        timeout(float): the seconds to wait for a message to begin.
+            default is None(NoneType), waits for ever
+        message_timeout(float): the seconds within which the rest of a
+        message which began is to arrive.
+            default is None(NoneType), waits for ever
+
+    Raises:
+        ConnectionError, ValueError, asyncio.TimeoutError
+
+    Return Value:
+        returns a tuple of the message (str) and the ID of the request,
+        None for the legacy framing, or None if the peer closed the
+        connection before the message began.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def read(size, deadline):
+        remaining = None if deadline is None else max(0.0, deadline - loop.time())
+        try:
+            return await asyncio.wait_for(reader.readexactly(size), remaining)
+        except asyncio.IncompleteReadError:
+            raise ConnectionError("connection closed before the message ended")
+
+    while True:
+        try:
+            start = await asyncio.wait_for(reader.readexactly(1), timeout)
+        except asyncio.IncompleteReadError:
+            return None
+        deadline = None if message_timeout is None else loop.time() + message_timeout
+        start += await read(len(MAGIC) - 1, deadline)
+        if start != MAGIC:
+            header = start + await read(HEADER_SIZE - len(MAGIC), deadline)
+            length = int(header.decode("utf-8").strip())
+            message = (await read(length, deadline)).decode("utf-8")
+            version = _hello_version(message)
+            if version is None:
+                return message, None
+            writer.write(encode_frame("", 0, FLAG_HELLO, version))
+            await writer.drain()
+            continue
+        header = start + await read(FRAME_HEADER.size - len(MAGIC), deadline)
+        version, flags, request_id, length = _unpack_frame_header(header)
+        data = await read(length, deadline)
+        return data.decode("utf-8"), request_id
+
+
+def set_no_delay(connection):
+    """
+    Disables the coalescing of small writes (Nagle's algorithm) on the
+    connection, every message is a single write already and a connection
+    kept alive would otherwise wait for the previous acknowledgement.
+    """
+    try:
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError:
+        pass
+
+
+def _receive_exactly(connection, size, deadline=None):
+    # returns None if the connection is closed before the first byte, the
+    # socket waits no longer than the deadline (time.monotonic) if given.
+    chunks = list()
+    received = 0
+    while received < size:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout("the message took too long to arrive")
+            connection.settimeout(remaining)
+        chunk = connection.recv(min(size - received, 65536))
+        if not chunk:
+            if received == 0:
+                return None
+            raise ConnectionError(
+                "connection closed before the message ended")
+        chunks.append(chunk)
+        received += len(chunk)
+    return b"".join(chunks)
+
+
+def _receive_rest(connection, size, deadline=None):
+    # the part of a message which has begun already.
+    data = _receive_exactly(connection, size, deadline)
+    if data is None:
+        if size == 0:
+            return b""
+        raise ConnectionError("connection closed before the message ended")
+    return data
+
+
+def _unpack_frame_header(header):
+    magic, version, flags, request_id, length = FRAME_HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("the frame does not start with the magic bytes")
+    if version == 0 or version > VERSION:
+        raise ValueError(f"version {version} of the framing is not supported")
+    return version, flags, request_id, length
+
+
+def _hello_version(message):
+    # the version agreed upon if the legacy message is a hello (the one
+    # offered, or an earlier one), None if it is a request.
+    if not message.startswith(HELLO_PREFIX):
+        return None
+    try:
+        version = json.loads(json.loads(message)["json_string"])["version"]
+    except (KeyError, TypeError):
+        raise ValueError("the hello does not offer a version")
+    if not isinstance(version, int) or version < 1:
+        raise ValueError(f"the hello offers version {version} of the framing")
+    return min(version, VERSION)
@@ -164,6 +164,9 @@ def object_converter(self):
     if isinstance(self, decimal.Decimal):
         self = float(self)
         return Wrapper(self).__dict__
+    if hasattr(self, "to_dict"):
+        # the objects of the data layer have no __dict__ (__slots__).
+        return self.to_dict()
     return self.__dict__
 
 
@@ -210,3 +213,179 @@ class ListHandler:
         l1 = list(map(lambda dictionary: eval(
             f"{name}(**{dictionary})"), new_dict["lst"]))
         return l1
+
+
+class PageRequest:
+    """
+    A class that asks the server for one page of a listing.
+
+    Attributes:
+        cursor(str): the cursor of the page as returned by the server
+        in a PageHandler.
+            default value is None(NoneType), for the first page
+        page_size(int): the maximum number of entries in the page.
+            default value is None(NoneType), for the server's default
+
+    Method:
+        to_json: converts the active PageRequest object into a JSON String.
+        from_json: converts the given JSON String into a PageRequest object.
+    """
+
+    def __init__(self, cursor=None, page_size=None):
+        self.cursor = cursor
+        self.page_size = page_size
+
+    def to_json(self):
+        """
+        converts the active PageRequest object into a JSON String.
+
+        Return Value: return a JSON String.
+        """
+        return json.dumps(self.__dict__, indent=4)
+
+    def from_json(json_string):
+        """
+        converts the given JSON String into a PageRequest object.
+
+        Attributes:
+            json_string(str): the JSON String that is to be converted.
+
+        Return Value: return a PageRequest object.
+        """
+        new_dict = json.loads(json_string)
+        return PageRequest(new_dict.get("cursor"), new_dict.get("page_size"))
+
+
+class SearchRequest:
+    """
+    A class that asks the server for the employees matching a name.
+
+    Attributes:
+        name(str): the name, or a part of it, to be searched.
+        limit(int): the maximum number of employees to be returned.
+            default value is None(NoneType), for the server's default
+
+    Method:
+        to_json: converts the active SearchRequest object into a JSON String.
+        from_json: converts the given JSON String into a SearchRequest object.
+    """
+
+    def __init__(self, name, limit=None):
+        self.name = name
+        self.limit = limit
+
+    def to_json(self):
+        """
+        converts the active SearchRequest object into a JSON String.
+
+        Return Value: return a JSON String.
+        """
+        return json.dumps(self.__dict__, indent=4)
+
+    def from_json(json_string):
+        """
+        converts the given JSON String into a SearchRequest object.
+
+        Attributes:
+            json_string(str): the JSON String that is to be converted.
+
+        Return Value: return a SearchRequest object.
+        """
+        new_dict = json.loads(json_string)
+        return SearchRequest(new_dict.get("name"), new_dict.get("limit"))
+
+
+class PageHandler:
+    """
+    A class that converts one page of a listing, along with the cursors
+    of the pages around it, into JSON String and vise-versa.
+
+    Attributes:
+        lst(list): the objects of the page.
+        next_cursor(str): the cursor of the following page.
+            default value is None(NoneType), when there is no following page
+        previous_cursor(str): the cursor of the preceding page.
+            default value is None(NoneType), when there is no preceding page
+
+    Method:
+        to_json: converts the active PageHandler object into a JSON String.
+        from_json: converts the given JSON String into it's corresponding
+        PageHandler object.
+    """
+
+    def __init__(self, lst, next_cursor=None, previous_cursor=None):
+        self.name = type(lst[0]).__name__ if len(lst) > 0 else None
+        self.lst = lst
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def to_json(self):
+        """
+        converts the active PageHandler object into a JSON String.
+
+        Return Value: return a JSON String.
+        """
+        return json.dumps(self, indent=4, default=object_converter)
+
+    def from_json(json_string):
+        """
+        converts the given JSON String into it's corresponding
+        PageHandler object, whose lst holds Designation/Employee objects.
+
+        Attributes:
+            json_string(str): the JSON String that is to be converted.
+
+        Return Value: return a PageHandler object.
+        """
+        new_dict = json.loads(json_string)
+        classes = {"Designation": Designation, "Employee": Employee}
+        lst = list()
+        if new_dict["name"] is not None:
+            lst = [classes[new_dict["name"]](**dictionary)
+                   for dictionary in new_dict["lst"]]
+        return PageHandler(lst, new_dict["next_cursor"], new_dict["previous_cursor"])
+
+
+class StatsHandler:
+    """
+    A class that converts the counts of the entries kept by the server
+    into JSON String and vise-versa.
+
+    Attributes:
+        employees(int): the number of employees.
+        designations(int): the number of designations.
+        headcounts(dict): the number of employees of every designation,
+        keyed by the designation code.
+
+    Method:
+        to_json: converts the active StatsHandler object into a JSON String.
+        from_json: converts the given JSON String into a StatsHandler object.
+    """
+
+    def __init__(self, employees, designations, headcounts):
+        self.employees = employees
+        self.designations = designations
+        self.headcounts = headcounts
+
+    def to_json(self):
+        """
+        converts the active StatsHandler object into a JSON String.
+
+        Return Value: return a JSON String.
+        """
+        return json.dumps(self.__dict__, indent=4)
+
+    def from_json(json_string):
+        """
+        converts the given JSON String into a StatsHandler object, the
+        keys of headcounts are turned back into int.
+
+        Attributes:
+            json_string(str): the JSON String that is to be converted.
+
+        Return Value: return a StatsHandler object.
+        """
+        new_dict = json.loads(json_string)
+        headcounts = {int(code): count for code,
+                      count in new_dict["headcounts"].items()}
+        return StatsHandler(new_dict["employees"], new_dict["designations"], headcounts)
@@ -0,0 +1,172 @@
+import sys
+import asyncio
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from network_common.wrappers import Request
+from network_common.protocol import read_request, encode_response, set_no_delay
+from network_server.config import Configuration
+
+
+class AsyncNetworkServer:
+    """
+    A class which serves the clients with an asyncio event loop, the
+    "asyncio" mode of serverconf.cfg.
+    The loop reads the requests of all the connections and writes back
+    the responses, only the requestHandler (which blocks on the database)
+    runs in an executor of workers threads, hence a connection idle
+    between its requests (keep alive) costs no thread at all.
+    The messages are framed as by the protocol module of network_common,
+    as in the "threads" mode, so the clients are the same.
+    A request which finds workers + queue_size requests being handled
+    already is turned away by closing its connection.
+
+    Arguments:
+        requestHandler(pointer to function): This is the pointer which gets invoked
+        and processes the request data to generate the response data.
+
+    Methods:
+        initiate: This runs the event loop, which accepts the connections
+        at the port of the configuration and serves their requests.
+        statistics: returns the counters of the server.
+    """
+
+    def __init__(self, requestHandler):
+        """
+        The configuration gets loaded with the help of Configuration class
+        and the pointer to function gets initialized. The configuration
+        data is then validated latter the connection gets established.
+        """
+        self.server_conf = Configuration()
+        self.requestHandler = requestHandler
+        self.server_conf._obj._validate_values()
+        if self.server_conf._obj.has_exceptions:
+            for exception in self.server_conf._obj.exceptions.values():
+                print(exception[1])
+            sys.exit()
+        self.executor = None
+        self._lock = threading.Lock()
+        self._connections = 0
+        self._pending = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._failed = 0
+
+    def initiate(self):
+        """
+        This function runs the event loop of the server until it is
+        interrupted, the requests are handled by an executor of workers
+        threads. Once interrupted (KeyboardInterrupt, or SystemExit on
+        SIGTERM in a process of the supervisor) it waits for the requests
+        being handled to end.
+        """
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.server_conf._obj.workers, thread_name_prefix="Worker")
+        try:
+            asyncio.run(self._serve_forever())
+        finally:
+            self.executor.shutdown(wait=True)
+
+    def statistics(self):
+        """
+        Return Value:
+            returns a dictionary of the number of workers, the requests
+            being handled or waiting for a worker, the number of requests
+            submitted, rejected (too many pending) and failed (the handler
+            raised an exception) and the number of connections open.
+        """
+        with self._lock:
+            return {
+                "workers": self.server_conf._obj.workers,
+                "pending": self._pending,
+                "queue_size": self.server_conf._obj.queue_size,
+                "submitted": self._submitted,
+                "rejected": self._rejected,
+                "failed": self._failed,
+                "connections": self._connections
+            }
+
+    async def _serve_forever(self):
+        server = await asyncio.start_server(
+            self._serve, "localhost", self.server_conf._obj.port,
+            backlog=self.server_conf._obj.queue_size,
+            reuse_port=self.server_conf._obj.processes > 1)
+        print(
+            f"Server is ready and listening at port {self.server_conf._obj.port}")
+        async with server:
+            await server.serve_forever()
+
+    async def _serve(self, reader, writer):
+        """
+        Serves the requests of a connection, one after the other, until
+        the client closes it, stays idle for longer than keep_alive_timeout,
+        takes longer than request_timeout to send a request which began or
+        breaks the protocol. The connection is closed after the first
+        response if keep_alive_timeout is 0, and waits no longer than
+        request_timeout for its request then.
+        """
+        keep_alive_timeout = self.server_conf._obj.keep_alive_timeout
+        timeout = keep_alive_timeout if keep_alive_timeout > 0 else self.server_conf._obj.request_timeout
+        client_address = writer.get_extra_info("peername")
+        set_no_delay(writer.get_extra_info("socket"))
+        limit = self.server_conf._obj.workers + self.server_conf._obj.queue_size
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._connections += 1
+        try:
+            while True:
+                received = await read_request(
+                    reader, writer, timeout, self.server_conf._obj.request_timeout)
+                if received is None:
+                    break
+                request_data, request_id = received
+                with self._lock:
+                    if self._pending >= limit:
+                        self._rejected += 1
+                        break
+                    self._pending += 1
+                    self._submitted += 1
+                try:
+                    response_data = await loop.run_in_executor(
+                        self.executor, self._handle, client_address, request_data)
+                finally:
+                    with self._lock:
+                        self._pending -= 1
+                if response_data is None:
+                    break
+                writer.write(encode_response(response_data, request_id))
+                await writer.drain()
+                if keep_alive_timeout == 0:
+                    break
+        except (OSError, ValueError, asyncio.TimeoutError):
+            # the client went away, was too slow or did not follow the
+            # protocol.
+            pass
+        finally:
+            with self._lock:
+                self._connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    def _handle(self, client_address, request_data):
+        """
+        Handles a request in a worker of the executor, the address of the
+        client is set on the worker thread (client_address) for the
+        requestHandler.
+
+        Return Value:
+            returns the JSON String of the response, None if the request
+            could not be handled.
+        """
+        threading.current_thread().client_address = client_address
+        try:
+            request = Request.from_json(request_data)
+            return self.requestHandler(request).to_json()
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            traceback.print_exc()
+            return None
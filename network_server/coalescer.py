@@ -0,0 +1,178 @@
+import time
+import queue
+import threading
+
+
+class _Write:
+    # a write submitted to the WriteCoalescer, waiting for its outcome.
+    __slots__ = ("function", "arguments", "result", "error", "done")
+
+    def __init__(self, function, arguments):
+        self.function = function
+        self.arguments = arguments
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class WriteCoalescer:
+    """
+    A class that groups the writes requested at about the same time by
+    different client threads into one transaction, so that the database
+    commits (and syncs its log to the disk) once for the whole group
+    instead of once for every request.
+    The first write waits for at most window seconds for others to join
+    it, or until max_batch writes are gathered, then a single thread runs
+    them one after the other within one transaction and commits it, and
+    every client is answered with the outcome of its own write.
+    A write which fails validation does not fail the others of the group.
+    A write which meets an error of the database does fail the whole
+    transaction (refer Transaction, the database may have rolled it back
+    already): the transaction rolls back without committing and the
+    writes of the group are run again, each on its own, so that every
+    client gets the outcome of its own write and none is reported done
+    without having been committed.
+    A commit which fails is not known to have been rolled back (the
+    connection may have been lost after the database committed), hence
+    its writes are not run again, which could apply them twice, every
+    write of the group fails with the error of the commit.
+
+    Arguments:
+        transaction(function): returns the context manager of a
+        transaction, which commits when its block ends without an
+        exception, the object it enters may tell with its committed
+        attribute whether it did commit.
+        window(float): the seconds for which the writes are gathered.
+            default is 0.005
+        max_batch(int): the maximum number of writes in a transaction.
+            default is 64
+
+    Methods:
+        submit(function, *arguments): runs the write within the next
+        transaction and returns what it returns.
+        close: stops the thread once the writes submitted are done.
+        statistics: returns the counters of the coalescer.
+    """
+
+    def __init__(self, transaction, window=0.005, max_batch=64):
+        self.transaction = transaction
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._writes = 0
+        self._largest = 0
+        self._failed_commits = 0
+        self._thread = threading.Thread(
+            target=self._run, name="WriteCoalescer", daemon=True)
+        self._thread.start()
+
+    def submit(self, function, *arguments):
+        """
+        Calls the function with the arguments within the transaction of
+        the next group of writes and waits for the transaction to end.
+
+        Exception Raising:
+            raises the exception raised by the function, or by the commit.
+
+        Return Value:
+            returns what the function returns.
+        """
+        write = _Write(function, arguments)
+        self._queue.put(write)
+        write.done.wait()
+        if write.error is not None:
+            raise write.error
+        return write.result
+
+    def close(self):
+        """
+        Stops the thread of the coalescer, after the writes submitted
+        so far are done.
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+    def statistics(self):
+        """
+        Return Value:
+            returns a dictionary of the number of transactions (batches),
+            of writes, the average and largest number of writes in a
+            transaction and the number of failed commits.
+        """
+        with self._lock:
+            return {
+                "batches": self._batches,
+                "writes": self._writes,
+                "average_batch": self._writes / self._batches if self._batches > 0 else 0.0,
+                "largest_batch": self._largest,
+                "failed_commits": self._failed_commits
+            }
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            write = self._queue.get()
+            if write is None:
+                return
+            batch = [write]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    write = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if write is None:
+                    stopping = True
+                    break
+                batch.append(write)
+            self._flush(batch)
+
+    def _flush(self, batch):
+        """
+        Runs the writes of the batch within one transaction, or one by
+        one if the transaction rolled back without trying to commit, and
+        wakes up their clients.
+        """
+        committed = False
+        entered = False
+        commit_error = None
+        try:
+            try:
+                with self.transaction() as transaction:
+                    entered = True
+                    for write in batch:
+                        try:
+                            write.result = write.function(*write.arguments)
+                        except Exception as error:
+                            write.error = error
+                committed = getattr(transaction, "committed", True)
+            except Exception as error:
+                if entered:
+                    # the commit failed, whether it took effect is unknown.
+                    commit_error = error
+            with self._lock:
+                self._batches += 1
+                self._writes += len(batch)
+                self._largest = max(self._largest, len(batch))
+                if not committed:
+                    self._failed_commits += 1
+            if commit_error is not None:
+                for write in batch:
+                    if write.error is None:
+                        write.result = None
+                        write.error = commit_error
+            elif not committed:
+                # nothing of the batch is applied, the writes are tried
+                # again on their own.
+                for write in batch:
+                    write.result = write.error = None
+                    try:
+                        write.result = write.function(*write.arguments)
+                    except Exception as error:
+                        write.error = error
+        finally:
+            for write in batch:
+                write.done.set()
@@ -10,6 +10,29 @@ class Configuration:
     It needs a serverconf.cfg which consist of the port number in the JSON format.
     Example:
         {port: port_number(int)}
+    Optionally the writes of concurrent clients can be grouped into one
+    transaction (refer coalescer module).
+    Example:
+        {port: port_number(int), write_window: seconds(float), write_max_batch: writes(int)}
+    The connections of the clients are kept alive between their requests
+    for keep_alive_timeout seconds, 0 closes them after the first response.
+    A request which began is to arrive whole within request_timeout seconds.
+    Example:
+        {port: port_number(int), keep_alive_timeout: seconds(float), request_timeout: seconds(float)}
+    The requests are served by a fixed number of workers, the requests
+    which find queue_size requests waiting already are turned away.
+    Example:
+        {port: port_number(int), workers: threads(int), queue_size: requests(int)}
+    The server runs either in the "threads" mode (refer server module) or
+    in the "asyncio" mode (refer aioserver module), in which an event loop
+    serves the connections and the workers run the requests.
+    Example:
+        {port: port_number(int), mode: "threads"|"asyncio"}
+    The server may run as several processes (refer supervisor module),
+    each serving the port on its own (SO_REUSEPORT), the kernel spreading
+    the connections among them.
+    Example:
+        {port: port_number(int), processes: processes(int)}
 
     Attributes:
         _obj(NoneType): this is an object initialized to make the class
@@ -20,6 +43,31 @@ class Configuration:
             that is to be established between server and client.
             port(int): This holds the port number of the connection
             where the server socket is to be connected.
+            write_window(float): the seconds for which the writes are
+            gathered into one transaction, 0 commits every write on its own.
+                (default value is 0)
+            write_max_batch(int): the maximum number of writes gathered
+            into one transaction.
+                (default value is 64)
+            keep_alive_timeout(float): the seconds for which an idle
+            connection of a client is kept open for its next request.
+                (default value is 30)
+            request_timeout(float): the seconds within which the rest of a
+            request is to arrive once its first bytes did, so that a client
+            sending it slowly does not hold a worker.
+                (default value is 5)
+            workers(int): the number of threads serving the requests, the
+            size of the executor in the asyncio mode.
+                (default value is 16)
+            queue_size(int): the number of requests which may wait for a
+            free worker.
+                (default value is 64)
+            mode(str): "threads" or "asyncio", how the connections are
+            served.
+                (default value is "threads")
+            processes(int): the number of processes serving the port,
+            started and restarted by a supervisor when more than 1.
+                (default value is 1)
             has_exceptions(bool): The flag used to determine the presence
             of exceptions that may have raised while trying to establish the connection.
                 (default value is False)
@@ -34,6 +82,7 @@ class Configuration:
             and flow of data.
     """
     _obj = None
+    MODES = ("threads", "asyncio")
 
     def __new__(cls):
         """
@@ -54,10 +103,34 @@ class Configuration:
             sys.exit()
         Configuration._obj = super(Configuration, cls).__new__(cls)
         Configuration._obj.port = None
+        Configuration._obj.write_window = 0
+        Configuration._obj.write_max_batch = 64
+        Configuration._obj.keep_alive_timeout = 30
+        Configuration._obj.request_timeout = 5
+        Configuration._obj.workers = 16
+        Configuration._obj.queue_size = 64
+        Configuration._obj.mode = "threads"
+        Configuration._obj.processes = 1
         Configuration._obj.has_exceptions = False
         Configuration._obj.exceptions = dict()
         if "port" in new_dict:
             Configuration._obj.port = new_dict["port"]
+        if "write_window" in new_dict:
+            Configuration._obj.write_window = new_dict["write_window"]
+        if "write_max_batch" in new_dict:
+            Configuration._obj.write_max_batch = new_dict["write_max_batch"]
+        if "keep_alive_timeout" in new_dict:
+            Configuration._obj.keep_alive_timeout = new_dict["keep_alive_timeout"]
+        if "request_timeout" in new_dict:
+            Configuration._obj.request_timeout = new_dict["request_timeout"]
+        if "workers" in new_dict:
+            Configuration._obj.workers = new_dict["workers"]
+        if "queue_size" in new_dict:
+            Configuration._obj.queue_size = new_dict["queue_size"]
+        if "mode" in new_dict:
+            Configuration._obj.mode = new_dict["mode"]
+        if "processes" in new_dict:
+            Configuration._obj.processes = new_dict["processes"]
 
         return Configuration._obj
 
@@ -78,5 +151,40 @@ class Configuration:
         elif Configuration._obj.port < 1024 or Configuration._obj.port > 49151:
             Configuration._obj.exceptions["port"] = (
                 'V', f"Port Value is {Configuration._obj.port}, it should be within Range(1024,49151)")
+        if not isinstance(Configuration._obj.write_window, (int, float)) or isinstance(Configuration._obj.write_window, bool):
+            Configuration._obj.exceptions["write_window"] = (
+                'T', f"write_window is of type {type(Configuration._obj.write_window)}, should be of type {type(0.5)}")
+        elif Configuration._obj.write_window < 0 or Configuration._obj.write_window > 1:
+            Configuration._obj.exceptions["write_window"] = (
+                'V', f"write_window is {Configuration._obj.write_window}, it should be within Range(0,1) seconds")
+        if not isinstance(Configuration._obj.write_max_batch, int) or isinstance(Configuration._obj.write_max_batch, bool):
+            Configuration._obj.exceptions["write_max_batch"] = (
+                'T', f"write_max_batch is of type {type(Configuration._obj.write_max_batch)}, should be of type {type(10)}")
+        elif Configuration._obj.write_max_batch <= 0:
+            Configuration._obj.exceptions["write_max_batch"] = (
+                'V', f"write_max_batch is {Configuration._obj.write_max_batch}, it should be greater than zero")
+        if not isinstance(Configuration._obj.keep_alive_timeout, (int, float)) or isinstance(Configuration._obj.keep_alive_timeout, bool):
+            Configuration._obj.exceptions["keep_alive_timeout"] = (
+                'T', f"keep_alive_timeout is of type {type(Configuration._obj.keep_alive_timeout)}, should be of type {type(0.5)}")
+        elif Configuration._obj.keep_alive_timeout < 0:
+            Configuration._obj.exceptions["keep_alive_timeout"] = (
+                'V', f"keep_alive_timeout is {Configuration._obj.keep_alive_timeout}, it should be greater than or equal to zero")
+        if not isinstance(Configuration._obj.request_timeout, (int, float)) or isinstance(Configuration._obj.request_timeout, bool):
+            Configuration._obj.exceptions["request_timeout"] = (
+                'T', f"request_timeout is of type {type(Configuration._obj.request_timeout)}, should be of type {type(0.5)}")
+        elif Configuration._obj.request_timeout <= 0:
+            Configuration._obj.exceptions["request_timeout"] = (
+                'V', f"request_timeout is {Configuration._obj.request_timeout}, it should be greater than zero")
+        for name in ("workers", "queue_size", "processes"):
+            value = getattr(Configuration._obj, name)
+            if not isinstance(value, int) or isinstance(value, bool):
+                Configuration._obj.exceptions[name] = (
+                    'T', f"{name} is of type {type(value)}, should be of type {type(10)}")
+            elif value <= 0:
+                Configuration._obj.exceptions[name] = (
+                    'V', f"{name} is {value}, it should be greater than zero")
+        if Configuration._obj.mode not in Configuration.MODES:
+            Configuration._obj.exceptions["mode"] = (
+                'V', f"mode is {Configuration._obj.mode}, it should be one of {', '.join(Configuration.MODES)}")
         if len(Configuration._obj.exceptions) > 0:
             Configuration._obj.has_exceptions = True
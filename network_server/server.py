@@ -1,69 +1,137 @@
 import sys
+import time
+import queue
 import socket
-from threading import Thread
+import selectors
+import threading
+import traceback
 from network_common.wrappers import Request, Response
+from network_common.protocol import receive_request, send_response, set_no_delay
 from network_server.config import Configuration
 
 
-class SKThread(Thread):
+class WorkerPool:
     """
-    A class that provides the multithreading feature to the server
-    along with the core logic of data transfer between server and client
-    by the flow of byte stream.
+    A class that runs a handler upon the items submitted to it, with a
+    fixed number of worker threads fed by a bounded queue, so that a
+    burst of work queues up (or is turned away when the queue is full)
+    instead of starting a thread for every item.
 
     Arguments:
-        obj(NetworkServer): the server object which needs to be multi-threaded.
+        size(int): the number of worker threads.
+        queue_size(int): the number of items which may wait for a worker.
+        handler(pointer to function): takes an item and processes it.
 
     Methods:
-        run:
-            Enables multithreading for the provided object of obj
-            and also governs the data transfer between the server and the client.
+        submit(item): queues the item, returns False if the queue is full.
+        statistics: returns the queue depth, the active workers and the
+        counters of the pool.
+        close: stops the workers once the queued items are processed.
     """
 
-    def __init__(self, obj):
-        self.obj = obj
-        Thread.__init__(self)
-        self.start()
+    def __init__(self, size, queue_size, handler):
+        self.size = size
+        self.queue_size = queue_size
+        self.handler = handler
+        self._queue = queue.Queue(queue_size)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._failed = 0
+        self._workers = list()
+        for number in range(size):
+            worker = threading.Thread(
+                target=self._work, name=f"Worker-{number + 1}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
 
-    def run(self):
+    def submit(self, item):
         """
-        This function executes the client requests in multithreaded fashion.
-        Controls the transfer of bytes between client and server.
-        First, the length of the request is received which in turn
-        is used to receive the request data.
-        This request data is passed to the requestHandler function
-        and we obtain the response.
-        This response is then further forwarded to the respective client
-        in the same manager as the request was received by the server
-        from the client.
+        Queues the item for the next free worker.
+
+        Return Value:
+            returns True if the item is queued, False if the queue is full
+            (the item is counted as rejected).
+        """
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            return False
+        with self._lock:
+            self._submitted += 1
+        return True
+
+    def statistics(self):
+        """
+        Return Value:
+            returns a dictionary of the number of workers, the workers busy
+            now, the items waiting in the queue, the size of the queue and
+            the number of items submitted, rejected (queue full) and failed
+            (the handler raised an exception).
+        """
+        with self._lock:
+            return {
+                "workers": self.size,
+                "active_workers": self._active,
+                "queue_depth": self._queue.qsize(),
+                "queue_size": self.queue_size,
+                "submitted": self._submitted,
+                "rejected": self._rejected,
+                "failed": self._failed
+            }
+
+    def close(self):
+        """
+        Stops the workers after the items queued so far are processed.
         """
-        databytes = b""
-        to_recieve = 1024
-        while len(databytes) < to_recieve:
-            bytes_read = self.obj.client_socket.recv(
-                to_recieve - len(databytes))
-            databytes += bytes_read
-        request_data_length = int(databytes.decode("utf-8").strip())
-        databytes = b""
-        to_recieve = request_data_length
-        while len(databytes) < to_recieve:
-            bytes_read = self.obj.client_socket.recv(
-                to_recieve - len(databytes))
-            databytes += bytes_read
-        request_data = databytes.decode("utf-8")
-        request = Request.from_json(request_data)
-        response = self.obj.requestHandler(request)
-        response_data = response.to_json()
-        self.obj.client_socket.sendall(
-            bytes(str(len(response_data)).ljust(1024), encoding="utf-8"))
-        self.obj.client_socket.sendall(bytes(response_data, "utf-8"))
-        self.obj.client_socket.close()
+        for worker in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            with self._lock:
+                self._active += 1
+            try:
+                self.handler(item)
+            except Exception:
+                with self._lock:
+                    self._failed += 1
+                traceback.print_exc()
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+
+class _ClientConnection:
+    # a connection of a client, either idle (watched by the accept loop
+    # for its next request) or being served by a worker.
+    __slots__ = ("client_socket", "client_address", "last_active")
+
+    def __init__(self, client_socket, client_address):
+        self.client_socket = client_socket
+        self.client_address = client_address
+        self.last_active = time.monotonic()
 
 
 class NetworkServer:
     """
     A class which enables socket programming
     and controls the server-side of the network programming.
+    A single thread accepts the connections and watches those which are
+    idle, a connection whose client sends a request is handed to the
+    WorkerPool, whose worker serves that one request and gives the
+    connection back to be watched for the next one (keep alive), hence
+    the number of threads does not grow with the number of clients.
+    A request which finds the queue of the pool full is turned away by
+    closing its connection.
 
     Arguments:
         requestHandler(pointer to function): This is the pointer which gets invoked
@@ -71,8 +139,11 @@ class NetworkServer:
 
     Methods:
         initiate: This creates the server socket using the Python's socket module
-        and binds it to the configuration object, which then connects to the client
-        and is passed to the threading class SKThread.
+        and binds it to the configuration object, which then accepts the
+        connections of the clients and serves their requests with the
+        worker pool.
+        statistics: returns the counters of the worker pool and the number
+        of connections open.
     """
 
     def __init__(self, requestHandler):
@@ -85,22 +156,154 @@ class NetworkServer:
         self.requestHandler = requestHandler
         self.server_conf._obj._validate_values()
         if self.server_conf._obj.has_exceptions:
-            for exception in self.server_conf._obj.exceptions:
+            for exception in self.server_conf._obj.exceptions.values():
                 print(exception[1])
             sys.exit()
+        self.worker_pool = None
+        self._idle = dict()
+        self._returned = queue.SimpleQueue()
+        self._waker = None
 
     def initiate(self):
         """
-        This function creates a server socket using socket module of Python
-        and connects it to the client with the help of a configuration object
-        and thus is passed to SKThread class to make the server multithreaded.
+        This function creates a server socket using socket module of Python,
+        bound to the port of the configuration, and runs the loop which
+        accepts the connections, watches the idle ones, closes those idle
+        for longer than keep_alive_timeout (request_timeout if it is 0) and
+        hands the requests to the worker pool.
+        When the loop is interrupted (KeyboardInterrupt, or SystemExit on
+        SIGTERM in a process of the supervisor) it stops accepting and
+        waits for the requests already queued to be served.
         """
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if self.server_conf._obj.processes > 1:
+            # the other processes of the supervisor serve the port as well.
+            self.server_socket.setsockopt(
+                socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
         self.server_socket.bind(("localhost", self.server_conf._obj.port))
-        self.server_socket.listen()
-        while True:
-            print(
-                f"Server is ready and listening at port {self.server_conf._obj.port}")
-            self.client_socket, _ = self.server_socket.accept()
-            SKThread(self)
-        self.server_socket.close()
+        self.server_socket.listen(self.server_conf._obj.queue_size)
+        self.worker_pool = WorkerPool(
+            self.server_conf._obj.workers, self.server_conf._obj.queue_size, self._serve)
+        selector = selectors.DefaultSelector()
+        selector.register(self.server_socket, selectors.EVENT_READ)
+        # the workers wake the loop up to watch the connections they give back.
+        self._waker, wakee = socket.socketpair()
+        self._waker.setblocking(False)
+        wakee.setblocking(False)
+        selector.register(wakee, selectors.EVENT_READ)
+        print(
+            f"Server is ready and listening at port {self.server_conf._obj.port}")
+        keep_alive_timeout = self.server_conf._obj.keep_alive_timeout
+        # without keep alive a connection waits no longer than
+        # request_timeout for its request.
+        idle_timeout = keep_alive_timeout if keep_alive_timeout > 0 else self.server_conf._obj.request_timeout
+        try:
+            while True:
+                for key, _ in selector.select(timeout=1.0):
+                    if key.fileobj is self.server_socket:
+                        try:
+                            client_socket, client_address = self.server_socket.accept()
+                        except OSError:
+                            # out of file descriptors, or the client gave up.
+                            continue
+                        connection = _ClientConnection(
+                            client_socket, client_address)
+                        self._idle[client_socket] = connection
+                        selector.register(
+                            client_socket, selectors.EVENT_READ, connection)
+                    elif key.fileobj is wakee:
+                        try:
+                            while wakee.recv(4096):
+                                pass
+                        except BlockingIOError:
+                            pass
+                    else:
+                        connection = key.data
+                        selector.unregister(connection.client_socket)
+                        del self._idle[connection.client_socket]
+                        if not self.worker_pool.submit(connection):
+                            self._close(connection)
+                while True:
+                    try:
+                        connection = self._returned.get_nowait()
+                    except queue.Empty:
+                        break
+                    connection.last_active = time.monotonic()
+                    self._idle[connection.client_socket] = connection
+                    selector.register(connection.client_socket,
+                                      selectors.EVENT_READ, connection)
+                expiry = time.monotonic() - idle_timeout
+                for connection in [connection for connection in self._idle.values() if connection.last_active < expiry]:
+                    selector.unregister(connection.client_socket)
+                    del self._idle[connection.client_socket]
+                    self._close(connection)
+        finally:
+            selector.close()
+            self.server_socket.close()
+            self.worker_pool.close()
+            self._waker.close()
+            wakee.close()
+
+    def statistics(self):
+        """
+        Return Value:
+            returns a dictionary of the counters of the worker pool (refer
+            WorkerPool.statistics) along with the number of idle
+            connections kept alive.
+        """
+        statistics = dict() if self.worker_pool is None else self.worker_pool.statistics()
+        statistics["idle_connections"] = len(self._idle)
+        return statistics
+
+    def _serve(self, connection):
+        """
+        Serves the request of the connection, in a worker of the pool,
+        and gives the connection back to the accept loop, unless it is
+        to be closed.
+        The request data is passed to the requestHandler function and the
+        response obtained is sent back, both framed by the protocol module
+        of network_common (in the framing the client chose). The address
+        of the client is set on the worker thread (client_address) for the
+        requestHandler.
+        The request is to arrive whole within request_timeout seconds, and
+        a hello is answered and the connection given back at once, so
+        that the worker never waits on a slow or idle client.
+        """
+        keep_alive_timeout = self.server_conf._obj.keep_alive_timeout
+        request_timeout = self.server_conf._obj.request_timeout
+        client_socket = connection.client_socket
+        keep = False
+        try:
+            set_no_delay(client_socket)
+            received = receive_request(client_socket, request_timeout)
+            if received is not None:
+                request_data, request_id = received
+                client_socket.settimeout(request_timeout)
+                if request_data is None:
+                    # the framing is agreed upon, the request comes next.
+                    keep = True
+                else:
+                    threading.current_thread().client_address = connection.client_address
+                    request = Request.from_json(request_data)
+                    response = self.requestHandler(request)
+                    send_response(client_socket, response.to_json(), request_id)
+                    keep = keep_alive_timeout > 0
+        except (OSError, ValueError):
+            # the client went away, was too slow or did not follow the
+            # protocol.
+            pass
+        finally:
+            if keep:
+                self._returned.put(connection)
+                try:
+                    self._waker.send(b"\0")
+                except OSError:
+                    pass
+            else:
+                self._close(connection)
+
+    def _close(self, connection):
+        try:
+            connection.client_socket.close()
+        except OSError:
+            pass
@@ -0,0 +1,133 @@
+import sys
+import time
+import signal
+import multiprocessing
+from multiprocessing.connection import wait
+
+
+class Supervisor:
+    """
+    A class that runs a function in a number of worker processes (forked
+    from the current one) and keeps them running: a process which exits
+    without being asked to is started again after restart_delay seconds.
+    The supervisor stops on SIGTERM or SIGINT (Ctrl+C), it then sends
+    SIGTERM to the processes, on which they raise SystemExit to end what
+    they are doing, and kills those still running after shutdown_timeout
+    seconds.
+    The processes ignore SIGINT, which the terminal sends to all of them,
+    and leave their shutting down to the supervisor.
+
+    Arguments:
+        target(pointer to function): the function run by every process.
+        processes(int): the number of processes.
+        restart_delay(float): the seconds to wait before starting again a
+        process which exited, so that one failing at once does not spin.
+            default is 1.0
+        shutdown_timeout(float): the seconds given to the processes to end
+        once asked to.
+            default is 10.0
+
+    Methods:
+        run: starts the processes and supervises them until stopped.
+        stop: asks the supervisor to stop.
+        statistics: returns the process IDs and the number of restarts.
+    """
+
+    def __init__(self, target, processes, restart_delay=1.0, shutdown_timeout=10.0):
+        self.target = target
+        self.processes = processes
+        self.restart_delay = restart_delay
+        self.shutdown_timeout = shutdown_timeout
+        self._context = multiprocessing.get_context("fork")
+        self._workers = [None] * processes
+        self._restarts = 0
+        self._stopping = False
+
+    def run(self):
+        """
+        Starts the processes and restarts those which exit, until stop is
+        called or SIGTERM or SIGINT is received, then shuts them down.
+        """
+        handlers = {number: signal.signal(number, self._signal)
+                    for number in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            for index in range(self.processes):
+                self._start(index)
+            due = dict()
+            while not self._stopping:
+                sentinels = {worker.sentinel: index for index, worker in enumerate(
+                    self._workers) if worker is not None}
+                timeout = 1.0
+                if len(due) > 0:
+                    timeout = max(0.0, min(min(due.values()) -
+                                           time.monotonic(), timeout))
+                for sentinel in wait(list(sentinels), timeout):
+                    index = sentinels[sentinel]
+                    worker = self._workers[index]
+                    worker.join()
+                    self._workers[index] = None
+                    if self._stopping:
+                        break
+                    print(
+                        f"Worker process {index + 1} (pid {worker.pid}) exited with code {worker.exitcode}, restarting")
+                    due[index] = time.monotonic() + self.restart_delay
+                now = time.monotonic()
+                for index in [index for index, at in due.items() if at <= now]:
+                    if self._stopping:
+                        break
+                    del due[index]
+                    self._restarts += 1
+                    self._start(index)
+        finally:
+            self._shutdown()
+            for number, handler in handlers.items():
+                signal.signal(number, handler)
+
+    def stop(self):
+        """
+        Asks the supervisor to shut the processes down and return from run.
+        """
+        self._stopping = True
+
+    def statistics(self):
+        """
+        Return Value:
+            returns a dictionary of the process IDs of the processes
+            running (None for those waiting to be started again) and the
+            number of restarts.
+        """
+        return {
+            "pids": [worker.pid if worker is not None else None for worker in self._workers],
+            "restarts": self._restarts
+        }
+
+    def _signal(self, number, frame):
+        self._stopping = True
+
+    def _start(self, index):
+        worker = self._context.Process(
+            target=Supervisor._work, args=(self.target,), name=f"Process-{index + 1}")
+        worker.start()
+        self._workers[index] = worker
+
+    def _shutdown(self):
+        workers = [worker for worker in self._workers if worker is not None]
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        deadline = time.monotonic() + self.shutdown_timeout
+        for worker in workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+            if worker.is_alive():
+                worker.kill()
+                worker.join()
+        self._workers = [None] * self.processes
+
+    def _work(target):
+        # runs in the worker process.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, Supervisor._terminate)
+        target()
+
+    def _terminate(number, frame):
+        sys.exit(0)
@@ -0,0 +1,102 @@
+from network_server.coalescer import WriteCoalescer
+import threading
+import time
+
+"""
+It exercises the WriteCoalescer with a stand-in for the Transaction of
+the Data Layer, which records what it commits, so that no database is
+needed: the writes of concurrent clients grouped together, a failing
+write not failing the others, the writes run again one by one when the
+transaction is doomed (committed stays False), and failed with the error
+of the commit, without being run again, when its commit fails.
+"""
+
+
+class FakeTransaction:
+    # committed rows, and how the next transactions are to end.
+    rows = list()
+    outcomes = list()
+
+    def __init__(self):
+        self.committed = False
+        self.pending = list()
+
+    def __enter__(self):
+        FakeTransaction.current = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        FakeTransaction.current = None
+        outcome = FakeTransaction.outcomes.pop(0) if FakeTransaction.outcomes else "commit"
+        if exc_type is not None or outcome == "doomed":
+            return False
+        if outcome == "fail":
+            raise RuntimeError("commit failed")
+        FakeTransaction.rows.extend(self.pending)
+        self.committed = True
+        return False
+
+
+def add(value):
+    if value < 0:
+        raise ValueError(f"invalid value : {value}")
+    transaction = FakeTransaction.current
+    if transaction is None:
+        # run on its own, outside of any transaction.
+        FakeTransaction.rows.append(value)
+    else:
+        transaction.pending.append(value)
+    return value
+
+
+def run_clients(coalescer, values):
+    outcomes = dict()
+
+    def client(value):
+        try:
+            outcomes[value] = coalescer.submit(add, value)
+        except (ValueError, RuntimeError) as error:
+            outcomes[value] = str(error)
+    threads = [threading.Thread(target=client, args=(value,)) for value in values]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+FakeTransaction.current = None
+coalescer = WriteCoalescer(FakeTransaction, window=0.05, max_batch=64)
+
+print("Grouped writes, one of them invalid")
+outcomes = run_clients(coalescer, [1, 2, -3, 4, 5])
+print("Outcomes :", dict(sorted(outcomes.items())))
+print("Committed :", sorted(FakeTransaction.rows))
+print("Statistics :", coalescer.statistics())
+print("*" * 30)
+
+print("Doomed transaction, the writes are run again one by one")
+FakeTransaction.rows.clear()
+FakeTransaction.outcomes.append("doomed")
+outcomes = run_clients(coalescer, [10, 11, 12])
+print("Outcomes :", dict(sorted(outcomes.items())))
+print("Committed :", sorted(FakeTransaction.rows))
+print("*" * 30)
+
+print("Failed commit, the writes fail without being run again")
+FakeTransaction.rows.clear()
+FakeTransaction.outcomes.append("fail")
+outcomes = run_clients(coalescer, [20, 21, -22])
+print("Outcomes :", dict(sorted(outcomes.items())))
+print("Committed :", sorted(FakeTransaction.rows))
+print("Statistics :", coalescer.statistics())
+print("*" * 30)
+
+print("Batches capped at max_batch")
+small = WriteCoalescer(FakeTransaction, window=0.05, max_batch=4)
+FakeTransaction.rows.clear()
+run_clients(small, list(range(100, 110)))
+print("Committed :", len(FakeTransaction.rows))
+print("Statistics :", small.statistics())
+small.close()
+coalescer.close()